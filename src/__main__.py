@@ -0,0 +1,6 @@
+# src/__main__.py - `python -m src ...` runs the headless CLI
+import sys
+
+from src.cli import main
+
+sys.exit(main())
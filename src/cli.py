@@ -0,0 +1,535 @@
+# src/cli.py - Headless command line for ISO-ENTROPY
+"""
+Command-line entry point (no Streamlit, no pandas).
+
+    python -m src simulate --volatility "High (Chaotic)" --rigidity "Medium (Standard)" --buffer 6
+    python -m src simulate --I 1.5 --K 2.1 --theta-max 2.0 --runs 2000 --seed 7
+    python -m src sweep --volatility "Medium (Seasonal)" --rigidity "Medium (Standard)" --buffer 6 \\
+        --k-min 1.5 --k-max 3.0 --k-step 0.1 --workers 4 --output sweep.jsonl
+    python -m src audit --description "Hospital..." --volatility "High (Chaotic)" \\
+        --rigidity "High (Manual/Bureaucratic)" --buffer 3 --mock --output report.md
+    python -m src batch jobs.jsonl --output results.jsonl --workers 4
+    python -m src serve --port 8765 --workers 4 --llm fake
+    python -m src screen units.csv --threshold 0.05 --top 50 --output ranking.jsonl
+    python -m src sensitivity --volatility "High (Chaotic)" --rigidity "Medium (Standard)" --buffer 6 --workers 4
+
+Batch input: one JSON object per line, {"command": "simulate" | "audit", ...}
+with the same option names as the subcommands (underscored).
+
+Screen input: CSV with columns volatility, rigidity, buffer_months and
+optionally id and K (current capacity; default: grounded K0).
+"""
+
+import argparse
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+VOLATILITY_CHOICES = ["Low (Stable)", "Medium (Seasonal)", "High (Chaotic)"]
+RIGIDITY_CHOICES = ["Low (Automated)", "Medium (Standard)", "High (Manual/Bureaucratic)"]
+
+
+# ============================================================================
+# TASKS (module-level so they can run in worker processes)
+# ============================================================================
+
+def resolve_parameters(spec: Dict[str, Any]) -> Dict[str, float]:
+    """Explicit I/K/theta_max, or grounded from volatility/rigidity/buffer (explicit values win)."""
+    params: Dict[str, float] = {}
+    if spec.get("volatility") or spec.get("rigidity") or spec.get("buffer") is not None:
+        from src.core.grounding import ground_inputs
+        from src.core.physics import calculate_collapse_threshold
+
+        grounded = ground_inputs(
+            spec.get("volatility") or "Medium (Seasonal)",
+            spec.get("rigidity") or "Medium (Standard)",
+            spec.get("buffer") if spec.get("buffer") is not None else 6
+        )
+        params = {
+            "I": grounded["I"],
+            "K": grounded["K0"],
+            "theta_max": calculate_collapse_threshold(
+                grounded["stock"], grounded["capital"], grounded["liquidity"]
+            )
+        }
+
+    for name in ("I", "K", "theta_max"):
+        if spec.get(name) is not None:
+            params[name] = float(spec[name])
+
+    missing = [name for name in ("I", "K", "theta_max") if name not in params]
+    if missing:
+        raise ValueError(f"Missing parameters: {', '.join(missing)} (or give volatility/rigidity/buffer)")
+    return params
+
+
+def simulate_task(spec: Dict[str, Any]) -> Dict[str, Any]:
+    from src.core.engine import get_engine
+    from src.core.physics import wilson_upper_bound
+
+    params = resolve_parameters(spec)
+    result = get_engine(spec.get("engine", "numpy"))(
+        params["I"], params["K"], params["theta_max"],
+        runs=int(spec.get("runs", 500)),
+        time_steps=int(spec.get("time_steps", 52)),
+        alpha=float(spec.get("alpha", 0.15)),
+        seed=spec.get("seed")
+    )
+    result["upper_ci95"] = wilson_upper_bound(result["total_collapses"], result["runs"])
+    if not spec.get("trajectory"):
+        result.pop("trajectory", None)
+    return {**params, **result}
+
+
+def audit_task(spec: Dict[str, Any], **agent_options: Any) -> Dict[str, Any]:
+    """Full audit. agent_options go to IsoEntropyAgent (e.g. a shared client or rate_limiter)."""
+    from src.core.agent import IsoEntropyAgent
+    from src.core.calibration import calibrate_csv
+
+    events: List[Dict[str, Any]] = []
+    if spec.get("llm"):
+        agent_options.setdefault("backend", spec["llm"])
+    agent = IsoEntropyAgent(
+        api_key=spec.get("api_key"),
+        mock_mode=bool(spec.get("mock", False)),
+        verbose=bool(spec.get("verbose", False)),
+        max_iterations=int(spec.get("max_iterations", 10)),
+        seed=spec.get("seed"),
+        journal_dir=spec.get("journal_dir"),
+        deadline_s=spec.get("deadline_s"),
+        speculative_candidates=int(spec.get("speculative_candidates", 1)),
+        validation_mode=spec.get("validation_mode", "independent"),
+        warm_start=spec.get("warm_start"),
+        calibration=calibrate_csv(spec["calibration"]) if spec.get("calibration") else None,
+        on_event=lambda event: events.append({"type": event.type.name, **_event_summary(event.data)}),
+        **agent_options
+    )
+    report = agent.audit_system(
+        user_input=spec.get("description", ""),
+        volatility=spec.get("volatility") or "Medium (Seasonal)",
+        rigidity=spec.get("rigidity") or "Medium (Standard)",
+        buffer=int(spec.get("buffer", 6)),
+        audit_id=spec.get("audit_id")
+    )
+    return {
+        "final_phase": agent.fsm.phase_name(),
+        "experiments": agent.experiment_log.to_list(),
+        "events": events,
+        "report": report
+    }
+
+
+def sweep_specs(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One simulate spec per K: 'k_values', or 'k_min'/'k_max'/'k_step'. Seeds are derived per index."""
+    if spec.get("k_values"):
+        k_values = [float(k) for k in spec["k_values"]]
+    else:
+        if spec.get("k_min") is None or spec.get("k_max") is None:
+            raise ValueError("give k_values or k_min/k_max")
+        k_min, k_max, k_step = float(spec["k_min"]), float(spec["k_max"]), float(0.1 if spec.get("k_step") is None else spec["k_step"])
+        if k_step <= 0:
+            raise ValueError("k_step must be positive")
+        count = int(math.floor((k_max - k_min) / k_step + 1e-9)) + 1
+        k_values = [round(k_min + i * k_step, 10) for i in range(count)]
+
+    base = {key: value for key, value in spec.items() if key not in ("k_values", "k_min", "k_max", "k_step")}
+    return [
+        {**base, "K": k, "seed": _derived_seed(base.get("seed"), i)}
+        for i, k in enumerate(k_values)
+    ]
+
+
+def run_task(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs one batch entry; errors are returned, not raised."""
+    command = spec.get("command", "simulate")
+    try:
+        if command == "simulate":
+            return {"input": spec, "ok": True, "result": simulate_task(spec)}
+        if command == "audit":
+            return {"input": spec, "ok": True, "result": audit_task(spec)}
+        raise ValueError(f"Unknown command '{command}'")
+    except Exception as e:
+        return {"input": spec, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def _event_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in ("trajectory", "params")}
+
+
+# ============================================================================
+# OUTPUT HELPERS
+# ============================================================================
+
+def _jsonable(value: Any) -> Any:
+    """inf/nan are not valid JSON: write them as null."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "item"):  # NumPy scalars
+        return _jsonable(value.item())
+    return value
+
+
+def _open_output(path: Optional[str]):
+    return open(path, "w", encoding="utf-8") if path and path != "-" else sys.stdout
+
+
+def _write_jsonl(rows: Iterable[Dict[str, Any]], path: Optional[str]):
+    out = _open_output(path)
+    try:
+        for row in rows:
+            out.write(json.dumps(_jsonable(row)) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _map(func, specs: List[Dict[str, Any]], workers: int) -> Iterable[Dict[str, Any]]:
+    """Ordered results, in-process for one worker, process pool otherwise."""
+    if workers <= 1 or len(specs) <= 1:
+        return map(func, specs)
+    pool = ProcessPoolExecutor(max_workers=workers)
+
+    def results():
+        with pool:
+            yield from pool.map(func, specs, chunksize=max(1, len(specs) // (4 * workers)))
+
+    return results()
+
+
+def _derived_seed(seed: Optional[int], index: int) -> Optional[int]:
+    return None if seed is None else seed + index
+
+
+# ============================================================================
+# SUBCOMMANDS
+# ============================================================================
+
+def _spec_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "volatility": args.volatility,
+        "rigidity": args.rigidity,
+        "buffer": args.buffer,
+        "I": args.I,
+        "K": args.K,
+        "theta_max": args.theta_max,
+        "runs": args.runs,
+        "time_steps": args.time_steps,
+        "alpha": args.alpha,
+        "engine": args.engine,
+        "seed": args.seed,
+    }
+
+
+def cmd_simulate(args: argparse.Namespace) -> int:
+    spec = _spec_from_args(args)
+    spec["trajectory"] = args.trajectory
+    result = simulate_task(spec)
+    out = _open_output(args.output)
+    try:
+        out.write(json.dumps(_jsonable(result), indent=2) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    spec = _spec_from_args(args)
+    spec.update(k_min=args.k_min, k_max=args.k_max, k_step=args.k_step,
+                k_values=[float(k) for k in args.k_values.split(",")] if args.k_values else None)
+    try:
+        specs = sweep_specs(spec)
+    except ValueError as e:
+        raise SystemExit(f"sweep: {e}")
+    _write_jsonl(_map(simulate_task, specs, args.workers), args.output)
+    return 0
+
+
+def cmd_audit(args: argparse.Namespace) -> int:
+    spec = {
+        "description": args.description,
+        "volatility": args.volatility,
+        "rigidity": args.rigidity,
+        "buffer": args.buffer,
+        "mock": args.mock,
+        "verbose": args.verbose,
+        "max_iterations": args.max_iterations,
+        "seed": args.seed,
+        "audit_id": args.audit_id,
+        "journal_dir": args.journal_dir,
+        "deadline_s": args.deadline,
+        "llm": args.llm,
+        "speculative_candidates": args.candidates,
+        "validation_mode": args.validation,
+        "warm_start": args.warm_start,
+        "calibration": args.calibration,
+    }
+    result = audit_task(spec)
+
+    out = _open_output(args.output)
+    try:
+        out.write(result["report"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(_jsonable({k: v for k, v in result.items() if k != "report"}), f, indent=2)
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    with open(args.input, encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        specs = json.loads(text)
+    else:
+        specs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    defaults = {"engine": args.engine, "runs": args.runs, "time_steps": args.time_steps}
+    specs = [
+        {**defaults, "seed": _derived_seed(args.seed, i), **spec}
+        for i, spec in enumerate(specs)
+    ]
+
+    failures = 0
+    rows = []
+    for row in _map(run_task, specs, args.workers):
+        failures += not row["ok"]
+        rows.append(row)
+        if args.output and args.output != "-":
+            continue
+        _write_jsonl([row], None)
+    if args.output and args.output != "-":
+        _write_jsonl(rows, args.output)
+    return 1 if failures else 0
+
+
+def cmd_calibrate(args: argparse.Namespace) -> int:
+    from src.core.calibration import calibrate_csv
+
+    try:
+        calibration = calibrate_csv(args.input, args.input_column, args.capacity_column, args.grid_size)
+    except ValueError as e:
+        raise SystemExit(f"calibrate: {e}")
+    result = {"params": calibration.to_params(), "posterior": calibration.summary()}
+    if args.theta_max is not None:
+        result["predictive_collapse_rate"] = calibration.predictive_collapse(args.theta_max, seed=args.seed)
+    print(json.dumps(_jsonable(result), indent=2))
+    return 0
+
+
+def cmd_screen(args: argparse.Namespace) -> int:
+    import csv
+
+    from src.core.screening import screen_portfolio
+
+    with open(args.input, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise SystemExit("screen: no units in input")
+    try:
+        units = {
+            "volatility": [row["volatility"] for row in rows],
+            "rigidity": [row["rigidity"] for row in rows],
+            "buffer_months": [float(row["buffer_months"]) for row in rows],
+        }
+        K = [float(row["K"]) for row in rows] if rows[0].get("K") else None
+    except (KeyError, ValueError) as e:
+        raise SystemExit(f"screen: invalid input ({type(e).__name__}: {e})")
+
+    result = screen_portfolio(
+        units, threshold=args.threshold, K=K, small_runs=args.small_runs,
+        full_runs=args.full_runs, seed=args.seed
+    )
+    ids = [row.get("id") or str(index) for index, row in enumerate(rows)]
+    order = result.ranking()[:args.top] if args.top else result.ranking()
+    _write_jsonl((
+        {"id": ids[i], "risk": result.risk[i], "lower": result.lower[i], "upper": result.upper[i],
+         "collapse_rate": result.collapse_rate[i], "at_risk": bool(result.at_risk[i]),
+         "tier": int(result.tier[i]), "runs": int(result.runs[i]),
+         "I": result.I[i], "K": result.K[i], "theta_max": result.theta_max[i]}
+        for i in order
+    ), args.output)
+    print(json.dumps(result.cost()), file=sys.stderr)
+    return 0
+
+
+def cmd_sensitivity(args: argparse.Namespace) -> int:
+    from src.core.sensitivity import sensitivity_for
+
+    if not (args.volatility and args.rigidity and args.buffer is not None):
+        raise SystemExit("sensitivity: --volatility, --rigidity and --buffer are required")
+    result = sensitivity_for(
+        args.volatility, args.rigidity, args.buffer, spread=args.spread, n=args.n, paths=args.paths,
+        time_steps=args.time_steps, workers=args.workers, seed=args.seed
+    )
+    out = _open_output(args.output)
+    try:
+        out.write(json.dumps(_jsonable(result.to_dict()), indent=2) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from src.server import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        audit_workers=args.audit_workers,
+        llm=args.llm,
+        llm_concurrency=args.llm_concurrency,
+        llm_latency_s=args.llm_latency,
+        max_rpm=args.max_rpm
+    )
+    return 0
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+def _add_system_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--volatility", choices=VOLATILITY_CHOICES, help="Grounded volatility label")
+    parser.add_argument("--rigidity", choices=RIGIDITY_CHOICES, help="Grounded rigidity label")
+    parser.add_argument("--buffer", type=int, help="Financial buffer in months")
+
+
+def _add_engine_options(parser: argparse.ArgumentParser):
+    parser.add_argument("--engine", choices=["numpy", "python"], default="numpy",
+                        help="Simulation engine (default: numpy, vectorized)")
+    parser.add_argument("--runs", type=int, default=500, help="Monte Carlo runs per simulation")
+    parser.add_argument("--time-steps", type=int, default=52, help="Weeks per run")
+    parser.add_argument("--seed", type=int, help="Base random seed (reproducible output)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="ISO-ENTROPY headless auditor and simulator"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    simulate = sub.add_parser("simulate", help="Run one Monte Carlo simulation")
+    _add_system_options(simulate)
+    simulate.add_argument("--I", type=float, help="External entropy I (bits)")
+    simulate.add_argument("--K", type=float, help="Response capacity K (bits)")
+    simulate.add_argument("--theta-max", type=float, help="Collapse threshold (bits)")
+    simulate.add_argument("--alpha", type=float, default=0.15, help="Dissipation rate")
+    simulate.add_argument("--trajectory", action="store_true", help="Include the last run's debt trajectory")
+    simulate.add_argument("--output", "-o", help="JSON output file (default: stdout)")
+    _add_engine_options(simulate)
+    simulate.set_defaults(func=cmd_simulate)
+
+    sweep = sub.add_parser("sweep", help="Simulate a range of K values")
+    _add_system_options(sweep)
+    sweep.add_argument("--I", type=float, help="External entropy I (bits)")
+    sweep.add_argument("--K", type=float, help=argparse.SUPPRESS)
+    sweep.add_argument("--theta-max", type=float, help="Collapse threshold (bits)")
+    sweep.add_argument("--alpha", type=float, default=0.15, help="Dissipation rate")
+    sweep.add_argument("--k-min", type=float)
+    sweep.add_argument("--k-max", type=float)
+    sweep.add_argument("--k-step", type=float, default=0.1)
+    sweep.add_argument("--k-values", help="Comma-separated K values (overrides the range)")
+    sweep.add_argument("--workers", type=int, default=1, help="Worker processes")
+    sweep.add_argument("--output", "-o", help="JSONL output file (default: stdout)")
+    _add_engine_options(sweep)
+    sweep.set_defaults(func=cmd_sweep)
+
+    audit = sub.add_parser("audit", help="Run a full FSM audit and print the report")
+    _add_system_options(audit)
+    audit.add_argument("--description", default="", help="Operational context of the system")
+    audit.add_argument("--mock", action="store_true", help="Mock mode (no Gemini calls)")
+    audit.add_argument("--max-iterations", type=int, default=10)
+    audit.add_argument("--validation", choices=["independent", "pooled"], default="independent",
+                       help="VALIDATE mode: two independent stable batches, or pooled SPRT")
+    audit.add_argument("--warm-start", metavar="PATH",
+                       help="Warm-start index of solved audits (read for the starting K, updated on success)")
+    audit.add_argument("--calibration", metavar="CSV",
+                       help="Weekly input_entropy/capacity history: fitted I, K and volatilities replace the label values")
+    audit.add_argument("--candidates", type=int, default=1,
+                       help="K candidates simulated per ORIENT iteration (batched)")
+    audit.add_argument("--seed", type=int, help="Agent random seed")
+    audit.add_argument("--audit-id", help="Journal ID (resume if it already exists)")
+    audit.add_argument("--journal-dir", help="Journal directory (default: ISO_JOURNAL_DIR)")
+    audit.add_argument("--llm", choices=["gemini", "fake"],
+                       help="LLM backend (default: gemini, or ISO_LLM_BACKEND); 'fake' runs offline")
+    audit.add_argument("--deadline", type=float,
+                       help="Overall audit deadline in seconds (local statistical report if Gemini cannot answer in time)")
+    audit.add_argument("--verbose", action="store_true", help="Print agent logs to stdout")
+    audit.add_argument("--output", "-o", help="Markdown report file (default: stdout)")
+    audit.add_argument("--json", help="Write experiments and events as JSON to this file")
+    audit.set_defaults(func=cmd_audit)
+
+    batch = sub.add_parser("batch", help="Run simulate/audit jobs from a JSON or JSONL file")
+    batch.add_argument("input", help="JSONL (one job per line) or JSON array")
+    batch.add_argument("--workers", type=int, default=1, help="Worker processes")
+    batch.add_argument("--output", "-o", help="JSONL output file (default: stdout)")
+    _add_engine_options(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    calibrate = sub.add_parser("calibrate", help="Fit I, K and their volatilities to weekly data (CSV)")
+    calibrate.add_argument("input", help="CSV with one row per week")
+    calibrate.add_argument("--input-column", default="input_entropy", help="Weekly input entropy column (bits)")
+    calibrate.add_argument("--capacity-column", default="capacity", help="Weekly response capacity column (bits)")
+    calibrate.add_argument("--grid-size", type=int, default=200, help="Grid points per parameter")
+    calibrate.add_argument("--theta-max", type=float, help="Also report the posterior predictive collapse rate")
+    calibrate.add_argument("--seed", type=int)
+    calibrate.set_defaults(func=cmd_calibrate)
+
+    screen = sub.add_parser("screen", help="Rank a portfolio CSV by collapse risk (tiered screening)")
+    screen.add_argument("input", help="CSV: volatility, rigidity, buffer_months[, id, K]")
+    screen.add_argument("--threshold", type=float, default=0.05, help="Collapse probability deciding 'at risk'")
+    screen.add_argument("--small-runs", type=int, default=200, help="Runs per unit in the screening simulation")
+    screen.add_argument("--full-runs", type=int, default=5000, help="Runs per unit when still ambiguous")
+    screen.add_argument("--top", type=int, help="Only the N riskiest units")
+    screen.add_argument("--seed", type=int)
+    screen.add_argument("--output", "-o", help="JSONL output file (default: stdout)")
+    screen.set_defaults(func=cmd_screen)
+
+    sensitivity = sub.add_parser("sensitivity", help="Sobol indices of collapse rate and collapse week")
+    _add_system_options(sensitivity)
+    sensitivity.add_argument("--spread", type=float, default=0.3, help="Relative range around each grounded parameter")
+    sensitivity.add_argument("--n", type=int, default=512, help="Base sample size (n·10 parameter points)")
+    sensitivity.add_argument("--paths", type=int, default=64, help="Common shock paths per parameter point")
+    sensitivity.add_argument("--time-steps", type=int, default=52, help="Weeks per run")
+    sensitivity.add_argument("--workers", type=int, default=1, help="Worker processes")
+    sensitivity.add_argument("--seed", type=int)
+    sensitivity.add_argument("--output", "-o", help="JSON output file (default: stdout)")
+    sensitivity.set_defaults(func=cmd_sensitivity)
+
+    server = sub.add_parser("serve", help="Run the local HTTP service (/simulate, /sweep, /audit)")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument("--workers", type=int, default=2, help="Simulation worker processes")
+    server.add_argument("--audit-workers", type=int, default=4, help="Concurrent audits")
+    server.add_argument("--llm", choices=["gemini", "fake"], default="gemini",
+                        help="LLM backend ('fake' = offline stand-in for load tests)")
+    server.add_argument("--llm-concurrency", type=int, default=2, help="LLM calls in flight")
+    server.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM latency (seconds)")
+    server.add_argument("--max-rpm", type=int, default=5, help="Shared LLM rate limit (requests/minute)")
+    server.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,88 +12,72 @@ Componentes:
 - grounding: Mapeo UI → Física
 - telemetry: Señales de telemetría
 - prompt_templates: Prompts inteligentes por fase
-"""
+- events: Eventos tipados de progreso de la auditoría
+- journal: Checkpoint y reanudación de auditorías
 
-# ============================================================================
-# IMPORTS DEL AGENTE PRINCIPAL
-# ============================================================================
+Los símbolos públicos se cargan de forma perezosa (PEP 562): importar
+`src.core` no importa el agente ni el SDK de Gemini hasta que se usan.
+Así `from src.core import run_simulation` es barato para tests,
+workers y procesos hijos.
+"""
 
-from .agent import IsoEntropyAgent
+import importlib
+from typing import Any, Dict, List
 
 # ============================================================================
-# IMPORTS DE FÍSICA Y SIMULACIÓN
+# MAPA DE EXPORTS PEREZOSOS (símbolo → submódulo)
 # ============================================================================
 
-from .physics import (
-    run_simulation,
-    calculate_collapse_threshold
-)
+_LAZY_EXPORTS: Dict[str, str] = {
+    # Agent
+    "IsoEntropyAgent": ".agent",
 
-# ============================================================================
-# IMPORTS DE FSM (Máquina de Estados)
-# ============================================================================
+    # Physics & Simulation
+    "run_simulation": ".physics",
+    "calculate_collapse_threshold": ".physics",
 
-from .fsm import (
-    IsoEntropyFSM,
-    AgentPhase
-)
+    # FSM
+    "IsoEntropyFSM": ".fsm",
+    "AgentPhase": ".fsm",
 
-# ============================================================================
-# IMPORTS DE CONSTRAINTS (Validaciones)
-# ============================================================================
+    # Constraints
+    "apply_hard_rules": ".constraints",
+    "HardConstraintViolation": ".constraints",
 
-from .constraints import (
-    apply_hard_rules,
-    HardConstraintViolation
-)
+    # Grounding
+    "ground_inputs": ".grounding",
 
-# ============================================================================
-# IMPORTS DE GROUNDING (Mapeo de inputs)
-# ============================================================================
+    # Telemetry
+    "build_llm_signal": ".telemetry",
+    "TelemetryAggregator": ".telemetry",
 
-from .grounding import ground_inputs
+    # Prompts
+    "build_prompt_for_phase": ".prompt_templates",
+
+    # Events
+    "AuditEvent": ".events",
+    "AuditEventType": ".events",
+}
 
 # ============================================================================
-# IMPORTS DE TELEMETRÍA
+# EXPORTS PÚBLICOS
 # ============================================================================
 
-from .telemetry import build_llm_signal
+__all__ = list(_LAZY_EXPORTS)
 
-# ============================================================================
-# IMPORTS DE PROMPTS
-# ============================================================================
 
-from .prompt_templates import build_prompt_for_phase
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# ============================================================================
-# EXPORTS PÚBLICOS
-# ============================================================================
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Next access skips __getattr__
+    return value
 
-__all__ = [
-    # Agent
-    "IsoEntropyAgent",
-    
-    # Physics & Simulation
-    "run_simulation",
-    "calculate_collapse_threshold",
-    
-    # FSM
-    "IsoEntropyFSM",
-    "AgentPhase",
-    
-    # Constraints
-    "apply_hard_rules",
-    "HardConstraintViolation",
-    
-    # Grounding
-    "ground_inputs",
-    
-    # Telemetry
-    "build_llm_signal",
-    
-    # Prompts
-    "build_prompt_for_phase"
-]
+
+def __dir__() -> List[str]:
+    return sorted(__all__ + ["__version__", "__author__", "__description__"])
 
 # ============================================================================
 # VERSIÓN Y METADATA
@@ -101,4 +85,4 @@ __all__ = [
 
 __version__ = "2.3.0"
 __author__ = "Rogelio Alcántar Rangel"
-__description__ = "ISO-ENTROPÍA: Auditor de Fragilidad Estructural"
\ No newline at end of file
+__description__ = "ISO-ENTROPÍA: Auditor de Fragilidad Estructural"
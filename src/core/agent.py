@@ -3,22 +3,40 @@ import os
 import time
 import json
 import hashlib
-import math
+import random
+import threading
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator, Callable, Union, MutableMapping, Sequence, Tuple
 from dotenv import load_dotenv
 
-# ✓ CORRECT IMPORT (google-genai)
-from google import genai
+import numpy as np
 
-from .physics import run_simulation, calculate_collapse_threshold
+from .physics import run_simulation, calculate_collapse_threshold, wilson_upper_bound, VOLATILITY_I, VOLATILITY_K
+from .engine import simulate_paths
 from .grounding import ground_inputs
 from .constraints import apply_hard_rules, HardConstraintViolation
 from .fsm import IsoEntropyFSM, AgentPhase
 from .prompt_templates import build_prompt_for_phase
-from .telemetry import build_llm_signal
+from .telemetry import TelemetryAggregator, compact_log
+from .events import AuditEvent, AuditEventType, AuditListener
+from .experiment_log import ExperimentLog
+from .journal import AuditJournal, encode_rng_state, decode_rng_state
+from .llm_backends import LLMBackend, GeminiBackend, get_backend, REPORT, PHASE
+from .warm_start import WarmStartIndex
+from .calibration import Calibration
+from .mitigation import DEFAULT_INTERVENTIONS, Intervention, MitigationEvaluation, evaluate_mitigations
+from .retry import RETRIABLE, backoff_delay, call_with_timeout, classify_llm_error, is_quota_error
 
-load_dotenv()
+# google-genai and .env are loaded on first use (not at import time), so
+# importing the agent stays cheap for workers, tests and the CLI.
+_env_loaded = False
+
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
 
 
 # ============================================================================
@@ -26,16 +44,21 @@ load_dotenv()
 # ============================================================================
 
 class RateLimiter:
-    """Handles 5 RPM rate limit for Gemini."""
+    """Handles 5 RPM rate limit for Gemini. Thread-safe: one instance can be shared by many agents."""
     
     def __init__(self, max_rpm: int = 5):
         self.max_rpm = max_rpm
         self.min_interval = 60.0 / max_rpm  # 12 seconds
         self.request_timestamps = []
         self.total_requests = 0
+        self._lock = threading.Lock()
     
     def wait_if_needed(self, verbose: bool = True) -> float:
-        """Waits if necessary to respect 5 RPM."""
+        """Waits if necessary to respect 5 RPM (callers queue up behind the lock)."""
+        with self._lock:
+            return self._wait_locked(verbose)
+    
+    def _wait_locked(self, verbose: bool) -> float:
         now = time.time()
         
         # Clean up old timestamps (outside 60-second window)
@@ -69,6 +92,17 @@ class RateLimiter:
         self.total_requests += 1
         
         return now
+    
+    def time_until_available(self) -> float:
+        """Seconds until a request could go out without waiting (0 = now). Never blocks."""
+        now = time.time()
+        recent = [ts for ts in list(self.request_timestamps) if now - ts < 60.0]
+        wait = 0.0
+        if len(recent) >= self.max_rpm:
+            wait = 60.0 - (now - recent[-self.max_rpm]) + 0.5
+        if recent:
+            wait = max(wait, self.min_interval - (now - recent[-1]))
+        return max(0.0, wait)
 
 
 # ============================================================================
@@ -90,50 +124,181 @@ class IsoEntropyAgent:
         api_key: Optional[str] = None,
         mock_mode: bool = False,
         verbose: bool = True,
-        max_iterations: int = 10
+        max_iterations: int = 10,
+        on_event: Optional[AuditListener] = None,
+        compact_after: int = 50,
+        compact_max_bytes: int = 2_000_000,
+        compact_keep: int = 10,
+        seed: Optional[int] = None,
+        journal_dir: Optional[str] = None,
+        client: Any = None,
+        backend: Union[LLMBackend, str, None] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        deadline_s: Optional[float] = None,
+        llm_timeout_s: float = 120.0,
+        llm_max_attempts: int = 4,
+        backoff_base_s: float = 2.0,
+        backoff_max_s: float = 30.0,
+        min_attempt_s: float = 5.0,
+        speculative_candidates: int = 1,
+        validation_mode: str = "independent",
+        validation_runs: int = 250,
+        warm_start: Union[WarmStartIndex, str, None] = None,
+        cache: Optional[MutableMapping[str, str]] = None,
+        simulation_cache: Optional[MutableMapping[Tuple, Dict[str, Any]]] = None,
+        calibration: Optional[Calibration] = None,
+        mitigations: Optional[Sequence[Intervention]] = None,
+        mitigation_runs: int = 1000
     ):
+        _load_env()
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         self.mock_mode = mock_mode or os.getenv("ISO_MOCK_MODE", "false").lower() == "true"
         self.verbose = verbose
         self.max_iterations = max_iterations
         
-        if not self.mock_mode and not self.api_key:
-            raise ValueError("❌ GEMINI_API_KEY not found")
+        # Experiment-log compaction: fold old rows once either threshold is crossed
+        self.compact_after = compact_after
+        self.compact_max_bytes = compact_max_bytes
+        self.compact_keep = compact_keep
         
-        if not self.mock_mode:
-            # ✓ CORRECT INITIALIZATION (google-genai)
-            self.client = genai.Client(api_key=self.api_key)
-        else:
-            self.client = None
+        # Checkpoint/resume: seeded RNG (its state is journaled) + journal location
+        self.rng = random.Random(seed)
+        self.journal_dir = journal_dir
+        
+        # Final LLM call: overall audit deadline (None = unbounded), per-attempt
+        # timeout, retries with backoff; below min_attempt_s of budget left the
+        # local statistical report is returned instead of starting an attempt
+        self.deadline_s = deadline_s
+        self.llm_timeout_s = llm_timeout_s
+        self.llm_max_attempts = max(1, llm_max_attempts)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.min_attempt_s = min_attempt_s
+        self._deadline: Optional[float] = None
+        
+        # ORIENT: K values simulated per iteration (current K plus the next
+        # steps, in one batched run); 1 = classic one-K-per-iteration search
+        self.speculative_candidates = max(1, speculative_candidates)
+        
+        # VALIDATE: "independent" (two stable 500-run batches) or "pooled"
+        # (SPRT over all batches at the same K, validation_runs per batch)
+        self.validation_mode = validation_mode
+        self.validation_runs = validation_runs
+        
+        # Calibration fitted to historical weekly data (calibration.py): its
+        # posterior means replace the label-grounded I, K0 and the volatilities
+        self.calibration = calibration
+        params = calibration.to_params() if calibration is not None else {}
+        self.volatility_i = params.get("volatility_i", VOLATILITY_I)
+        self.volatility_k = params.get("volatility_k", VOLATILITY_K)
+        
+        # Mitigation actions of the report, each evaluated against the final
+        # parameters with paired simulations (mitigation.py); () = no evaluation
+        self.mitigations = tuple(DEFAULT_INTERVENTIONS if mitigations is None else mitigations)
+        self.mitigation_runs = mitigation_runs
+        self.mitigation_evaluation: Optional[MitigationEvaluation] = None
+        
+        # Warm start: index of solved audits (or its path); None = always start at K0
+        self.warm_start = WarmStartIndex(warm_start) if isinstance(warm_start, str) else warm_start
+        
+        # LLM backend: an explicit backend (or its name, also via ISO_LLM_BACKEND);
+        # by default Gemini, around an injected genai-style client or a lazy one
+        backend = backend or os.getenv("ISO_LLM_BACKEND") or None
+        if backend is None or backend == "gemini":
+            if not self.mock_mode and not self.api_key and client is None:
+                raise ValueError("❌ GEMINI_API_KEY not found")
+            backend = GeminiBackend(api_key=self.api_key, client=client)
+        elif isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend: LLMBackend = backend
         
         # Agent state
-        self.fsm = IsoEntropyFSM()
-        self.experiment_log: List[Dict[str, Any]] = []
-        self.rate_limiter = RateLimiter(max_rpm=5)
-        self.cache = {}
+        self.fsm = IsoEntropyFSM(validation_mode=self.validation_mode)
+        self.experiment_log = ExperimentLog()
+        self.telemetry = TelemetryAggregator()
+        self.rate_limiter = rate_limiter or RateLimiter(max_rpm=5)
+        # Report cache and optional simulation cache; both may be shared
+        # between agents (e.g. BoundedCache instances held by the UI process)
+        self.cache = cache if cache is not None else {}
+        self.simulation_cache = simulation_cache
+        self._sim_repeats: Dict[Tuple[float, int], int] = {}
+        self._listeners: List[AuditListener] = [on_event] if on_event else []
+    
+    @property
+    def client(self):
+        """google-genai client of the Gemini backend (None in mock mode or with other backends)."""
+        if self.mock_mode or not isinstance(self.backend, GeminiBackend):
+            return None
+        return self.backend.client
+    
+    @client.setter
+    def client(self, value):
+        self.backend = GeminiBackend(api_key=self.api_key, client=value)
     
     def _log(self, message: str):
         if self.verbose:
             print(message)
     
-    def _get_cache_key(self, user_input: str, volatility: str, rigidity: str) -> str:
-        """Cache key."""
-        key = f"{user_input}|{volatility}|{rigidity}"
+    def _reset_state(self):
+        """Fresh FSM, log and repeat counters for a new (or resumed) audit."""
+        self.fsm = IsoEntropyFSM(validation_mode=self.validation_mode)
+        self.experiment_log = ExperimentLog()
+        self.telemetry = TelemetryAggregator()
+        self._sim_repeats = {}
+        self.mitigation_evaluation = None
+    
+    # ========================================================================
+    # EVENTS
+    # ========================================================================
+    
+    def subscribe(self, listener: AuditListener) -> Callable[[], None]:
+        """Registers an event listener. Returns a function that unsubscribes it."""
+        self._listeners.append(listener)
+        
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        
+        return unsubscribe
+    
+    def _emit(self, event_type: AuditEventType, **data: Any):
+        """Delivers an event to every listener. A failing listener never aborts the audit."""
+        if not self._listeners:
+            return
+        
+        event = AuditEvent(type=event_type, data=data)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                self._log(f"⚠️ Event listener error ({event_type.name}): {e}")
+    
+    def _get_cache_key(self, user_input: str, volatility: str, rigidity: str, buffer: int) -> str:
+        """Cache key: audit inputs plus every setting that changes the report."""
+        calibration = sorted(self.calibration.to_params().items()) if self.calibration is not None else None
+        mitigations = [(m.name, sorted(m.scale.items()), sorted(m.shift.items())) for m in self.mitigations]
+        warm_start = os.path.abspath(self.warm_start.path) if self.warm_start is not None else None
+        key = (f"{user_input}|{volatility}|{rigidity}|{buffer}|{self.mock_mode}|{self.max_iterations}|"
+               f"{self.backend.name}|{self.validation_mode}|{self.speculative_candidates}|{calibration}|"
+               f"{mitigations}|{self.mitigation_runs}|{warm_start}")
         return hashlib.md5(key.encode()).hexdigest()
     
     def _calculate_wilson_upper_bound(self, collapses: int, runs: int) -> float:
         """Calculates Wilson score interval upper bound (95%)."""
-        if runs == 0:
-            return 1.0
-        
-        z = 1.96  # 95% confidence
-        phat = collapses / runs
-        denom = 1 + (z**2 / runs)
-        centre = phat + (z**2 / (2 * runs))
-        adj = z * math.sqrt((phat * (1 - phat) / runs) + (z**2 / (4 * runs**2)))
-        upper = (centre + adj) / denom
-        
-        return min(1.0, upper)
+        return wilson_upper_bound(collapses, runs)
+    
+    def _remaining_budget(self) -> Optional[float]:
+        """Seconds left before the audit deadline (None = no deadline)."""
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+    
+    def _maybe_compact_log(self):
+        """Keeps memory and prompt size bounded in very long or resumed audits."""
+        log = self.experiment_log
+        if len(log) > self.compact_after or log.approx_nbytes() > self.compact_max_bytes:
+            if compact_log(log, keep_recent=self.compact_keep):
+                self._log(f"🗜️ Experiment log compacted ({log.folded_rows} experiments folded)")
     
     # ========================================================================
     # STEP 1: GROUND INPUTS (Local Calculation)
@@ -154,6 +319,10 @@ class IsoEntropyAgent:
         
         # 1. Ground inputs
         params = ground_inputs(volatility, rigidity, buffer)
+        if self.calibration is not None:
+            params.update(I=self.calibration.I, K0=self.calibration.K)
+            self._log(f"📐 Calibrated from data: I={self.calibration.I:.2f} (σ={self.volatility_i:.0%}), "
+                      f"K={self.calibration.K:.2f} (σ={self.volatility_k:.0%})")
         self._log(f"📊 Initial parameters: I={params['I']:.2f}, K={params['K0']:.2f}")
         
         # 2. Calculate theta_max
@@ -189,22 +358,88 @@ class IsoEntropyAgent:
         user_input: str,
         volatility: str,
         rigidity: str,
-        buffer: int
+        buffer: int,
+        audit_id: Optional[str] = None
     ) -> str:
         """
         Complete audit with FSM and loops.
+        
+        With an audit_id every step is journaled to disk; calling again
+        with the same audit_id resumes from the last checkpoint.
+        """
+        return "".join(
+            self._run_audit(user_input, volatility, rigidity, buffer, stream=False, audit_id=audit_id)
+        )
+    
+    def audit_system_stream(
+        self,
+        user_input: str,
+        volatility: str,
+        rigidity: str,
+        buffer: int,
+        audit_id: Optional[str] = None
+    ) -> Iterator[str]:
         """
+        Same audit as audit_system(), but yields the report in chunks
+        as Gemini produces them (generate_content_stream).
+        The assembled report is cached once the stream is exhausted.
+        """
+        yield from self._run_audit(user_input, volatility, rigidity, buffer, stream=True, audit_id=audit_id)
+    
+    def _run_audit(
+        self,
+        user_input: str,
+        volatility: str,
+        rigidity: str,
+        buffer: int,
+        stream: bool,
+        audit_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """Shared audit pipeline. Yields the whole report at once unless stream=True."""
+        
+        self._deadline = time.monotonic() + self.deadline_s if self.deadline_s is not None else None
         
         # Check cache
-        cache_key = self._get_cache_key(user_input, volatility, rigidity)
+        cache_key = self._get_cache_key(user_input, volatility, rigidity, buffer)
         if cache_key in self.cache:
             self._log("✅ Report retrieved from cache")
-            return self.cache[cache_key]
+            self._emit(AuditEventType.AUDIT_COMPLETE, cached=True, mock=self.mock_mode,
+                       experiments=self.telemetry.count, final_phase=self.fsm.phase_name())
+            yield self.cache[cache_key]
+            return
+        
+        # Every audit that is not served from the cache starts from a fresh state
+        self._reset_state()
+        
+        # Journal (checkpoint/resume)
+        journal = AuditJournal.for_audit(audit_id, self.journal_dir) if audit_id else None
+        checkpoint = journal.checkpoint() if journal else None
+        if journal:
+            inputs = {"user_input": user_input, "volatility": volatility,
+                      "rigidity": rigidity, "buffer": buffer}
+            if checkpoint is None:
+                journal.append("start", audit_id=audit_id, inputs=inputs)
+            elif checkpoint["inputs"] not in (None, inputs):
+                raise ValueError(f"❌ Journal '{audit_id}' belongs to a different audit input")
+            elif checkpoint["report"] is not None:
+                self._log(f"✅ Report restored from journal '{audit_id}'")
+                report = checkpoint["report"]
+                self.cache[cache_key] = report
+                self._emit(AuditEventType.AUDIT_COMPLETE, cached=True, mock=self.mock_mode,
+                           experiments=len(checkpoint["experiments"]), final_phase=self.fsm.phase_name())
+                yield from self._emit_text(report, stream)
+                return
         
         # Ground inputs
-        physical_params = self._ground_inputs_and_validate(
-            user_input, volatility, rigidity, buffer
-        )
+        if checkpoint and checkpoint["params"]:
+            physical_params = checkpoint["params"]
+            self._log(f"♻️ Resuming audit '{audit_id}' from journal")
+        else:
+            physical_params = self._ground_inputs_and_validate(
+                user_input, volatility, rigidity, buffer
+            )
+            if journal:
+                journal.append("grounded", params=physical_params)
         
         I = physical_params['I']
         K_base = physical_params['K0']
@@ -212,15 +447,22 @@ class IsoEntropyAgent:
         liquidity = physical_params['liquidity']
         capital = physical_params['capital']
         theta_max = physical_params['theta_max']
+        self._emit(AuditEventType.GROUNDED, params=dict(physical_params))
         
         # Mock mode
         if self.mock_mode:
             self._log("🎭 MOCK MODE")
+            mitigations = self._evaluate_mitigations(physical_params, K_base)
             report = self._generate_mock_report(
-                user_input, I, K_base, theta_max, stock, liquidity, capital
+                user_input, I, K_base, theta_max, stock, liquidity, capital, mitigations
             )
+            yield from self._emit_text(report, stream)
             self.cache[cache_key] = report
-            return report
+            if journal:
+                journal.append("report", report=report)
+            self._emit(AuditEventType.AUDIT_COMPLETE, cached=False, mock=True,
+                       experiments=0, final_phase=self.fsm.phase_name())
+            return
         
         # ====================================================================
         # MAIN LOOP: ORIENT → VALIDATE → STRESS → CONCLUDE
@@ -228,53 +470,90 @@ class IsoEntropyAgent:
         
         current_K = K_base
         iteration = 0
+        if checkpoint and checkpoint["experiments"]:
+            iteration, current_K = self._restore_from_journal(checkpoint["experiments"])
+        elif self.warm_start is not None:
+            current_K = self._warm_start_K(I, K_base, theta_max, checkpoint, journal)
         
-        while iteration < self.max_iterations:
+        while iteration < self.max_iterations and self.fsm.allow_simulation():
             iteration += 1
             self._log(f"\n📍 Iteration {iteration}/{self.max_iterations} - Phase: {self.fsm.phase_name()}")
             
             # 1. Run simulation
-            self._log(f"🔬 Simulating: I={I:.2f}, K={current_K:.2f}, θ_max={theta_max:.2f}")
-            
-            sim_result = run_simulation(I, current_K, theta_max, runs=500)
+            candidates = None
+            runs = 500
+            if self.validation_mode == "pooled" and self.fsm.phase == AgentPhase.VALIDATE:
+                runs = self.validation_runs
+            if self.speculative_candidates > 1 and self.fsm.phase == AgentPhase.ORIENT:
+                step = self._orient_step(self.telemetry.last_collapse if self.telemetry.count else None)
+                sim_result, candidates = self._simulate_candidates(I, current_K, theta_max, step)
+                self._log("🔬 Simulating candidates: " + ", ".join(
+                    f"K={c['K']:.2f}→{c['collapse_rate']:.1%}" for c in candidates
+                ))
+                current_K = sim_result['K']
+                self._log(f"🎯 Selected K={current_K:.2f}")
+            else:
+                self._log(f"🔬 Simulating: I={I:.2f}, K={current_K:.2f}, θ_max={theta_max:.2f}")
+                sim_result = self._simulate(I, current_K, theta_max, runs)
             collapse_rate = sim_result['collapse_rate']
-            collapses = sim_result.get('total_collapses', int(collapse_rate * 500))
-            ub95 = self._calculate_wilson_upper_bound(collapses, 500)
+            collapses = sim_result.get('total_collapses', int(collapse_rate * runs))
+            ub95 = self._calculate_wilson_upper_bound(collapses, runs)
             
             self._log(f"📊 Result: Collapse={collapse_rate:.1%}, UB95={ub95:.1%}")
             
             # 2. Log experiment
-            self.experiment_log.append({
+            record = {
                 'cycle': iteration,
                 'phase': self.fsm.phase_name(),
-                'hypothesis': {'I': I, 'K': current_K},
-                'result': {
-                    'collapse_rate': collapse_rate,
-                    'upper_ci95': ub95,
-                    'total_collapses': collapses,
-                    'runs': 500,
-                    'trajectory': sim_result.get('trajectory', [])
-                }
-            })
+                'I': I,
+                'K': current_K,
+                'theta_max': theta_max,
+                'collapse_rate': collapse_rate,
+                'upper_ci95': ub95,
+                'total_collapses': collapses,
+                'runs': runs,
+                'trajectory': sim_result.get('trajectory', [])
+            }
+            self._record_experiment(record)
+            if candidates:
+                self._emit(AuditEventType.SIMULATION, **record, candidates=candidates)
+            else:
+                self._emit(AuditEventType.SIMULATION, **record)
             
             # 3. Update FSM
-            self.fsm.update(collapse_rate, ub95)
+            previous_phase = self.fsm.phase_name()
+            self.fsm.update(collapse_rate, ub95, collapses=collapses, runs=runs, K=current_K)
             self._log(f"🔄 FSM updated → {self.fsm.phase_name()}")
+            pooled = self.fsm.pooled_summary() if self.validation_mode == "pooled" else None
+            if self.warm_start is not None and previous_phase == AgentPhase.VALIDATE.name \
+                    and self.fsm.phase == AgentPhase.STRESS:
+                self._record_warm_start(I, theta_max, current_K, ub95, runs, pooled)
+            if pooled and previous_phase == AgentPhase.VALIDATE.name:
+                self._log(f"📦 Pooled: {pooled['collapses']}/{pooled['runs']} collapses, "
+                          f"UB95={pooled['upper_ci95']:.1%}, SPRT → {pooled['decision']}")
+            if self.fsm.phase_name() != previous_phase:
+                self._emit(
+                    AuditEventType.FSM_TRANSITION,
+                    cycle=iteration,
+                    from_phase=previous_phase,
+                    to_phase=self.fsm.phase_name(),
+                    stable_hits=self.fsm.stable_hits,
+                    **({"pooled": pooled} if pooled else {})
+                )
             
             # 4. Phase-based decision
             if self.fsm.phase == AgentPhase.CONCLUDE:
                 self._log("✅ Moving to CONCLUDE - Generating final report")
-                break
             
             elif self.fsm.phase == AgentPhase.ORIENT:
-                # Adjust K to find stability
-                if collapse_rate < 0.05:
+                # Adjust K to find stability (a K rejected by pooled validation is never kept)
+                rejected = pooled is not None and previous_phase == AgentPhase.VALIDATE.name
+                if collapse_rate < 0.05 and not rejected:
                     self._log("✅ Stability found in ORIENT")
                     current_K = current_K  # Maintain K
                 else:
                     # Increase K
-                    delta_k = 0.2 if collapse_rate > 0.5 else 0.1
-                    current_K = min(current_K + delta_k, 10.0)
+                    current_K = min(current_K + self._orient_step(collapse_rate), 10.0)
                     self._log(f"📈 Increasing K to {current_K:.2f}")
             
             elif self.fsm.phase == AgentPhase.VALIDATE:
@@ -284,6 +563,20 @@ class IsoEntropyAgent:
             elif self.fsm.phase == AgentPhase.STRESS:
                 # Keep K constant
                 self._log("⚠️ In STRESS phase (K constant)")
+            
+            # 5. Checkpoint
+            if journal:
+                journal.append(
+                    "experiment",
+                    record=record,
+                    fsm=self.fsm.to_state(),
+                    next_K=current_K,
+                    rng_state=encode_rng_state(self.rng.getstate()),
+                    **({"candidates": candidates} if candidates else {})
+                )
+            
+            if self.fsm.phase == AgentPhase.CONCLUDE:
+                break
         
         # ====================================================================
         # GENERATE FINAL REPORT WITH GEMINI
@@ -291,8 +584,285 @@ class IsoEntropyAgent:
         
         self._log("\n📝 Generating final report with Gemini...")
         
+        mitigations = self._evaluate_mitigations(physical_params, current_K)
+        final_prompt = self._build_final_prompt(
+            user_input, I, current_K, theta_max, stock, liquidity, mitigations
+        )
+        
+        # Make LLM call (retries with backoff, bounded by the audit deadline)
+        kind = REPORT if self.fsm.phase == AgentPhase.CONCLUDE else PHASE
+        model = self.backend.model_for(kind)
+        header = self._report_header(volatility, rigidity, buffer, I, current_K, theta_max)
+        report = None
+        fallback_reason = None
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            limiter_wait = self.rate_limiter.time_until_available()
+            budget = self._remaining_budget()
+            if budget is not None and budget < limiter_wait + self.min_attempt_s:
+                fallback_reason = "deadline"
+                break
+            
+            self.rate_limiter.wait_if_needed(verbose=self.verbose)
+            budget = self._remaining_budget()
+            attempt_timeout = self.llm_timeout_s if budget is None else min(self.llm_timeout_s, budget)
+            streamed_any = False
+            llm_started = time.time()
+            self._emit(AuditEventType.LLM_START, model=model, stream=stream, attempt=attempt,
+                       timeout_s=attempt_timeout, prompt_chars=len(final_prompt))
+            
+            try:
+                if stream:
+                    parts = []
+                    for text in self._stream_with_timeout(kind, final_prompt, attempt_timeout):
+                        if not streamed_any:
+                            # Header only goes out once Gemini has actually answered,
+                            # so a failed attempt can still be retried or fall back.
+                            streamed_any = True
+                            yield header
+                        parts.append(text)
+                        yield text
+                    
+                    footer = self._report_footer()
+                    if not streamed_any:
+                        yield header
+                    yield footer
+                    report = header + "".join(parts) + footer
+                else:
+                    text = call_with_timeout(
+                        lambda: self.backend.generate(final_prompt, kind),
+                        attempt_timeout
+                    )
+                    report = header + text + self._report_footer()
+                    yield report
+            
+            except Exception as e:
+                error_str = str(e)
+                error_kind = classify_llm_error(e)
+                self._log(f"❌ Gemini Error (attempt {attempt}, {error_kind}): {error_str[:100]}")
+                self._emit(AuditEventType.LLM_FINISH, model=model, ok=False, attempt=attempt,
+                           retriable=error_kind == RETRIABLE, elapsed_s=time.time() - llm_started,
+                           error=error_str[:200])
+                
+                if streamed_any:
+                    # Part of the answer is already out: close it instead of retrying
+                    if error_kind == RETRIABLE:
+                        note = f"\n\n*⚠️ Report interrupted ({type(e).__name__}).*"
+                        yield note + self._report_footer()
+                        report = header + "".join(parts) + note + self._report_footer()
+                        break
+                    raise
+                if error_kind != RETRIABLE:
+                    raise
+                if attempt >= self.llm_max_attempts:
+                    fallback_reason = "quota" if is_quota_error(e) else "retries_exhausted"
+                    break
+                
+                delay = backoff_delay(attempt, self.backoff_base_s, self.backoff_max_s,
+                                      floor_s=self.rate_limiter.time_until_available())
+                budget = self._remaining_budget()
+                if budget is not None and budget < delay + self.min_attempt_s:
+                    fallback_reason = "deadline"
+                    break
+                self._emit(AuditEventType.LLM_RETRY, model=model, attempt=attempt, delay_s=delay,
+                           error=error_str[:200])
+                self._log(f"🔁 Retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            
+            self._emit(AuditEventType.LLM_FINISH, model=model, ok=True, attempt=attempt,
+                       fallback=False, elapsed_s=time.time() - llm_started, report_chars=len(report))
+            break
+        
+        if report is None:
+            # Budget or retries exhausted: answer on time with the local statistical report
+            self._log(f"💾 No LLM report ({fallback_reason}). Generating local statistical report...")
+            report = self._generate_local_report(header, fallback_reason)
+            yield from self._emit_text(report, stream)
+        
+        # Cache result
+        self.cache[cache_key] = report
+        if journal:
+            journal.append("report", report=report)
+        
+        self._log("✅ Audit completed successfully")
+        self._emit(AuditEventType.AUDIT_COMPLETE, cached=False, mock=fallback_reason is not None,
+                   fallback=fallback_reason, experiments=self.telemetry.count,
+                   final_phase=self.fsm.phase_name())
+    
+    def _evaluate_mitigations(self, params: Dict[str, Any], K: float) -> Optional[MitigationEvaluation]:
+        """Paired simulation of the mitigation actions at the final K (seeded from the journaled RNG)."""
+        if not self.mitigations:
+            return None
+        
+        evaluation = evaluate_mitigations(
+            params, K=K, interventions=self.mitigations, runs=self.mitigation_runs,
+            volatility_i=self.volatility_i, volatility_k=self.volatility_k,
+            seed=self.rng.getrandbits(32)
+        )
+        self.mitigation_evaluation = evaluation
+        best = evaluation.options[0]
+        self._log(f"🛡️ Mitigations evaluated: best '{best.name}' "
+                  f"({best.delta_collapse:+.1%} collapse, {best.delta_survival:+.1f} weeks)")
+        self._emit(AuditEventType.MITIGATIONS, **evaluation.to_dict())
+        return evaluation
+    
+    def _warm_start_K(
+        self,
+        I: float,
+        K_base: float,
+        theta_max: float,
+        checkpoint: Optional[Dict[str, Any]],
+        journal: Optional[AuditJournal]
+    ) -> float:
+        """Starting K from the nearest solved audits (journaled, so a resume starts at the same K)."""
+        if checkpoint and checkpoint.get("warm_start"):
+            return checkpoint["warm_start"]["K_start"]
+        
+        hint = self.warm_start.query(I, theta_max)
+        if hint is None:
+            return K_base
+        
+        # One ORIENT step below the bracket: the climb still finds the minimal K
+        K_start = min(10.0, max(K_base, round(hint.K_low - self._orient_step(None), 10)))
+        self._log(f"🔥 Warm start: K_pred={hint.K_pred:.2f} [{hint.K_low:.2f}-{hint.K_high:.2f}], "
+                  f"confidence={hint.confidence:.0%} → starting at K={K_start:.2f}")
+        self._emit(AuditEventType.WARM_START, K_start=K_start, K_base=K_base, K_pred=hint.K_pred,
+                   K_low=hint.K_low, K_high=hint.K_high, confidence=hint.confidence,
+                   neighbours=hint.neighbours)
+        if journal:
+            journal.append("warm_start", K_start=K_start, K_pred=hint.K_pred, confidence=hint.confidence)
+        return K_start
+    
+    def _record_warm_start(self, I: float, theta_max: float, K: float, ub95: float, runs: int,
+                           pooled: Optional[Dict[str, Any]]):
+        """Stores the validated K of this audit in the warm-start index."""
+        if pooled:
+            ub95, runs = pooled["upper_ci95"], pooled["runs"]
+        else:
+            runs = runs * max(1, self.fsm.stable_hits)
+        try:
+            self.warm_start.record(I, theta_max, K, ub95, runs)
+        except OSError as e:
+            self._log(f"⚠️ Warm-start index not updated: {e}")
+    
+    @staticmethod
+    def _orient_step(collapse_rate: Optional[float]) -> float:
+        """K increment in ORIENT: larger while far from stability."""
+        return 0.2 if collapse_rate is not None and collapse_rate > 0.5 else 0.1
+    
+    def _simulate_candidates(
+        self,
+        I: float,
+        K: float,
+        theta_max: float,
+        step: float,
+        runs: int = 500
+    ):
+        """
+        Simulates K, K+step, ... (speculative_candidates values) in one batched
+        NumPy run with common random numbers, so candidates differ only in K.
+        
+        Returns (result of the selected candidate, summary of all candidates).
+        The selected one is the lowest K that is statistically stable, or the
+        highest K when none is (ORIENT then continues from there).
+        """
+        ks = sorted({round(min(K + j * step, 10.0), 10) for j in range(self.speculative_candidates)})
+        n = len(ks)
+        
+        # Seeded from the agent RNG so journaled audits replay identically
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        z_i, z_k = rng.standard_normal((2, 52, runs))
+        paths = simulate_paths(
+            I, np.repeat(ks, runs), theta_max,
+            normals=(np.tile(z_i, (1, n)), np.tile(z_k, (1, n))),
+            volatility_i=self.volatility_i, volatility_k=self.volatility_k,
+            track_paths=[(j + 1) * runs - 1 for j in range(n)]
+        )
+        
+        collapsed = paths["collapsed"].reshape(n, runs)
+        results = []
+        for j, k in enumerate(ks):
+            collapses = int(collapsed[j].sum())
+            results.append({
+                "K": k,
+                "collapse_rate": collapses / runs,
+                "upper_ci95": wilson_upper_bound(collapses, runs),
+                "total_collapses": collapses,
+                "trajectory": paths["trajectories"][j]
+            })
+        
+        stable = [r for r in results if r["collapse_rate"] < 0.05 and r["upper_ci95"] < 0.05]
+        selected = stable[0] if stable else results[-1]
+        summary = [{key: r[key] for key in ("K", "collapse_rate", "upper_ci95")} for r in results]
+        return selected, summary
+    
+    def _simulate(self, I: float, K: float, theta_max: float, runs: int) -> Dict[str, Any]:
+        """
+        One Monte Carlo batch. With a simulation cache, the batch is seeded from
+        (I, K, θ_max, runs, repeat number at this K), so identical work done by
+        any agent sharing the cache is computed once; repeats at the same K
+        (VALIDATE) still get independent samples.
+        """
+        volatility = {"volatility_i": self.volatility_i, "volatility_k": self.volatility_k}
+        if self.simulation_cache is None:
+            return run_simulation(I, K, theta_max, runs=runs, rng=self.rng, **volatility)
+        
+        repeat = self._sim_repeats.get((round(K, 9), runs), 0)
+        key = (round(I, 9), round(K, 9), round(theta_max, 9), runs, repeat,
+               round(self.volatility_i, 9), round(self.volatility_k, 9))
+        cached = self.simulation_cache.get(key)
+        if cached is not None:
+            self._log("♻️ Simulation retrieved from cache")
+            return cached
+        
+        seed = int(hashlib.md5(repr(key).encode()).hexdigest()[:16], 16)
+        result = run_simulation(I, K, theta_max, runs=runs, rng=random.Random(seed), **volatility)
+        self.simulation_cache[key] = result
+        return result
+    
+    def _record_experiment(self, record: Dict[str, Any]):
+        """Adds one experiment to the log and the telemetry aggregator."""
+        repeat_key = (round(record['K'], 9), record['runs'])
+        self._sim_repeats[repeat_key] = self._sim_repeats.get(repeat_key, 0) + 1
+        self.experiment_log.record(**record)
+        self.telemetry.update(record['I'], record['K'], record['collapse_rate'], record['theta_max'])
+        self._maybe_compact_log()
+    
+    def _restore_from_journal(self, experiments: List[Dict[str, Any]]):
+        """Replays journaled experiments. Returns (last iteration, next K)."""
+        for entry in experiments:
+            self._record_experiment(entry["record"])
+        
+        last = experiments[-1]
+        self.fsm.load_state(last["fsm"])
+        self.rng.setstate(decode_rng_state(last["rng_state"]))
+        self._log(
+            f"♻️ Restored {len(experiments)} experiments "
+            f"(phase {self.fsm.phase_name()}, next K={last['next_K']:.2f})"
+        )
+        return last["record"]["cycle"], last["next_K"]
+    
+    # ========================================================================
+    # REPORT ASSEMBLY
+    # ========================================================================
+    
+    def _build_final_prompt(
+        self,
+        user_input: str,
+        I: float,
+        current_K: float,
+        theta_max: float,
+        stock: float,
+        liquidity: float,
+        mitigations: Optional[MitigationEvaluation] = None
+    ) -> str:
+        """Builds the CONCLUDE prompt with the experiment history."""
+        
         # Build master prompt with experiment history
-        llm_signal = build_llm_signal(self.experiment_log)
+        llm_signal = self.telemetry.signal()
         prompt = build_prompt_for_phase(
             phase=AgentPhase.CONCLUDE,  # Force executive report format
             phase_reasoning=self.fsm.phase_reasoning(),
@@ -300,11 +870,24 @@ class IsoEntropyAgent:
             llm_signal=llm_signal
         )
         
+        if mitigations is not None:
+            mitigation_block = f"""
+SIMULATED MITIGATION OPTIONS (ranked, paired Monte Carlo against the final parameters):
+{mitigations.to_markdown()}
+"""
+            mitigation_instruction = (
+                "[Numbered list of the 3 best-ranked simulated options above, each with its simulated "
+                "change in collapse probability and survival horizon, and how to implement it]"
+            )
+        else:
+            mitigation_block = ""
+            mitigation_instruction = "[Numbered list of 3 specific and actionable actions]"
+        
         # Add final instructions
-        final_prompt = f"""{prompt}
+        return f"""{prompt}
 
 HISTORY OF EXPERIMENTS PERFORMED:
-{json.dumps(self.experiment_log, indent=2)}
+{json.dumps(self.experiment_log.to_list(), indent=2)}
 
 FINAL SYSTEM PARAMETERS:
 - External Entropy (I): {I:.2f} bits
@@ -313,7 +896,7 @@ FINAL SYSTEM PARAMETERS:
 - Collapse Threshold: {theta_max:.2f} bits
 - Stock Buffer: {stock:.2f} months
 - Liquidity: {liquidity:.2f}
-
+{mitigation_block}
 GENERATE A COMPLETE EXECUTIVE REPORT IN MARKDOWN FORMAT WITH THE FOLLOWING EXACT STRUCTURE:
 
 ### Forensic Audit Report: [System Name]
@@ -334,7 +917,7 @@ GENERATE A COMPLETE EXECUTIVE REPORT IN MARKDOWN FORMAT WITH THE FOLLOWING EXACT
 [Temporal estimation of stability under current conditions]
 
 ### 4. Concrete Mitigation Actions
-[Numbered list of 3 specific and actionable actions]
+{mitigation_instruction}
 
 ---
 
@@ -344,28 +927,32 @@ GENERATE A COMPLETE EXECUTIVE REPORT IN MARKDOWN FORMAT WITH THE FOLLOWING EXACT
 
 IMPORTANT: Use a professional tone, explain technical terms in business language, and ensure the report is complete and actionable.
 """
-        
-        # Make Gemini call
-        self.rate_limiter.wait_if_needed()
-
-        try:
-            model = "gemini-3-pro-preview" if self.fsm.phase == AgentPhase.CONCLUDE else "gemini-3-flash-preview"
-            response = self.client.models.generate_content(
-                model=model,
-                contents=final_prompt
-            )
-            
-            report = f"""# 🎯 Forensic Audit - ISO-ENTROPY
+    
+    def _report_header(
+        self,
+        volatility: str,
+        rigidity: str,
+        buffer: int,
+        I: float,
+        current_K: float,
+        theta_max: float
+    ) -> str:
+        """Report section that precedes Gemini's text."""
+        return f"""# 🎯 Forensic Audit - ISO-ENTROPY
 
 ## 📊 Execution Context
 - **Analyzed System:** {volatility} volatility, {rigidity} rigidity, {buffer} months buffer
-- **Experiments Performed:** {len(self.experiment_log)}
+- **Experiments Performed:** {self.telemetry.count}
 - **Final Parameters:** I={I:.2f}, K={current_K:.2f}, θ_max={theta_max:.2f}
 - **Final Phase:** {self.fsm.phase_name()}
 
 ---
 
-{response.text}
+"""
+    
+    def _report_footer(self) -> str:
+        """Report section that follows Gemini's text (experiment table)."""
+        footer = """
 
 ---
 
@@ -374,40 +961,127 @@ IMPORTANT: Use a professional tone, explain technical terms in business language
 | Cycle | Phase | K (bits) | Collapse (%) | UB95 (%) |
 |-------|------|----------|-------------|----------|
 """
-            
-            for exp in self.experiment_log:
-                k = exp['hypothesis']['K']
-                collapse = exp['result']['collapse_rate']
-                ub = exp['result']['upper_ci95']
-                phase = exp['phase']
-                report += f"| {exp['cycle']} | {phase} | {k:.2f} | {collapse:.1%} | {ub:.1%} |\n"
-            
-            report += f"""
+        
+        log = self.experiment_log
+        for cycle, phase, k, collapse, ub in zip(
+            log.column("cycle"), log.phase_names(), log.column("K"),
+            log.column("collapse_rate"), log.column("upper_ci95")
+        ):
+            footer += f"| {cycle} | {phase} | {k:.2f} | {collapse:.1%} | {ub:.1%} |\n"
+        
+        if log.folded_rows:
+            footer += f"\n*{log.folded_rows} earlier experiments summarized (log compaction).*\n"
+        
+        fsm = self.fsm
+        if fsm.validation_mode == "pooled" and fsm.pool_runs:
+            footer += (
+                f"\n*Pooled validation at K={fsm.pool_K:.2f}: {fsm.pool_collapses}/{fsm.pool_runs} collapses "
+                f"(UB95 {wilson_upper_bound(fsm.pool_collapses, fsm.pool_runs):.1%}), "
+                f"SPRT {fsm.p_good:.1%} vs {fsm.p_bad:.1%} → {fsm.sprt_decision or 'pending'} "
+                f"(α={fsm.alpha:.0%}, β={fsm.beta:.0%}).*\n"
+            )
+        
+        footer += f"""
 ---
 *Generated by Iso-Entropy Agent v2.3*
 *{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
-            
-            # Cache result
-            self.cache[cache_key] = report
-            
-            self._log("✅ Audit completed successfully")
-            return report
+        return footer
+    
+    def _stream_with_timeout(self, kind: str, prompt: str, timeout_s: float) -> Iterator[str]:
+        """Backend chunks; the whole attempt (connect + every chunk) must fit in timeout_s."""
+        attempt_deadline = time.monotonic() + timeout_s
+        chunks = iter(self.backend.stream(prompt, kind))
+        while True:
+            text = call_with_timeout(lambda: next(chunks, None), attempt_deadline - time.monotonic())
+            if text is None:
+                return
+            if text:
+                yield text
+    
+    def _generate_local_report(self, header: str, reason: str) -> str:
+        """Deterministic report from the computed statistics (no LLM), used when the deadline or retries run out."""
+        signal = self.telemetry.signal()
+        log = self.experiment_log
+        reasons = {
+            "deadline": "the audit deadline left no time for another Gemini attempt",
+            "quota": "the Gemini quota stayed exhausted after every retry",
+            "retries_exhausted": "every Gemini attempt failed with a transient error",
+        }
         
-        except Exception as e:
-            error_str = str(e)
-            self._log(f"❌ Gemini Error: {error_str[:100]}")
-            
-            # Fallback to mock if quota exhausted
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                self._log("💾 Quota exhausted. Generating mock report...")
-                report = self._generate_mock_report(
-                    user_input, I, current_K, theta_max, stock, liquidity, capital
-                )
-                self.cache[cache_key] = report
-                return report
-            else:
-                raise
+        if not len(log):
+            return header + f"""## 📋 Executive Summary (local statistical report)
+
+Gemini's narrative is not included because {reasons.get(reason, reason)},
+and no experiments were run.
+""" + self._report_footer()
+        
+        last = log[-1]
+        rate = last["result"]["collapse_rate"]
+        ub95 = last["result"]["upper_ci95"]
+        I = last["hypothesis"]["I"]
+        K = last["hypothesis"]["K"]
+        
+        if ub95 < 0.05:
+            status = "🟢 STABLE"
+        elif rate < 0.30:
+            status = "🟠 MARGINAL"
+        else:
+            status = "🔴 CRITICAL"
+        
+        stable_ks = [k for k, ub in zip(log.column("K"), log.column("upper_ci95")) if ub < 0.05]
+        if stable_ks:
+            capacity_line = f"Lowest capacity with UB95 < 5%: **K = {min(stable_ks):.2f} bits**."
+        else:
+            capacity_line = f"No tested capacity reached UB95 < 5% (last K = {K:.2f} bits)."
+        
+        return header + f"""## 📋 Executive Summary (local statistical report)
+
+**Status: {status}**
+
+Gemini's narrative is not included because {reasons.get(reason, reason)}.
+The figures below come directly from the Monte Carlo experiments.
+
+- **Last experiment:** I={I:.2f}, K={K:.2f} → collapse {rate:.1%} (UB95 {ub95:.1%})
+- **I/K ratio:** {(I / K if K else float('inf')):.2f}
+- **Trend:** {signal.get('overall_trend', 'n/a')}
+- {capacity_line}
+""" + self._mitigation_section(self.mitigation_evaluation) + self._report_footer()
+    
+    def _emit_text(self, text: str, stream: bool) -> Iterator[str]:
+        """Yields a locally generated report, paragraph by paragraph when streaming."""
+        if not stream:
+            yield text
+            return
+        
+        paragraphs = text.split("\n\n")
+        for i, paragraph in enumerate(paragraphs):
+            yield paragraph if i == len(paragraphs) - 1 else paragraph + "\n\n"
+    
+    def _mitigation_section(self, mitigations: Optional[MitigationEvaluation]) -> str:
+        """Ranked, simulated mitigation actions (top 3 in detail, then every option)."""
+        if mitigations is None:
+            return ""
+        
+        base = mitigations.baseline
+        section = f"""## 🛡️ Strategic Mitigation
+
+*Each action simulated with {mitigations.runs} Monte Carlo runs on the same shocks as the current system (paired comparison).*
+"""
+        for rank, option in enumerate(mitigations.options[:3], 1):
+            low, high = option.delta_collapse_ci
+            section += f"""
+### Action {rank}: {option.name}
+- Change: {option.action}
+- Collapse probability: {base['collapse_rate']:.1%} → {option.collapse_rate:.1%} ({option.delta_collapse * 100:+.1f} pp, 95% CI {low * 100:+.1f} to {high * 100:+.1f})
+- Survival horizon: {base['survival_weeks']:.1f} → {option.survival_weeks:.1f} weeks of {mitigations.time_steps} ({option.delta_survival:+.1f})
+"""
+        return section + f"""
+### All Evaluated Options
+
+{mitigations.to_markdown()}
+
+"""
     
     # ========================================================================
     # MOCK REPORT GENERATOR
@@ -421,7 +1095,8 @@ IMPORTANT: Use a professional tone, explain technical terms in business language
         theta_max: float,
         stock: float,
         liquidity: float,
-        capital: float
+        capital: float,
+        mitigations: Optional[MitigationEvaluation] = None
     ) -> str:
         """Generates a mock report when the API is unavailable."""
         
@@ -440,6 +1115,29 @@ IMPORTANT: Use a professional tone, explain technical terms in business language
             diagnosis = f"Robust system. I/K = {ratio:.2f}"
             horizon = "6+ months"
         
+        # Simulated actions when evaluated, generic advice otherwise (mitigations=())
+        mitigation_text = self._mitigation_section(mitigations) or """## 🛡️ Strategic Mitigation
+
+### Action 1: Increase Capacity (K)
+- Automate manual processes
+- Timeline: 4-6 weeks
+- Investment: $50K-150K
+- Impact: Reduce I/K by 20-30%
+
+### Action 2: Reduce Volatility (I)
+- Diversify revenue/services
+- Timeline: 2-3 months
+- Investment: $100K-300K
+- Impact: Stabilize market by 15-25%
+
+### Action 3: Strengthen Buffer
+- Emergency credit line
+- Timeline: Immediate (2-3 weeks)
+- Investment: Low (0% if not used)
+- Impact: +60% survival horizon
+
+"""
+        
         return f"""# 🎯 Forensic Audit - ISO-ENTROPY
 
 **Status: {status}**
@@ -467,27 +1165,7 @@ Limiting factors:
 
 **{horizon}** without corrective intervention.
 
-## 🛡️ Strategic Mitigation
-
-### Action 1: Increase Capacity (K)
-- Automate manual processes
-- Timeline: 4-6 weeks
-- Investment: $50K-150K
-- Impact: Reduce I/K by 20-30%
-
-### Action 2: Reduce Volatility (I)
-- Diversify revenue/services
-- Timeline: 2-3 months
-- Investment: $100K-300K
-- Impact: Stabilize market by 15-25%
-
-### Action 3: Strengthen Buffer
-- Emergency credit line
-- Timeline: Immediate (2-3 weeks)
-- Investment: Low (0% if not used)
-- Impact: +60% survival horizon
-
----
+{mitigation_text}---
 *Generated in Mock Mode*
 *{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
 """
\ No newline at end of file
@@ -0,0 +1,213 @@
+# calibration.py
+"""
+Parameter Calibration
+=====================
+
+Fits I, K and their relative volatilities to historical weekly data
+instead of the label constants of ground_inputs and the hard-coded
+VOLATILITY_I / VOLATILITY_K:
+
+    calibration = calibrate(input_entropy=weekly_I, capacity=weekly_K)
+    calibration.summary()                   # posterior means, sds, 90% intervals
+    agent = IsoEntropyAgent(..., calibration=calibration)
+
+The series are the weekly draws of the model itself (bits per week),
+which makes the likelihood exact and cheap, so no approximate
+(ABC) step is needed:
+
+    x_t = max(0.01, N(μ, (μ·v)²))
+
+Each (μ, v) candidate on a grid is scored from sufficient statistics
+(count, Σx, Σx² and the number of floored weeks), so the cost per
+candidate does not depend on the length of the history: a 200×200 grid
+(40k candidates) is scored in a few milliseconds. Priors: flat in μ,
+flat in log v. I and K are independent in the model, so their
+posteriors are fitted separately.
+"""
+
+import csv
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import simulate_paths
+
+FLOOR = 0.01          # Model floor of the weekly draws (engine/physics)
+GRID_SIZE = 200
+INTERVAL = (0.05, 0.95)
+
+
+def _norm_logcdf(z: np.ndarray) -> np.ndarray:
+    """log Φ(z), elementwise (math.erfc is exact enough and fast at grid sizes)."""
+    erfc = np.frompyfunc(math.erfc, 1, 1)
+    return np.log(np.maximum(erfc(-np.asarray(z) / math.sqrt(2)).astype(np.float64) / 2, 1e-300))
+
+
+@dataclass
+class GridPosterior:
+    """Posterior of (mean μ, relative volatility v) of one weekly series, on a grid."""
+    name: str
+    mean_grid: np.ndarray        # (M,)
+    vol_grid: np.ndarray         # (V,)
+    probability: np.ndarray      # (M, V), sums to 1
+    weeks: int
+
+    def _marginal(self, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+        grid = self.mean_grid if axis == 0 else self.vol_grid
+        return grid, self.probability.sum(axis=1 - axis)
+
+    def _stats(self, axis: int) -> Dict[str, float]:
+        grid, p = self._marginal(axis)
+        mean = float(grid @ p)
+        cdf = np.cumsum(p)
+        low, high = (float(grid[min(np.searchsorted(cdf, q), len(grid) - 1)]) for q in INTERVAL)
+        return {"mean": mean, "sd": math.sqrt(max(0.0, float((grid - mean) ** 2 @ p))), "low": low, "high": high}
+
+    @property
+    def mean(self) -> float:
+        return self._stats(0)["mean"]
+
+    @property
+    def volatility(self) -> float:
+        return self._stats(1)["mean"]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {self.name: self._stats(0), f"volatility_{self.name.lower()}": self._stats(1)}
+
+    def sample(self, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """n draws of (μ, v), jittered within their grid cell."""
+        cells = rng.choice(self.probability.size, size=n, p=self.probability.ravel())
+        m, v = np.unravel_index(cells, self.probability.shape)
+
+        def jitter(grid: np.ndarray, index: np.ndarray) -> np.ndarray:
+            width = np.gradient(grid)[index] if len(grid) > 1 else 0.0
+            return grid[index] + width * rng.uniform(-0.5, 0.5, size=len(index))
+
+        return np.maximum(jitter(self.mean_grid, m), 1e-6), np.maximum(jitter(self.vol_grid, v), 1e-6)
+
+
+def fit_series(
+    values: Sequence[float],
+    name: str,
+    grid_size: int = GRID_SIZE,
+    mean_grid: Optional[np.ndarray] = None,
+    vol_grid: Optional[np.ndarray] = None
+) -> GridPosterior:
+    """Grid posterior of (μ, v) for one weekly series."""
+    x = np.asarray(values, dtype=np.float64)
+    x = x[np.isfinite(x)]
+    if len(x) < 2:
+        raise ValueError(f"need at least 2 finite weekly values of {name}, got {len(x)}")
+
+    floored = x <= FLOOR
+    observed = x[~floored]
+    n, n_floor = len(observed), int(floored.sum())
+    s1, s2 = observed.sum(), (observed ** 2).sum()
+
+    # Default grids: wide enough for the likelihood mass (±8 standard errors, ×/÷ 6 in volatility)
+    m, s = float(x.mean()), float(x.std(ddof=1)) or 1e-3
+    if mean_grid is None:
+        spread = 8 * s / math.sqrt(len(x))
+        mean_grid = np.linspace(max(1e-3, m - spread), m + spread, grid_size)
+    if vol_grid is None:
+        cv = max(s / max(m, 1e-3), 1e-3)
+        vol_grid = np.geomspace(cv / 6, cv * 6, grid_size)
+
+    mu = np.asarray(mean_grid, dtype=np.float64)[:, None]
+    sigma = mu * np.asarray(vol_grid, dtype=np.float64)[None, :]
+    log_lik = -n * np.log(sigma) - (s2 - 2 * mu * s1 + n * mu ** 2) / (2 * sigma ** 2)
+    if n_floor:
+        log_lik = log_lik + n_floor * _norm_logcdf((FLOOR - mu) / sigma)
+
+    # Flat prior in μ and in log v (geometric grid: equal prior mass per cell)
+    log_post = log_lik - log_lik.max()
+    probability = np.exp(log_post)
+    probability /= probability.sum()
+    return GridPosterior(name=name, mean_grid=np.asarray(mean_grid, dtype=np.float64),
+                         vol_grid=np.asarray(vol_grid, dtype=np.float64),
+                         probability=probability, weeks=len(x))
+
+
+@dataclass
+class Calibration:
+    """Posteriors of the input entropy (I) and the response capacity (K)."""
+    input: GridPosterior
+    capacity: GridPosterior
+
+    @property
+    def I(self) -> float:
+        return self.input.mean
+
+    @property
+    def K(self) -> float:
+        return self.capacity.mean
+
+    @property
+    def volatility_i(self) -> float:
+        return self.input.volatility
+
+    @property
+    def volatility_k(self) -> float:
+        return self.capacity.volatility
+
+    def to_params(self) -> Dict[str, float]:
+        """Posterior means, keyed as in ground_inputs / the simulation functions."""
+        return {"I": self.I, "K0": self.K, "volatility_i": self.volatility_i, "volatility_k": self.volatility_k}
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.input.summary(), **self.capacity.summary(),
+                "weeks": {"I": self.input.weeks, "K": self.capacity.weeks}}
+
+    def sample(self, n: int, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """n joint parameter draws: arrays I, K, volatility_i, volatility_k."""
+        rng = np.random.default_rng(seed)
+        I, vol_i = self.input.sample(n, rng)
+        K, vol_k = self.capacity.sample(n, rng)
+        return {"I": I, "K": K, "volatility_i": vol_i, "volatility_k": vol_k}
+
+    def predictive_collapse(
+        self,
+        theta_max: float,
+        K: Optional[float] = None,
+        runs: int = 2000,
+        time_steps: int = 52,
+        alpha: float = 0.15,
+        seed: Optional[int] = None
+    ) -> float:
+        """
+        Collapse rate with parameter uncertainty integrated out: every path
+        uses its own posterior draw. K overrides the capacity mean (e.g. a
+        K under evaluation); its volatility still comes from the posterior.
+        """
+        draws = self.sample(runs, seed)
+        paths = simulate_paths(
+            draws["I"], draws["K"] if K is None else K, theta_max, n_paths=runs, time_steps=time_steps,
+            alpha=alpha, volatility_i=draws["volatility_i"], volatility_k=draws["volatility_k"],
+            rng=np.random.default_rng(None if seed is None else seed + 1)
+        )
+        return float(paths["collapsed"].mean())
+
+
+def calibrate(
+    input_entropy: Sequence[float],
+    capacity: Sequence[float],
+    grid_size: int = GRID_SIZE
+) -> Calibration:
+    """Calibration from weekly I_t and K_t series (bits per week; lengths may differ)."""
+    return Calibration(input=fit_series(input_entropy, "I", grid_size),
+                       capacity=fit_series(capacity, "K", grid_size))
+
+
+def calibrate_csv(path: str, input_column: str = "input_entropy", capacity_column: str = "capacity",
+                  grid_size: int = GRID_SIZE) -> Calibration:
+    """Calibration from a CSV with one row per week (empty cells are skipped)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    try:
+        series = {column: [float(row[column]) for row in rows if row.get(column) not in (None, "")]
+                  for column in (input_column, capacity_column)}
+    except KeyError as e:
+        raise ValueError(f"column {e} not found in {path}") from None
+    return calibrate(series[input_column], series[capacity_column], grid_size)
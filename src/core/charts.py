@@ -0,0 +1,104 @@
+# charts.py
+"""
+Chart Series
+============
+
+Chart-ready, pre-aggregated series for the UI. Payload size depends only
+on `max_points` / `max_bins`, never on the number of simulated runs:
+
+- fan_chart          : weekly debt quantile bands, collapse histogram and
+                       survival curve of one (I, K, θ_max) configuration
+- collapse_histogram : collapses per week bucket
+- downsample_log     : audit evolution (K, collapse rate, UB95) per cycle,
+                       bucketed with min/max preserved so spikes survive
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .engine import simulate_paths
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+MAX_POINTS = 200
+MAX_BINS = 26
+
+
+def downsample_indices(values: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    Indices of at most max_points samples: the first and last ones plus the
+    minimum and maximum of each bucket in between.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, n - 1, buckets + 1).astype(int)
+    keep = [0, n - 1]
+    for low, high in zip(edges[:-1], edges[1:]):
+        if high > low:
+            segment = values[low:high]
+            keep += [low + int(np.argmin(segment)), low + int(np.argmax(segment))]
+    return np.unique(keep)
+
+
+def collapse_histogram(collapse_time: np.ndarray, time_steps: int, max_bins: int = MAX_BINS) -> Dict[str, Any]:
+    """Collapses per bucket of weeks (collapse_time 0 = survived)."""
+    per_week = np.bincount(collapse_time, minlength=time_steps + 1)[1:time_steps + 1]
+    edges = np.unique(np.linspace(0, time_steps, min(max_bins, time_steps) + 1).round().astype(int))
+    return {
+        "week_start": edges[:-1] + 1,
+        "week_end": edges[1:],
+        "collapses": np.add.reduceat(per_week, edges[:-1]),
+        "survivors": int((collapse_time == 0).sum())
+    }
+
+
+def fan_chart(
+    I: float,
+    K: float,
+    theta_max: float,
+    runs: int = 2000,
+    time_steps: int = 52,
+    alpha: float = 0.15,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    seed: Optional[int] = None,
+    max_points: int = MAX_POINTS,
+    max_bins: int = MAX_BINS
+) -> Dict[str, Any]:
+    """
+    Simulates `runs` paths and returns only aggregates:
+    'week', 'bands' (label → debt quantile per week, e.g. 'p50'),
+    'survival' (fraction alive after each week), 'histogram' and 'theta_max'.
+    """
+    paths = simulate_paths(I, K, theta_max, n_paths=runs, time_steps=time_steps, alpha=alpha,
+                           rng=np.random.default_rng(seed), quantiles=quantiles)
+    bands = paths["debt_quantiles"]
+    weeks = np.arange(1, len(bands) + 1)
+    survival = 1.0 - np.cumsum(np.bincount(paths["collapse_time"], minlength=time_steps + 1)[1:]) / runs
+
+    # Bands are smooth: an even stride (always keeping the last week) is enough
+    index = np.unique(np.r_[np.linspace(0, len(weeks) - 1, min(max_points, len(weeks))).astype(int), len(weeks) - 1])
+    return {
+        "week": weeks[index],
+        "bands": {f"p{round(q * 100):02d}": bands[index, j] for j, q in enumerate(quantiles)},
+        "survival": survival[:len(weeks)][index],
+        "histogram": collapse_histogram(paths["collapse_time"], time_steps, max_bins),
+        "theta_max": theta_max,
+        "runs": runs
+    }
+
+
+def downsample_log(
+    experiment_log: Any,
+    columns: Sequence[str] = ("K", "collapse_rate", "upper_ci95"),
+    max_points: int = MAX_POINTS
+) -> Dict[str, np.ndarray]:
+    """Audit evolution per cycle, at most max_points rows (collapse-rate extremes kept)."""
+    index = downsample_indices(experiment_log.column("collapse_rate"), max_points)
+    series = {"cycle": experiment_log.column("cycle")[index]}
+    for name in columns:
+        series[name] = experiment_log.column(name)[index]
+    return series
@@ -0,0 +1,208 @@
+# engine.py
+"""
+Vectorized Simulation Engine
+============================
+
+NumPy implementation of the entropy-debt dynamics of
+physics.run_simulation. All runs advance together, one week per step:
+
+    I_t ~ N(I, I·σ_I),  K_t ~ N(K, K·σ_K)       (floored at 0.01)
+    accumulation = (I_t - K_t)·(1 + √(I_t/K_t - 1))   if I_t > K_t
+    dissipation  = α·max(0, K_t - I_t)
+    D_t = max(0, D_{t-1} + accumulation - dissipation)
+    collapse when D_t ≥ θ_max (the run stops there)
+
+Every parameter may be a scalar or an array with one value per path,
+so a single call can simulate several K candidates, whole portfolios
+or Saltelli sample matrices. Same statistics as run_simulation, not
+the same random stream.
+"""
+
+import random
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .physics import run_simulation, VOLATILITY_I, VOLATILITY_K
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def simulate_paths(
+    I: ArrayLike,
+    K: ArrayLike,
+    theta_max: ArrayLike,
+    *,
+    n_paths: Optional[int] = None,
+    time_steps: int = 52,
+    alpha: ArrayLike = 0.15,
+    volatility_i: ArrayLike = VOLATILITY_I,
+    volatility_k: ArrayLike = VOLATILITY_K,
+    rng: Optional[np.random.Generator] = None,
+    normals: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    track_path: int = -1,
+    track_paths: Optional[Sequence[int]] = None,
+    quantiles: Optional[Sequence[float]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Advances n independent paths of the entropy-debt process.
+
+    Args:
+        I, K, theta_max, alpha, volatility_i, volatility_k: Scalars or arrays
+            broadcastable to (n_paths,).
+        n_paths (int, optional): Number of paths. Inferred from the array
+            parameters when omitted.
+        time_steps (int): Weeks per path.
+        rng (np.random.Generator, optional): Source of the weekly shocks.
+        normals (tuple, optional): Pre-drawn standard normals (z_I, z_K), each of
+            shape (time_steps, n_paths). Reusing them across calls gives
+            common random numbers (paired comparisons).
+        track_path (int): Path whose debt trajectory is returned (-1 = last).
+        track_paths (sequence, optional): Several paths to track at once
+            (e.g. the last path of each candidate block); returned as 'trajectories'.
+        quantiles (sequence, optional): Debt quantiles computed across all paths
+            every week (collapsed paths keep their debt at collapse); returned
+            as 'debt_quantiles' with shape (weeks simulated, len(quantiles)).
+
+    Returns:
+        dict with per-path arrays 'collapsed' (bool), 'collapse_time' (week of
+        collapse, 0 if none), 'residual_debt', 'mean_ratio', plus 'trajectory'
+        (list of debt values of the tracked path) and, with track_paths,
+        'trajectories' (one list per tracked path) and, with quantiles, 'debt_quantiles'.
+    """
+    params = np.broadcast_arrays(
+        *(np.asarray(p, dtype=np.float64) for p in (I, K, theta_max, alpha, volatility_i, volatility_k))
+    )
+    if n_paths is None:
+        n_paths = params[0].size if params[0].ndim else 1
+    I, K, theta_max, alpha, vol_i, vol_k = (np.broadcast_to(p, (n_paths,)) for p in params)
+
+    if normals is None:
+        rng = rng if rng is not None else np.random.default_rng()
+    else:
+        z_i_all, z_k_all = normals
+
+    sigma_i = I * vol_i
+    sigma_k = K * vol_k
+
+    debt = np.zeros(n_paths)
+    alive = np.ones(n_paths, dtype=bool)
+    collapse_time = np.zeros(n_paths, dtype=np.int32)
+    ratio_sum = np.zeros(n_paths)
+    steps = np.zeros(n_paths, dtype=np.int32)
+    trajectory = []
+    tracked = list(track_paths) if track_paths is not None else []
+    trajectories = [[] for _ in tracked]
+    debt_quantiles = []
+
+    for t in range(time_steps):
+        if normals is None:
+            z_i, z_k = rng.standard_normal((2, n_paths))
+        else:
+            z_i, z_k = z_i_all[t], z_k_all[t]
+
+        input_entropy = np.maximum(0.01, I + sigma_i * z_i)
+        response_capacity = np.maximum(0.01, K + sigma_k * z_k)
+        ratio = input_entropy / response_capacity
+
+        excess = input_entropy - response_capacity
+        accumulation = np.where(
+            ratio > 1.0,
+            excess * (1 + np.sqrt(np.maximum(ratio - 1, 0.0))),
+            0.0
+        )
+        dissipation = alpha * np.maximum(0.0, -excess)
+        debt = np.where(alive, np.maximum(0.0, debt + accumulation - dissipation), debt)
+
+        ratio_sum += np.where(alive, ratio, 0.0)
+        steps += alive
+        if alive[track_path]:
+            trajectory.append(float(debt[track_path]))
+        for path, values in zip(tracked, trajectories):
+            if alive[path]:
+                values.append(float(debt[path]))
+        if quantiles is not None:
+            debt_quantiles.append(np.quantile(debt, quantiles))
+
+        hit = alive & (debt >= theta_max)
+        collapse_time[hit] = t + 1
+        alive &= ~hit
+        if not alive.any():
+            break
+
+    result = {
+        "collapsed": collapse_time > 0,
+        "collapse_time": collapse_time,
+        "residual_debt": debt,
+        "mean_ratio": ratio_sum / np.maximum(steps, 1),
+        "trajectory": trajectory
+    }
+    if track_paths is not None:
+        result["trajectories"] = trajectories
+    if quantiles is not None:
+        result["debt_quantiles"] = np.array(debt_quantiles).reshape(-1, len(quantiles))
+    return result
+
+
+def summarize_paths(paths: Dict[str, np.ndarray], runs: int) -> Dict:
+    """Aggregates simulate_paths output into the run_simulation result dict."""
+    collapsed = paths["collapsed"]
+    collapses = int(collapsed.sum())
+    return {
+        "collapse_rate": collapses / runs if runs > 0 else 0,
+        "average_collapse_time": float(paths["collapse_time"][collapsed].mean()) if collapses else float('inf'),
+        "informational_insolvency": float(paths["mean_ratio"].mean()) if runs > 0 else float('inf'),
+        "residual_entropy_debt": float(paths["residual_debt"].mean()) if runs > 0 else 0.0,
+        "total_collapses": collapses,
+        "runs": runs,
+        "trajectory": paths["trajectory"]
+    }
+
+
+def run_simulation_vectorized(
+    I: float,
+    K: float,
+    theta_max: float,
+    runs: int = 500,
+    time_steps: int = 52,
+    alpha: float = 0.15,
+    seed: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+    volatility_i: float = VOLATILITY_I,
+    volatility_k: float = VOLATILITY_K
+) -> Dict:
+    """
+    Drop-in replacement for physics.run_simulation (same arguments and
+    result keys), with all runs advanced together in NumPy.
+    """
+    if not all(isinstance(i, (int, float)) and i >= 0 for i in [I, K, theta_max, runs, time_steps, alpha]):
+        raise ValueError("All input parameters must be non-negative numbers.")
+
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    paths = simulate_paths(I, K, theta_max, n_paths=runs, time_steps=time_steps, alpha=alpha,
+                           volatility_i=volatility_i, volatility_k=volatility_k, rng=rng)
+    return summarize_paths(paths, runs)
+
+
+# ============================================================================
+# ENGINE REGISTRY
+# ============================================================================
+
+def _run_simulation_python(I, K, theta_max, runs=500, time_steps=52, alpha=0.15, seed=None,
+                           volatility_i=VOLATILITY_I, volatility_k=VOLATILITY_K):
+    return run_simulation(I, K, theta_max, runs=runs, time_steps=time_steps, alpha=alpha,
+                          rng=random.Random(seed), volatility_i=volatility_i, volatility_k=volatility_k)
+
+
+ENGINES: Dict[str, Callable[..., Dict]] = {
+    "python": _run_simulation_python,
+    "numpy": run_simulation_vectorized,
+}
+
+
+def get_engine(name: str) -> Callable[..., Dict]:
+    """Simulation function by engine name: 'python' (reference) or 'numpy' (vectorized)."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine '{name}'. Available: {', '.join(ENGINES)}") from None
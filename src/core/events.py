@@ -0,0 +1,39 @@
+# events.py
+"""
+Audit Events
+============
+
+Typed progress events emitted by IsoEntropyAgent while an audit runs.
+
+Consumers (the Streamlit UI, batch runners, services) subscribe a
+callback instead of scraping stdout:
+
+    agent.subscribe(lambda event: print(event.type.name, event.data))
+"""
+
+import time
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Any, Callable, Dict
+
+
+class AuditEventType(Enum):
+    GROUNDED = auto()        # Physical parameters after grounding + hard rules
+    WARM_START = auto()      # Starting K taken from the warm-start index
+    SIMULATION = auto()      # One Monte Carlo experiment finished
+    FSM_TRANSITION = auto()  # FSM moved to another phase
+    MITIGATIONS = auto()     # Mitigation options evaluated (paired simulations)
+    LLM_START = auto()       # Report request sent to the LLM
+    LLM_FINISH = auto()      # Report attempt finished (ok or error)
+    LLM_RETRY = auto()       # Failed attempt will be retried after a backoff delay
+    AUDIT_COMPLETE = auto()  # Final report available
+
+
+@dataclass
+class AuditEvent:
+    type: AuditEventType
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+
+AuditListener = Callable[[AuditEvent], None]
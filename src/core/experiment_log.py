@@ -0,0 +1,227 @@
+# experiment_log.py
+"""
+Columnar Experiment Log
+=======================
+
+Stores one row per experiment in NumPy columns instead of a list of
+nested dicts. Indexing and iteration still return the legacy dict
+shape ({'cycle', 'phase', 'hypothesis', 'result'}), so existing
+consumers keep working, while telemetry, the report table and the UI
+can read whole columns directly.
+
+Older rows can be folded into a single compressed summary entry
+(see telemetry.compact_log); to_list() then starts with that entry.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .fsm import AgentPhase
+
+
+class ExperimentLog:
+    """Append-only columnar store of FSM experiments."""
+
+    FLOAT_COLUMNS = ("I", "K", "theta_max", "collapse_rate", "upper_ci95")
+    INT_COLUMNS = ("cycle", "total_collapses", "runs", "trajectory_ref")
+
+    def __init__(self, capacity: int = 16):
+        capacity = max(1, int(capacity))
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=np.float64) for name in self.FLOAT_COLUMNS
+        }
+        self._columns.update({
+            name: np.empty(capacity, dtype=np.int32) for name in self.INT_COLUMNS
+        })
+        self._columns["phase_code"] = np.empty(capacity, dtype=np.int8)
+        self._trajectories: List[List[float]] = []
+        self.compressed: Optional[Dict[str, Any]] = None
+        self.folded_rows = 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        *,
+        cycle: int,
+        phase: str,
+        I: float,
+        K: float,
+        collapse_rate: float,
+        upper_ci95: float,
+        total_collapses: int,
+        runs: int,
+        theta_max: Optional[float] = None,
+        trajectory: Optional[List[float]] = None
+    ) -> int:
+        """Appends one experiment and returns its row index."""
+        if self._size == len(self._columns["cycle"]):
+            self._grow()
+
+        row = self._size
+        cols = self._columns
+        cols["cycle"][row] = cycle
+        cols["phase_code"][row] = AgentPhase[phase].value
+        cols["I"][row] = I
+        cols["K"][row] = K
+        cols["theta_max"][row] = np.nan if theta_max is None else theta_max
+        cols["collapse_rate"][row] = collapse_rate
+        cols["upper_ci95"][row] = upper_ci95
+        cols["total_collapses"][row] = total_collapses
+        cols["runs"][row] = runs
+
+        if trajectory:
+            cols["trajectory_ref"][row] = len(self._trajectories)
+            self._trajectories.append(trajectory)
+        else:
+            cols["trajectory_ref"][row] = -1
+
+        self._size += 1
+        return row
+
+    def append(self, experiment: Dict[str, Any]):
+        """Appends an experiment given in the legacy nested-dict format."""
+        hypothesis = experiment.get("hypothesis", {})
+        result = experiment.get("result", {})
+        runs = result.get("runs", 0)
+        collapse_rate = result.get("collapse_rate", 0.0)
+        self.record(
+            cycle=experiment.get("cycle", self._size + 1),
+            phase=experiment.get("phase", AgentPhase.ORIENT.name),
+            I=hypothesis.get("I", 0.0),
+            K=hypothesis.get("K", 0.0),
+            collapse_rate=collapse_rate,
+            upper_ci95=result.get("upper_ci95", 1.0),
+            total_collapses=result.get("total_collapses", int(collapse_rate * runs)),
+            runs=runs,
+            theta_max=experiment.get("full_parameters", {}).get("theta_max"),
+            trajectory=result.get("trajectory")
+        )
+
+    def clear(self):
+        self._size = 0
+        self._trajectories = []
+        self.compressed = None
+        self.folded_rows = 0
+
+    def fold(self, rows: int, compressed_entry: Dict[str, Any]):
+        """
+        Drops the oldest `rows` experiments (and their trajectories) and
+        replaces the compressed head with `compressed_entry`.
+        """
+        rows = min(max(0, rows), self._size)
+        keep = self._size - rows
+        # Fresh buffers: DataFrames handed out earlier keep viewing the old ones
+        for name, column in self._columns.items():
+            folded = np.empty(len(column), dtype=column.dtype)
+            folded[:keep] = column[rows:self._size]
+            self._columns[name] = folded
+
+        refs = self._columns["trajectory_ref"][:keep]
+        kept = refs >= 0
+        self._trajectories = [self._trajectories[ref] for ref in refs[kept]]
+        refs[kept] = np.arange(int(kept.sum()), dtype=refs.dtype)
+
+        self._size = keep
+        self.compressed = compressed_entry
+        self.folded_rows += rows
+
+    def approx_nbytes(self) -> int:
+        """Rough memory footprint: live column bytes plus trajectory points."""
+        columns = sum(column.itemsize for column in self._columns.values()) * self._size
+        return columns + 8 * sum(len(trajectory) for trajectory in self._trajectories)
+
+    def _grow(self):
+        new_capacity = 2 * len(self._columns["cycle"])
+        for name, column in self._columns.items():
+            grown = np.empty(new_capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    # ------------------------------------------------------------------
+    # Columnar access
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a column (no copy)."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def phase_names(self) -> List[str]:
+        return [AgentPhase(int(code)).name for code in self.column("phase_code")]
+
+    def trajectory(self, row: int) -> List[float]:
+        ref = int(self._columns["trajectory_ref"][self._index(row)])
+        return self._trajectories[ref] if ref >= 0 else []
+
+    def to_dataframe(self):
+        """
+        pandas DataFrame over the numeric columns without copying them.
+        Only the phase column (categorical) is materialised.
+        """
+        import pandas as pd
+
+        data = {name: self.column(name) for name in (
+            "cycle", "I", "K", "theta_max", "collapse_rate",
+            "upper_ci95", "total_collapses", "runs"
+        )}
+        data["phase"] = pd.Categorical.from_codes(
+            self.column("phase_code") - 1,
+            categories=[phase.name for phase in AgentPhase]
+        )
+        return pd.DataFrame(data, copy=False)
+
+    # ------------------------------------------------------------------
+    # Legacy dict views
+    # ------------------------------------------------------------------
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Legacy list form. Starts with the compressed entry when rows were folded."""
+        head = [self.compressed] if self.compressed is not None else []
+        return head + [self._row_dict(row) for row in range(self._size)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self._size):
+            yield self._row_dict(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row_dict(row) for row in range(*index.indices(self._size))]
+        return self._row_dict(self._index(index))
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("experiment index out of range")
+        return index
+
+    def _row_dict(self, row: int) -> Dict[str, Any]:
+        cols = self._columns
+        experiment = {
+            "cycle": int(cols["cycle"][row]),
+            "phase": AgentPhase(int(cols["phase_code"][row])).name,
+            "hypothesis": {
+                "I": float(cols["I"][row]),
+                "K": float(cols["K"][row])
+            },
+            "result": {
+                "collapse_rate": float(cols["collapse_rate"][row]),
+                "upper_ci95": float(cols["upper_ci95"][row]),
+                "total_collapses": int(cols["total_collapses"][row]),
+                "runs": int(cols["runs"][row]),
+                "trajectory": self.trajectory(row)
+            }
+        }
+        theta_max = cols["theta_max"][row]
+        if not np.isnan(theta_max):
+            experiment["full_parameters"] = {"theta_max": float(theta_max)}
+        return experiment
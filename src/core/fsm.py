@@ -1,6 +1,9 @@
 # fsm.py
+import math
 from enum import Enum, auto
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from .physics import wilson_upper_bound
 
 
 class AgentPhase(Enum):
@@ -10,22 +13,76 @@ class AgentPhase(Enum):
     CONCLUDE = auto()
 
 
+VALIDATION_MODES = ("independent", "pooled")
+
+
 class IsoEntropyFSM:
-    def __init__(self):
+    """
+    Validation modes (VALIDATE → STRESS):
+
+    - independent: two consecutive stable batches, each judged alone by
+      its own Wilson bound (collapse < 5% and UB95 < 5%).
+    - pooled: a batch with collapse < p_bad selects K; every later batch
+      at that K joins one growing sample, tested with a Wald SPRT of
+      p_good (2.5%) against p_bad (5%). The selecting batch is not pooled
+      (it was chosen because it looked good, which would bias the test).
+      P(declare stable | p ≥ p_bad) ≤ alpha, P(reject | p ≤ p_good) ≤ beta.
+      Truncated at max_pooled_runs: the pooled Wilson UB95 decides.
+    """
+
+    def __init__(
+        self,
+        validation_mode: str = "independent",
+        p_good: float = 0.025,
+        p_bad: float = 0.05,
+        alpha: float = 0.05,
+        beta: float = 0.10,
+        max_pooled_runs: int = 5000
+    ):
+        if validation_mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation_mode '{validation_mode}'. Available: {', '.join(VALIDATION_MODES)}")
         self.phase: AgentPhase = AgentPhase.ORIENT
         self.stable_hits: int = 0
 
-    def update(self, collapse_rate: Optional[float], upper_ci95: Optional[float] = None):
+        self.validation_mode = validation_mode
+        self.p_good = p_good
+        self.p_bad = p_bad
+        self.alpha = alpha
+        self.beta = beta
+        self.max_pooled_runs = max_pooled_runs
+        self._reset_pool()
+
+    def _reset_pool(self):
+        self.pool_K: Optional[float] = None
+        self.pool_runs: int = 0
+        self.pool_collapses: int = 0
+        self.sprt_decision: Optional[str] = None
+
+    def update(
+        self,
+        collapse_rate: Optional[float],
+        upper_ci95: Optional[float] = None,
+        *,
+        collapses: Optional[int] = None,
+        runs: Optional[int] = None,
+        K: Optional[float] = None
+    ):
         """
         Updates the FSM based on collapse and statistical validation.
         
         Args:
             collapse_rate: Observed collapse rate
             upper_ci95: Upper bound of the Wilson confidence interval (95%)
+            collapses, runs, K: Raw batch counts and capacity (required by
+                the pooled validation mode)
         """
         if collapse_rate is None:
             return
 
+        if self.validation_mode == "pooled" and collapses is not None and runs:
+            self._update_pooled(collapse_rate, upper_ci95, collapses, runs, K)
+            return
+
         stability_threshold = 0.05
         
         # Validate statistical stability: collapse < 5% AND UB95 < 5% (if provided)
@@ -52,6 +109,92 @@ class IsoEntropyFSM:
         elif self.phase == AgentPhase.STRESS:
             self.phase = AgentPhase.CONCLUDE
 
+    # ------------------------------------------------------------------
+    # Pooled validation (SPRT)
+    # ------------------------------------------------------------------
+
+    def _update_pooled(self, collapse_rate: float, upper_ci95: Optional[float],
+                       collapses: int, runs: int, K: Optional[float]):
+        if self.phase == AgentPhase.ORIENT:
+            # A promising batch selects K; the SPRT then starts from fresh runs
+            if collapse_rate < self.p_bad:
+                self.phase = AgentPhase.VALIDATE
+                self.stable_hits = 1
+                self._reset_pool()
+                self.pool_K = K
+
+        elif self.phase == AgentPhase.VALIDATE:
+            if K is not None and self.pool_K is not None and not math.isclose(K, self.pool_K):
+                self._reset_pool()  # Evidence at another K is not comparable
+            self._add_to_pool(collapses, runs, K)
+            self.stable_hits += 1
+            decision = self.sprt()
+            self.sprt_decision = decision
+            if decision == "stable":
+                self.phase = AgentPhase.STRESS
+            elif decision == "unstable":
+                self.phase = AgentPhase.ORIENT
+                self.stable_hits = 0
+
+        elif self.phase == AgentPhase.STRESS:
+            self.phase = AgentPhase.CONCLUDE
+
+    def _add_to_pool(self, collapses: int, runs: int, K: Optional[float]):
+        self.pool_K = K if K is not None else self.pool_K
+        self.pool_runs += runs
+        self.pool_collapses += collapses
+
+    def sprt_llr(self) -> float:
+        """log[L(p_good) / L(p_bad)] of the pooled sample (> 0 favours stability)."""
+        survivals = self.pool_runs - self.pool_collapses
+        return (self.pool_collapses * math.log(self.p_good / self.p_bad)
+                + survivals * math.log((1 - self.p_good) / (1 - self.p_bad)))
+
+    def sprt(self) -> str:
+        """'stable', 'unstable' or 'continue' for the pooled sample."""
+        llr = self.sprt_llr()
+        if llr >= math.log((1 - self.beta) / self.alpha):
+            return "stable"
+        if llr <= math.log(self.beta / (1 - self.alpha)):
+            return "unstable"
+        if self.pool_runs >= self.max_pooled_runs:
+            # Truncated test: fall back to the pooled Wilson bound
+            stable = wilson_upper_bound(self.pool_collapses, self.pool_runs) < self.p_bad
+            return "stable" if stable else "unstable"
+        return "continue"
+
+    def pooled_summary(self) -> Dict[str, Any]:
+        """Pooled evidence (for events and the report)."""
+        return {
+            "K": self.pool_K,
+            "runs": self.pool_runs,
+            "collapses": self.pool_collapses,
+            "collapse_rate": self.pool_collapses / self.pool_runs if self.pool_runs else 0.0,
+            "upper_ci95": wilson_upper_bound(self.pool_collapses, self.pool_runs),
+            "llr": self.sprt_llr(),
+            "decision": self.sprt_decision,
+        }
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable snapshot (used by the audit journal)."""
+        state = {"phase": self.phase.name, "stable_hits": self.stable_hits}
+        if self.validation_mode == "pooled":
+            state.update(pool_K=self.pool_K, pool_runs=self.pool_runs,
+                         pool_collapses=self.pool_collapses, sprt_decision=self.sprt_decision)
+        return state
+
+    def load_state(self, state: Dict[str, Any]):
+        self.phase = AgentPhase[state["phase"]]
+        self.stable_hits = int(state.get("stable_hits", 0))
+        self.pool_K = state.get("pool_K")
+        self.pool_runs = int(state.get("pool_runs", 0))
+        self.pool_collapses = int(state.get("pool_collapses", 0))
+        self.sprt_decision = state.get("sprt_decision")
+
     def allow_simulation(self) -> bool:
         return self.phase != AgentPhase.CONCLUDE
 
@@ -0,0 +1,214 @@
+# jobs.py
+"""
+Background Jobs
+===============
+
+Audits run on a fixed pool of worker threads shared by every UI session,
+so a page only submits work and polls:
+
+    runner = JobRunner(workers=2, max_queued=16)
+    job = runner.submit(session_id, audit_job(agent, inputs))
+    ...
+    runner.get(job.id).status, job.events, job.partial
+
+- Bounded queue: submit() raises QueueFullError once `max_queued` jobs wait.
+- Fair scheduling: each session has its own FIFO and idle workers take
+  jobs round-robin across sessions, so one user queueing many audits
+  cannot starve the others.
+- Jobs outlive Streamlit reruns: they belong to the process, not to the
+  script run that submitted them.
+"""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(RuntimeError):
+    """The job queue already holds max_queued waiting jobs."""
+    pass
+
+
+@dataclass
+class Job:
+    """A unit of background work and everything a poller needs to render it."""
+    id: str
+    session: str
+    work: Callable[["Job"], Any]
+    label: str = ""
+    status: str = QUEUED
+    events: List[Any] = field(default_factory=list)   # Appended by the work as it runs
+    partial: str = ""                                  # Text produced so far (streamed report)
+    result: Any = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobRunner:
+    """Fixed worker pool with a bounded, per-session round-robin queue."""
+
+    def __init__(self, workers: int = 2, max_queued: int = 16, keep_finished: int = 200):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._queues: "OrderedDict[str, Deque[Job]]" = OrderedDict()  # session → waiting jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queued = 0
+        self._running = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"job-worker-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, session: str, work: Callable[[Job], Any], label: str = "") -> Job:
+        """Queues work(job) for a session. Raises QueueFullError when the queue is full."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobRunner is shut down")
+            if self._queued >= self.max_queued:
+                raise QueueFullError(f"{self._queued} jobs already waiting (max {self.max_queued})")
+            job = Job(id=uuid.uuid4().hex[:12], session=session, work=work, label=label)
+            self._jobs[job.id] = job
+            self._queues.setdefault(session, deque()).append(job)
+            self._queued += 1
+            self._prune()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs_for(self, session: str) -> List[Job]:
+        with self._cond:
+            return [job for job in self._jobs.values() if job.session == session]
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Jobs that will start before this one (0 = next), or None if not queued."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return None
+            queues = [list(queue) for queue in self._queues.values()]
+            order = [j for rnd in itertools.zip_longest(*queues) for j in rnd if j is not None]
+            return order.index(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a job that has not started yet. Running jobs finish normally."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            self._queues[job.session].remove(job)
+            self._queued -= 1
+            self._finish(job, CANCELLED)
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"workers": self.workers, "queued": self._queued, "running": self._running,
+                    "sessions_waiting": sum(1 for queue in self._queues.values() if queue)}
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _next_job(self) -> Optional[Job]:
+        """Round-robin: first session with waiting work, then move it to the back."""
+        for session, queue in self._queues.items():
+            if queue:
+                self._queues.move_to_end(session)
+                self._queued -= 1
+                return queue.popleft()
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._queued == 0:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job = self._next_job()
+                job.status = RUNNING
+                job.started = time.time()
+                self._running += 1
+
+            try:
+                job.result = job.work(job)
+                status = DONE
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                status = FAILED
+
+            with self._cond:
+                self._running -= 1
+                self._finish(job, status)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished = time.time()
+
+    def _prune(self):
+        """Drops the oldest finished jobs beyond keep_finished (unfinished jobs are never dropped)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+        for session in [s for s, queue in self._queues.items() if not queue]:
+            del self._queues[session]
+
+
+# ============================================================================
+# AUDIT JOBS
+# ============================================================================
+
+def audit_job(agent: Any, inputs: Dict[str, Any]) -> Callable[[Job], Dict[str, Any]]:
+    """
+    Work function running one audit: agent events go to job.events and the
+    streamed report to job.partial. The result holds the report and the agent.
+    """
+    def work(job: Job) -> Dict[str, Any]:
+        unsubscribe = agent.subscribe(job.events.append)
+        try:
+            for chunk in agent.audit_system_stream(**inputs):
+                job.partial += chunk
+        finally:
+            unsubscribe()
+        return {"report": job.partial, "agent": agent}
+
+    return work
@@ -0,0 +1,109 @@
+# journal.py
+"""
+Audit Journal (Checkpoint & Resume)
+===================================
+
+Append-only JSONL file per audit ID. Every step of an audit is written
+(and fsynced) as soon as it happens:
+
+- start       : audit inputs
+- grounded    : physical parameters after grounding + hard rules
+- warm_start  : starting K taken from the warm-start index
+- experiment  : one experiment record + FSM state + next K + RNG state
+- report      : final report
+
+Replaying the journal gives the last checkpoint, so a crashed or
+interrupted audit skips the simulations (and LLM calls) it already did.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_JOURNAL_DIR = ".iso_journal"
+
+
+class AuditJournal:
+    """One audit, one JSONL file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def for_audit(cls, audit_id: str, directory: Optional[str] = None) -> "AuditJournal":
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", audit_id):
+            raise ValueError(f"Invalid audit_id: {audit_id!r}")
+        directory = directory or os.getenv("ISO_JOURNAL_DIR", DEFAULT_JOURNAL_DIR)
+        return cls(os.path.join(directory, f"{audit_id}.jsonl"))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, record_type: str, **data: Any):
+        """Appends one record and forces it to disk."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        line = json.dumps({"type": record_type, **data})
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All complete records. A torn last line (crash mid-write) is ignored."""
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return records
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Last consistent state of the audit, or None if nothing was journaled:
+        {'inputs', 'params', 'warm_start', 'experiments': [...], 'report'}
+        """
+        records = self.records()
+        if not records:
+            return None
+
+        state = {"inputs": None, "params": None, "warm_start": None, "experiments": [], "report": None}
+        for record in records:
+            kind = record.get("type")
+            if kind == "start":
+                state["inputs"] = record.get("inputs")
+            elif kind == "grounded":
+                state["params"] = record.get("params")
+            elif kind == "warm_start":
+                state["warm_start"] = record
+            elif kind == "experiment":
+                state["experiments"].append(record)
+            elif kind == "report":
+                state["report"] = record.get("report")
+        return state
+
+
+def encode_rng_state(state) -> List[Any]:
+    """random.Random.getstate() → JSON-friendly list."""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def decode_rng_state(data: List[Any]):
+    version, internal, gauss_next = data
+    return (version, tuple(internal), gauss_next)
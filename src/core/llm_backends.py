@@ -0,0 +1,227 @@
+# llm_backends.py
+"""
+LLM Backends
+============
+
+The agent talks to the language model only through an LLMBackend:
+
+- generate(prompt, kind) → text
+- stream(prompt, kind)   → text chunks
+
+`kind` is "report" (final forensic report, after CONCLUDE) or "phase"
+(cheaper model for reports of audits that did not conclude); each
+backend maps it to a model name.
+
+Implementations:
+- GeminiBackend   : google-genai (lazy client; any genai-style client can be injected)
+- FakeLLMBackend  : offline, scripted responses, latency distributions and
+                    injectable 429s/timeouts, for load and latency testing
+"""
+
+import abc
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+REPORT = "report"
+PHASE = "phase"
+
+
+class LLMBackend(abc.ABC):
+    """Interface used by IsoEntropyAgent for every LLM call (subclasses implement generate)."""
+
+    name = "base"
+    models: Dict[str, str] = {}
+
+    def model_for(self, kind: str) -> str:
+        return self.models.get(kind, self.models.get(REPORT, "unknown"))
+
+    @abc.abstractmethod
+    def generate(self, prompt: str, kind: str = REPORT) -> str:
+        """Whole answer for `prompt`, from the model mapped to `kind`."""
+
+    def stream(self, prompt: str, kind: str = REPORT) -> Iterator[str]:
+        """Non-empty text chunks. Default: the whole answer as one chunk."""
+        text = self.generate(prompt, kind)
+        if text:
+            yield text
+
+
+# ============================================================================
+# GEMINI
+# ============================================================================
+
+class GeminiBackend(LLMBackend):
+    """google-genai backend. The client is created on first use."""
+
+    name = "gemini"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Any = None,
+        report_model: str = "gemini-3-pro-preview",
+        phase_model: str = "gemini-3-flash-preview"
+    ):
+        self.api_key = api_key
+        self._client = client
+        self._lock = threading.Lock()
+        self.models = {REPORT: report_model, PHASE: phase_model}
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google import genai
+                    self._client = genai.Client(api_key=self.api_key or os.getenv("GEMINI_API_KEY"))
+        return self._client
+
+    @client.setter
+    def client(self, value: Any):
+        self._client = value
+
+    def generate(self, prompt: str, kind: str = REPORT) -> str:
+        response = self.client.models.generate_content(model=self.model_for(kind), contents=prompt)
+        return response.text
+
+    def stream(self, prompt: str, kind: str = REPORT) -> Iterator[str]:
+        for chunk in self.client.models.generate_content_stream(model=self.model_for(kind), contents=prompt):
+            if chunk.text:
+                yield chunk.text
+
+
+# ============================================================================
+# FAKE (offline)
+# ============================================================================
+
+class FakeLLMError(Exception):
+    """Injected API error; `code` mimics google-genai's APIError.code."""
+
+    def __init__(self, code: int, status: str):
+        super().__init__(f"{code} {status} (injected by FakeLLMBackend)")
+        self.code = code
+
+
+Latency = Union[float, Callable[[random.Random], float]]
+
+
+def lognormal_latency(median_s: float, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Right-skewed latency (long tail), typical of LLM APIs."""
+    mu = math.log(median_s)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def uniform_latency(low_s: float, high_s: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(low_s, high_s)
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Offline stand-in with realistic failure and latency behaviour.
+
+    Args:
+        responses: Scripted outcomes consumed in order: a str is returned,
+            an exception instance is raised. Once exhausted (or if omitted),
+            calls fall back to the random model below.
+        latency: Seconds per call, or a function rng → seconds
+            (see lognormal_latency / uniform_latency).
+        rate_429 / rate_timeout: Probability that a call fails with a
+            429 RESOURCE_EXHAUSTED / hangs for hang_s and then times out.
+        chunks: Number of chunks stream() splits an answer into.
+        seed: Seed for latencies and injected failures.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        responses: Optional[Sequence[Union[str, BaseException]]] = None,
+        latency: Latency = 0.0,
+        rate_429: float = 0.0,
+        rate_timeout: float = 0.0,
+        hang_s: float = 30.0,
+        chunks: int = 4,
+        seed: Optional[int] = None,
+        report_model: str = "fake-report",
+        phase_model: str = "fake-phase"
+    ):
+        self.script: List[Union[str, BaseException]] = list(responses or [])
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.rate_timeout = rate_timeout
+        self.hang_s = hang_s
+        self.chunks = max(1, chunks)
+        self.models = {REPORT: report_model, PHASE: phase_model}
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.injected_429 = 0
+        self.injected_timeouts = 0
+
+    def _draw(self) -> tuple:
+        """(outcome, latency) for the next call, drawn under the lock."""
+        with self._lock:
+            self.calls += 1
+            latency = self.latency(self.rng) if callable(self.latency) else self.latency
+            if self.script:
+                return self.script.pop(0), latency
+            roll = self.rng.random()
+            if roll < self.rate_429:
+                self.injected_429 += 1
+                return FakeLLMError(429, "RESOURCE_EXHAUSTED"), latency
+            if roll < self.rate_429 + self.rate_timeout:
+                self.injected_timeouts += 1
+                return TimeoutError("DEADLINE_EXCEEDED (injected by FakeLLMBackend)"), self.hang_s
+            return None, latency
+
+    def _answer(self, prompt: str, kind: str) -> str:
+        return (
+            "## Executive Summary\n\n"
+            f"Offline report from the fake backend ({self.model_for(kind)}, {len(prompt)} prompt chars). "
+            "No model was called; the statistics below come from the simulations.\n"
+        )
+
+    def generate(self, prompt: str, kind: str = REPORT) -> str:
+        outcome, latency = self._draw()
+        time.sleep(max(0.0, latency))
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome if outcome is not None else self._answer(prompt, kind)
+
+    def stream(self, prompt: str, kind: str = REPORT) -> Iterator[str]:
+        outcome, latency = self._draw()
+        if isinstance(outcome, BaseException):
+            time.sleep(max(0.0, latency))
+            raise outcome
+        text = outcome if outcome is not None else self._answer(prompt, kind)
+        size = max(1, math.ceil(len(text) / self.chunks))
+        for start in range(0, len(text), size):
+            time.sleep(max(0.0, latency) / self.chunks)
+            yield text[start:start + size]
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "injected_429": self.injected_429,
+                "injected_timeouts": self.injected_timeouts}
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+BACKENDS: Dict[str, Callable[..., LLMBackend]] = {
+    "gemini": GeminiBackend,
+    "fake": FakeLLMBackend,
+}
+
+
+def get_backend(name: str, **options: Any) -> LLMBackend:
+    """Backend by name: 'gemini' or 'fake'."""
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}'. Available: {', '.join(BACKENDS)}") from None
+    return factory(**options)
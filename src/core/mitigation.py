@@ -0,0 +1,188 @@
+# mitigation.py
+"""
+Mitigation Evaluator
+====================
+
+Puts a simulated number behind each mitigation action of the report.
+Every intervention changes the grounded parameters (e.g. automation
+raises K by 25%, a credit line raises working capital); θ_max moves by
+the change of calculate_collapse_threshold(stock, capital, liquidity).
+Stock stays within the [0.05, 1.0] range of ground_inputs (24 months of
+buffer at most), so a stock action cannot exceed what grounding allows.
+
+    evaluation = evaluate_mitigations(params, K=current_K, runs=1000, seed=7)
+    evaluation.options[0]          # best option (largest collapse reduction)
+    evaluation.to_markdown()       # ranked table for the report
+
+The baseline and all interventions are simulated in one batched call on
+the same weekly shocks (common random numbers, engine `normals`). The
+effect of an intervention is the mean of its per-path differences to the
+baseline, whose variance is far below that of two independent estimates,
+so a few hundred paths already separate the options.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import simulate_paths
+from .grounding import clamp
+from .physics import VOLATILITY_I, VOLATILITY_K, calculate_collapse_threshold
+
+Z_95 = 1.96
+STOCK_RANGE = (0.05, 1.0)   # Stock ratio range of ground_inputs (buffer_months / 24)
+
+
+@dataclass(frozen=True)
+class Intervention:
+    """A named change of the model parameters: multipliers (scale) and additions (shift)."""
+    name: str
+    action: str
+    scale: Dict[str, float] = field(default_factory=dict)
+    shift: Dict[str, float] = field(default_factory=dict)
+
+    def apply(self, params: Mapping[str, float]) -> Dict[str, float]:
+        changed = dict(params)
+        for key, factor in self.scale.items():
+            changed[key] = changed[key] * factor
+        for key, delta in self.shift.items():
+            changed[key] = changed[key] + delta
+        changed["stock"] = clamp(changed["stock"], *STOCK_RANGE)
+        buffers = ("stock", "capital", "liquidity")
+        changed["theta_max"] = params["theta_max"] + (
+            calculate_collapse_threshold(*(changed[key] for key in buffers))
+            - calculate_collapse_threshold(*(params[key] for key in buffers))
+        )
+        return changed
+
+
+DEFAULT_INTERVENTIONS: Tuple[Intervention, ...] = (
+    Intervention("Automate manual processes", "Raise response capacity K by 25%", scale={"K": 1.25}),
+    Intervention("Diversify revenue/services", "Cut external entropy I by 20%", scale={"I": 0.8}),
+    Intervention("Hedge demand shocks", "Cut the volatility of I by 30%", scale={"volatility_i": 0.7}),
+    Intervention("Emergency credit line", "Add one unit of working capital ratio", shift={"capital": 1.0}),
+    Intervention("Build safety stock", "Add 6 months of stock buffer", shift={"stock": 0.25}),
+    Intervention("Free up liquidity", "Raise the liquidity ratio by 0.3", shift={"liquidity": 0.3}),
+)
+
+
+@dataclass
+class MitigationOption:
+    name: str
+    action: str
+    params: Dict[str, float]            # I, K, theta_max, ... after the intervention
+    collapse_rate: float
+    survival_weeks: float               # Mean weeks survived within the horizon
+    delta_collapse: float               # Paired difference to the baseline (negative = better)
+    delta_collapse_ci: Tuple[float, float]
+    delta_survival: float
+    delta_survival_ci: Tuple[float, float]
+    independent_se: float               # SE of delta_collapse without pairing (for comparison)
+
+    @property
+    def significant(self) -> bool:
+        """The 95% interval of the collapse change excludes zero."""
+        low, high = self.delta_collapse_ci
+        return high < 0 or low > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.__dict__, "delta_collapse_ci": list(self.delta_collapse_ci),
+                "delta_survival_ci": list(self.delta_survival_ci), "significant": self.significant}
+
+
+@dataclass
+class MitigationEvaluation:
+    baseline: Dict[str, float]          # Parameters plus collapse_rate and survival_weeks
+    options: List[MitigationOption]     # Ranked: largest collapse reduction, then survival gain
+    runs: int
+    time_steps: int
+
+    def to_markdown(self) -> str:
+        lines = [
+            f"Baseline: collapse {self.baseline['collapse_rate']:.1%}, "
+            f"{self.baseline['survival_weeks']:.1f} of {self.time_steps} weeks survived on average "
+            f"(I={self.baseline['I']:.2f}, K={self.baseline['K']:.2f}, θ_max={self.baseline['theta_max']:.2f}; "
+            f"{self.runs} paired runs).",
+            "",
+            "| # | Action | Change | Collapse (%) | Δ Collapse (pp, 95% CI) | Δ Survival (weeks) |",
+            "|---|--------|--------|--------------|--------------------------|--------------------|",
+        ]
+        for rank, option in enumerate(self.options, 1):
+            low, high = option.delta_collapse_ci
+            lines.append(
+                f"| {rank} | {option.name} | {option.action} | {option.collapse_rate:.1%} | "
+                f"{option.delta_collapse * 100:+.1f} [{low * 100:+.1f}, {high * 100:+.1f}] | "
+                f"{option.delta_survival:+.1f} |"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"baseline": self.baseline, "options": [option.to_dict() for option in self.options],
+                "runs": self.runs, "time_steps": self.time_steps}
+
+
+def evaluate_mitigations(
+    params: Mapping[str, float],
+    K: Optional[float] = None,
+    interventions: Sequence[Intervention] = DEFAULT_INTERVENTIONS,
+    runs: int = 1000,
+    time_steps: int = 52,
+    alpha: float = 0.15,
+    volatility_i: float = VOLATILITY_I,
+    volatility_k: float = VOLATILITY_K,
+    seed: Optional[int] = None
+) -> MitigationEvaluation:
+    """
+    Paired evaluation of interventions on grounded parameters.
+
+    Args:
+        params: Grounded parameters (I, K0, stock, capital, liquidity and,
+            if already computed, theta_max).
+        K: Capacity under evaluation (default: K0), e.g. the audit's final K.
+    """
+    base = {
+        "I": params["I"], "K": params["K0"] if K is None else K,
+        "stock": params["stock"], "capital": params["capital"], "liquidity": params["liquidity"],
+        "alpha": alpha, "volatility_i": volatility_i, "volatility_k": volatility_k,
+    }
+    base["theta_max"] = params.get("theta_max") or calculate_collapse_threshold(
+        base["stock"], base["capital"], base["liquidity"])
+    scenarios = [base] + [intervention.apply(base) for intervention in interventions]
+
+    # One batch: block b of `runs` paths is scenario b, every block on the same shocks
+    z_i, z_k = np.random.default_rng(seed).standard_normal((2, time_steps, runs))
+    blocks = len(scenarios)
+    column = {key: np.repeat([s[key] for s in scenarios], runs)
+              for key in ("I", "K", "theta_max", "alpha", "volatility_i", "volatility_k")}
+    paths = simulate_paths(
+        column["I"], column["K"], column["theta_max"], time_steps=time_steps, alpha=column["alpha"],
+        volatility_i=column["volatility_i"], volatility_k=column["volatility_k"],
+        normals=(np.tile(z_i, (1, blocks)), np.tile(z_k, (1, blocks)))
+    )
+    collapsed = paths["collapsed"].reshape(blocks, runs).astype(np.float64)
+    weeks = np.where(collapsed > 0, paths["collapse_time"].reshape(blocks, runs), time_steps)
+
+    def paired(values: np.ndarray, b: int) -> Tuple[float, Tuple[float, float]]:
+        diff = values[b] - values[0]
+        mean = float(diff.mean())
+        half = Z_95 * float(diff.std(ddof=1)) / math.sqrt(runs) if runs > 1 else float("inf")
+        return mean, (mean - half, mean + half)
+
+    rates = collapsed.mean(axis=1)
+    options = []
+    for b, intervention in enumerate(interventions, 1):
+        delta_collapse, collapse_ci = paired(collapsed, b)
+        delta_survival, survival_ci = paired(weeks, b)
+        options.append(MitigationOption(
+            name=intervention.name, action=intervention.action, params=scenarios[b],
+            collapse_rate=float(rates[b]), survival_weeks=float(weeks[b].mean()),
+            delta_collapse=delta_collapse, delta_collapse_ci=collapse_ci,
+            delta_survival=delta_survival, delta_survival_ci=survival_ci,
+            independent_se=float(np.sqrt((rates[b] * (1 - rates[b]) + rates[0] * (1 - rates[0])) / runs))
+        ))
+    options.sort(key=lambda option: (option.delta_collapse, -option.delta_survival))
+
+    baseline = {**base, "collapse_rate": float(rates[0]), "survival_weeks": float(weeks[0].mean())}
+    return MitigationEvaluation(baseline=baseline, options=options, runs=runs, time_steps=time_steps)
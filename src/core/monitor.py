@@ -0,0 +1,326 @@
+# monitor.py
+"""
+Online Monitor
+==============
+
+Tracks the realized entropy debt of many units from a live weekly stream,
+without re-running audits:
+
+    monitor = EntropyMonitor(horizon=13)
+    monitor.add_unit("plant-7", I=1.5, K=2.2, theta_max=2.0)
+    alert = monitor.observe("plant-7", I_t=1.9, K_t=2.0)      # one unit, O(1)
+    alerts = monitor.observe_all(I_week, K_week)              # every unit, vectorized
+
+Each observation updates the debt with the accumulation/dissipation rule
+of run_simulation. The probability of collapse within `horizon` weeks
+from the current debt is read from a precomputed table, so an update
+costs microseconds.
+
+The table comes from dynamic programming over a debt grid on [0, θ_max):
+one week of the model is a transition kernel (shocks from Gauss-Hermite
+quadrature, mass split linearly between neighbouring grid points), and
+survival over h weeks is the kernel applied h times. Units with the same
+(I, K, θ_max, α, volatilities) share one table.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from .physics import VOLATILITY_I, VOLATILITY_K
+
+GRID_SIZE = 200
+QUADRATURE_NODES = 24
+
+OK, WATCH, CRITICAL, COLLAPSED = "ok", "watch", "critical", "collapsed"
+LEVELS = (OK, WATCH, CRITICAL, COLLAPSED)
+
+
+# ============================================================================
+# COLLAPSE TABLE (dynamic programming over the debt grid)
+# ============================================================================
+
+def weekly_debt_change(
+    I: float,
+    K: float,
+    alpha: float = 0.15,
+    volatility_i: float = VOLATILITY_I,
+    volatility_k: float = VOLATILITY_K,
+    nodes: int = QUADRATURE_NODES
+):
+    """Discrete distribution (values, weights) of one week's debt change Δ = accumulation - dissipation."""
+    x, w = np.polynomial.hermite_e.hermegauss(nodes)
+    w = w / w.sum()
+    inputs = np.maximum(0.01, I + I * volatility_i * x)[:, None]
+    capacity = np.maximum(0.01, K + K * volatility_k * x)[None, :]
+    excess = inputs - capacity
+    ratio = inputs / capacity
+    accumulation = np.where(ratio > 1.0, excess * (1 + np.sqrt(np.maximum(ratio - 1, 0.0))), 0.0)
+    delta = accumulation - alpha * np.maximum(0.0, -excess)
+    return delta.ravel(), np.outer(w, w).ravel()
+
+
+@lru_cache(maxsize=4096)
+def collapse_table(
+    I: float,
+    K: float,
+    theta_max: float,
+    horizon: int,
+    alpha: float = 0.15,
+    volatility_i: float = VOLATILITY_I,
+    volatility_k: float = VOLATILITY_K,
+    grid_size: int = GRID_SIZE
+) -> np.ndarray:
+    """
+    P[h, g]: probability of collapsing within h weeks (h = 0..horizon) starting
+    from debt g·θ_max/grid_size. The extra last column (debt = θ_max) is 1.
+    """
+    step = theta_max / grid_size
+    grid = np.arange(grid_size) * step
+    delta, weight = weekly_debt_change(I, K, alpha, volatility_i, volatility_k)
+
+    # Transition kernel between grid points (column grid_size = collapsed)
+    target = np.maximum(0.0, grid[:, None] + delta[None, :]) / step
+    collapsed = target >= grid_size
+    low = np.minimum(np.floor(target), grid_size).astype(np.int64)
+    frac = np.where(collapsed, 0.0, target - low)
+    low = np.where(collapsed, grid_size, low)
+    high = np.minimum(low + 1, grid_size)
+    rows = np.repeat(np.arange(grid_size), len(delta))
+    kernel = (
+        np.bincount(rows * (grid_size + 1) + low.ravel(), (weight * (1 - frac)).ravel(),
+                    minlength=grid_size * (grid_size + 1))
+        + np.bincount(rows * (grid_size + 1) + high.ravel(), (weight * frac).ravel(),
+                      minlength=grid_size * (grid_size + 1))
+    ).reshape(grid_size, grid_size + 1)
+    alive_kernel = kernel[:, :grid_size]
+
+    table = np.ones((horizon + 1, grid_size + 1))
+    survival = np.ones(grid_size)
+    table[0, :grid_size] = 0.0
+    for h in range(1, horizon + 1):
+        survival = alive_kernel @ survival
+        table[h, :grid_size] = 1.0 - survival
+    table.setflags(write=False)
+    return table
+
+
+def table_lookup(row: np.ndarray, debt: np.ndarray, theta_max: np.ndarray) -> np.ndarray:
+    """Linear interpolation of a table row (or one row per unit) at the given debts."""
+    grid_size = row.shape[-1] - 1
+    position = np.clip(np.asarray(debt) / theta_max * grid_size, 0, grid_size)
+    low = np.minimum(position.astype(np.int64), grid_size - 1)
+    frac = position - low
+    if row.ndim == 1:
+        return row[low] * (1 - frac) + row[low + 1] * frac
+    units = np.arange(len(row))
+    return row[units, low] * (1 - frac) + row[units, low + 1] * frac
+
+
+# ============================================================================
+# MONITOR
+# ============================================================================
+
+@dataclass
+class Alert:
+    unit: Hashable
+    week: int
+    level: str            # watch | critical | collapsed | ok (recovered)
+    previous: str
+    debt: float
+    probability: float    # P(collapse within horizon)
+    timestamp: float
+
+
+class EntropyMonitor:
+    """
+    Realized debt and collapse-within-horizon probability for many units.
+
+    Args:
+        horizon: Weeks ahead of the collapse probability.
+        watch / critical: Probability thresholds of the alert levels.
+        on_alert: Called with every Alert (level changes only).
+    """
+
+    def __init__(
+        self,
+        horizon: int = 13,
+        watch: float = 0.2,
+        critical: float = 0.5,
+        grid_size: int = GRID_SIZE,
+        on_alert: Optional[Callable[[Alert], None]] = None
+    ):
+        self.horizon = horizon
+        self.watch = watch
+        self.critical = critical
+        self.grid_size = grid_size
+        self.on_alert = on_alert
+
+        self.ids: List[Hashable] = []
+        self._index: Dict[Hashable, int] = {}
+        self._rows: List[np.ndarray] = []            # Horizon row of each distinct table
+        self._row_of: Dict[tuple, int] = {}
+        self._params = np.empty((0, 5))              # I, K, theta_max, alpha + row index
+        self._vol = np.empty((0, 2))
+        self.debt = np.empty(0)
+        self.week = np.empty(0, dtype=np.int64)
+        self.level = np.empty(0, dtype=np.int8)
+        self.probability = np.empty(0)
+        self._stack: Optional[np.ndarray] = None     # Rows stacked per unit, rebuilt lazily
+
+    # ------------------------------------------------------------------
+    # Units
+    # ------------------------------------------------------------------
+
+    def add_unit(
+        self,
+        unit: Hashable,
+        I: float,
+        K: float,
+        theta_max: float,
+        alpha: float = 0.15,
+        volatility_i: float = VOLATILITY_I,
+        volatility_k: float = VOLATILITY_K,
+        debt: float = 0.0
+    ):
+        self.add_units([unit], [I], [K], [theta_max], alpha, volatility_i, volatility_k, [debt])
+
+    def add_units(
+        self,
+        units: Sequence[Hashable],
+        I: Sequence[float],
+        K: Sequence[float],
+        theta_max: Sequence[float],
+        alpha: Any = 0.15,
+        volatility_i: Any = VOLATILITY_I,
+        volatility_k: Any = VOLATILITY_K,
+        debt: Any = 0.0
+    ):
+        """Registers units (e.g. a grounded or calibrated portfolio); parameters may be arrays."""
+        n = len(units)
+        columns = [np.broadcast_to(np.asarray(a, dtype=np.float64), (n,))
+                   for a in (I, K, theta_max, alpha, volatility_i, volatility_k, debt)]
+        I, K, theta_max, alpha, vol_i, vol_k, debt = columns
+        if np.any(theta_max <= 0):
+            raise ValueError("theta_max must be positive")
+        duplicates = [u for u in units if u in self._index]
+        if duplicates or len(set(units)) != n:
+            raise ValueError(f"units already monitored or repeated: {duplicates[:5]}")
+
+        rows = np.array([
+            self._row(*(round(float(v), 9) for v in params))
+            for params in zip(I, K, theta_max, alpha, vol_i, vol_k)
+        ], dtype=np.float64)
+        start = len(self.ids)
+        self.ids.extend(units)
+        self._index.update({unit: start + i for i, unit in enumerate(units)})
+        self._params = np.vstack([self._params, np.column_stack([I, K, theta_max, alpha, rows])])
+        self._vol = np.vstack([self._vol, np.column_stack([vol_i, vol_k])])
+        self.debt = np.r_[self.debt, debt]
+        self.week = np.r_[self.week, np.zeros(n, dtype=np.int64)]
+        self._stack = None
+        probability = table_lookup(self._table_rows()[start:], debt, theta_max)
+        self.probability = np.r_[self.probability, probability]
+        self.level = np.r_[self.level, self._levels(probability, debt >= theta_max)]
+
+    def _row(self, I, K, theta_max, alpha, vol_i, vol_k) -> int:
+        key = (I, K, theta_max, alpha, vol_i, vol_k)
+        if key not in self._row_of:
+            table = collapse_table(I, K, theta_max, self.horizon, alpha, vol_i, vol_k, self.grid_size)
+            self._row_of[key] = len(self._rows)
+            self._rows.append(table[self.horizon])
+        return self._row_of[key]
+
+    def _table_rows(self) -> np.ndarray:
+        if self._stack is None:
+            self._stack = np.stack(self._rows)[self._params[:, 4].astype(np.int64)] if self._rows \
+                else np.empty((0, self.grid_size + 1))
+        return self._stack
+
+    def _levels(self, probability: np.ndarray, collapsed: np.ndarray) -> np.ndarray:
+        level = (probability >= self.watch).astype(np.int8) + (probability >= self.critical)
+        return np.where(collapsed, LEVELS.index(COLLAPSED), level).astype(np.int8)
+
+    # ------------------------------------------------------------------
+    # Observations
+    # ------------------------------------------------------------------
+
+    def observe(self, unit: Hashable, I_t: float, K_t: float) -> Optional[Alert]:
+        """One week of one unit. Returns the alert if its level changed."""
+        i = self._index[unit]
+        I, K, theta_max, alpha, row = self._params[i]
+        if self.level[i] == LEVELS.index(COLLAPSED):
+            return None
+
+        input_entropy = max(0.01, I_t)
+        capacity = max(0.01, K_t)
+        excess = input_entropy - capacity
+        ratio = input_entropy / capacity
+        accumulation = excess * (1 + (ratio - 1) ** 0.5) if ratio > 1.0 else 0.0
+        debt = max(0.0, float(self.debt[i]) + accumulation - alpha * max(0.0, -excess))
+
+        table = self._rows[int(row)]
+        position = min(debt / theta_max * self.grid_size, self.grid_size)
+        low = min(int(position), self.grid_size - 1)
+        probability = float(table[low] + (table[low + 1] - table[low]) * (position - low))
+
+        self.debt[i] = debt
+        self.week[i] += 1
+        self.probability[i] = probability
+        if debt >= theta_max:
+            level = LEVELS.index(COLLAPSED)
+        else:
+            level = (probability >= self.watch) + (probability >= self.critical)
+        return self._maybe_alert(i, int(level))
+
+    def observe_all(self, I_t: Sequence[float], K_t: Sequence[float]) -> List[Alert]:
+        """One week of every unit (arrays in add order; NaN = no observation this week)."""
+        I_t, K_t = np.asarray(I_t, dtype=np.float64), np.asarray(K_t, dtype=np.float64)
+        _, _, theta_max, alpha, _ = self._params.T
+        active = ~np.isnan(I_t) & ~np.isnan(K_t) & (self.level != LEVELS.index(COLLAPSED))
+
+        input_entropy = np.maximum(0.01, np.nan_to_num(I_t))
+        capacity = np.maximum(0.01, np.nan_to_num(K_t, nan=1.0))
+        excess = input_entropy - capacity
+        ratio = input_entropy / capacity
+        accumulation = np.where(ratio > 1.0, excess * (1 + np.sqrt(np.maximum(ratio - 1, 0.0))), 0.0)
+        debt = np.maximum(0.0, self.debt + accumulation - alpha * np.maximum(0.0, -excess))
+
+        self.debt = np.where(active, debt, self.debt)
+        self.week += active
+        self.probability = np.where(active, table_lookup(self._table_rows(), self.debt, theta_max), self.probability)
+        levels = self._levels(self.probability, self.debt >= theta_max)
+
+        changed = np.flatnonzero(active & (levels != self.level))
+        return [alert for i in changed if (alert := self._maybe_alert(int(i), int(levels[i])))]
+
+    def _maybe_alert(self, i: int, level: int) -> Optional[Alert]:
+        previous = int(self.level[i])
+        if level == previous:
+            return None
+        self.level[i] = level
+        alert = Alert(unit=self.ids[i], week=int(self.week[i]), level=LEVELS[level], previous=LEVELS[previous],
+                      debt=float(self.debt[i]), probability=float(self.probability[i]), timestamp=time.time())
+        if self.on_alert:
+            self.on_alert(alert)
+        return alert
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def status(self, unit: Hashable) -> Dict[str, Any]:
+        i = self._index[unit]
+        return {"unit": unit, "week": int(self.week[i]), "debt": float(self.debt[i]),
+                "theta_max": float(self._params[i, 2]), "probability": float(self.probability[i]),
+                "horizon": self.horizon, "level": LEVELS[self.level[i]]}
+
+    def at_level(self, level: str) -> List[Hashable]:
+        code = LEVELS.index(level)
+        return [self.ids[i] for i in np.flatnonzero(self.level == code)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
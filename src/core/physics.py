@@ -1,6 +1,11 @@
 #physics.py
 import math
 import random
+from typing import Optional
+
+# Realistic volatility of the weekly shocks (shared with the vectorized engine)
+VOLATILITY_I = 0.4   # 40% volatility (real markets)
+VOLATILITY_K = 0.08  # 8% volatility (more stable operations)
 
 def calculate_collapse_threshold(stock_ratio: float, capital_ratio: float, liquidity: float) -> float:
     """
@@ -27,7 +32,9 @@ def calculate_collapse_threshold(stock_ratio: float, capital_ratio: float, liqui
     
     return term_stock + term_capital + term_liquidity
 
-def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_steps: int = 52, alpha: float = 0.15):
+def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_steps: int = 52, alpha: float = 0.15,
+                   rng: Optional[random.Random] = None, volatility_i: float = VOLATILITY_I,
+                   volatility_k: float = VOLATILITY_K):
     """
     Runs a Monte Carlo simulation of entropy debt accumulation.
     
@@ -43,6 +50,10 @@ def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_s
         runs (int): Number of iterations (complete simulations) to run.
         time_steps (int): Time steps (e.g., weeks) in each simulation.
         alpha (float): Rate of debt dissipation when K > I.
+        rng (random.Random, optional): Random generator to draw from. Defaults to the
+            module-level generator; pass a seeded instance for reproducible runs.
+        volatility_i (float): Relative weekly volatility of I (σ_I = I·volatility_i).
+        volatility_k (float): Relative weekly volatility of K (e.g. fitted by calibration.py).
 
     Returns:
         dict: A dictionary with numerical results, including 'collapse_rate',
@@ -52,14 +63,11 @@ def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_s
         raise ValueError("All input parameters must be non-negative numbers.")
 
     import statistics
+    gauss = (rng or random).gauss
     collapses = 0
     collapse_times_list = []
     ratios_list = []
     residual_debts = []
-    
-    # Realistic volatility
-    volatility_i = 0.4  # 40% volatility (real markets)
-    volatility_k = 0.08  # 8% volatility (more stable operations)
 
     for _ in range(runs):
         trajectory = [] if _ == runs - 1 else None
@@ -68,8 +76,8 @@ def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_s
         collapsed = False
         for t in range(1, time_steps + 1):
             # Use normal distribution instead of uniform (more realistic)
-            input_entropy = random.gauss(I, I * volatility_i)
-            response_capacity = random.gauss(K, K * volatility_k)
+            input_entropy = gauss(I, I * volatility_i)
+            response_capacity = gauss(K, K * volatility_k)
             
             # Ensure values are not negative
             input_entropy = max(0.01, input_entropy)
@@ -122,6 +130,29 @@ def run_simulation(I: float, K: float, theta_max: float, runs: int = 500, time_s
         "trajectory": trajectory if trajectory else []
     }
 
+def wilson_upper_bound(collapses: int, runs: int, z: float = 1.96) -> float:
+    """
+    Wilson score interval upper bound for a collapse proportion.
+
+    Args:
+        collapses (int): Number of collapsed runs.
+        runs (int): Total runs.
+        z (float): Normal quantile (1.96 = 95% confidence).
+
+    Returns:
+        float: Upper bound of the collapse rate, capped at 1.0.
+    """
+    if runs == 0:
+        return 1.0
+
+    phat = collapses / runs
+    denom = 1 + (z**2 / runs)
+    centre = phat + (z**2 / (2 * runs))
+    adj = z * math.sqrt((phat * (1 - phat) / runs) + (z**2 / (4 * runs**2)))
+    upper = (centre + adj) / denom
+
+    return min(1.0, upper)
+
 if __name__ == '__main__':
     # --- Example of simulation usage ---
 
@@ -0,0 +1,128 @@
+# portfolio.py
+"""
+Portfolio Grounding
+===================
+
+Array versions of grounding.ground_inputs and constraints.apply_hard_rules
+for screening many units at once (columns instead of one dict per unit):
+
+    units = pd.DataFrame({"volatility": [...], "rigidity": [...], "buffer_months": [...]})
+    grounded = ground_portfolio(units)
+    grounded["I"], grounded["theta_max"], grounded["critical_structural_warning"]
+
+Results are identical to the scalar functions, unit by unit. The label
+columns go through ground_inputs once per distinct (volatility, rigidity)
+pair, and θ_max through calculate_collapse_threshold once per distinct
+(stock, capital, liquidity): np.log2 may differ from math.log2 in the
+last bit.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .grounding import ground_inputs
+from .physics import calculate_collapse_threshold
+
+Column = Union[Sequence[Any], np.ndarray]
+
+
+def ground_inputs_batch(volatility: Column, rigidity: Column, buffer_months: Column) -> Dict[str, np.ndarray]:
+    """ground_inputs over columns: arrays I, K0, stock, liquidity, capital."""
+    labels = np.char.add(np.char.add(np.asarray(volatility, dtype=str), "\x1f"), np.asarray(rigidity, dtype=str))
+    distinct, inverse = np.unique(labels, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # Label lookups: one scalar ground_inputs call per distinct (volatility, rigidity)
+    grounded = [ground_inputs(*label.split("\x1f"), 6) for label in distinct]
+    per_label = lambda name: np.array([g[name] for g in grounded], dtype=np.float64)[inverse]
+
+    buffer_months = np.asarray(buffer_months, dtype=np.float64)
+    return {
+        "I": per_label("I"),
+        "K0": per_label("K0"),
+        "stock": np.clip(buffer_months / 24.0, 0.05, 1.0),
+        "liquidity": per_label("liquidity"),
+        "capital": np.ones(len(buffer_months))
+    }
+
+
+def collapse_threshold_batch(stock: np.ndarray, capital: np.ndarray, liquidity: np.ndarray) -> np.ndarray:
+    """calculate_collapse_threshold per unit, evaluated once per distinct input triple."""
+    triples = np.column_stack([stock, capital, liquidity])
+    distinct, inverse = np.unique(triples, axis=0, return_inverse=True)
+    thresholds = np.array([calculate_collapse_threshold(*map(float, row)) for row in distinct])
+    return thresholds[inverse.reshape(-1)]
+
+
+def apply_hard_rules_batch(
+    *,
+    volatility: Column,
+    rigidity: Column,
+    buffer_months: Column,
+    params: Mapping[str, Any]
+) -> Dict[str, np.ndarray]:
+    """
+    apply_hard_rules over columns. Returns a new dict (params is not
+    modified) with the adjusted I, K, liquidity and the boolean flags
+    critical_structural_warning, marginal_situation, low_liquidity_penalty.
+    As in the scalar version, K defaults to 1.0 when params has no "K".
+    """
+    n = len(buffer_months)
+    volatility = np.asarray(volatility, dtype=object)
+    rigidity = np.asarray(rigidity, dtype=object)
+    I = np.broadcast_to(np.asarray(params.get("I", 1.0), dtype=np.float64), (n,)).copy()
+    K = np.broadcast_to(np.asarray(params.get("K", 1.0), dtype=np.float64), (n,)).copy()
+    liquidity = np.broadcast_to(np.asarray(params.get("liquidity", 0.5), dtype=np.float64), (n,))
+
+    # 1️⃣ Minimum entropy according to volatility
+    for label, floor in (("High (Chaotic)", 4.5), ("Medium (Seasonal)", 1.0), ("Low (Stable)", 0.5)):
+        I = np.where((volatility == label) & (I < floor), floor, I)
+
+    # 2️⃣ Initial capacity according to rigidity
+    K = np.where((rigidity == "High (Manual/Bureaucratic)") & (K > 3.0), 3.0, K)
+
+    # 3️⃣ Low liquidity → more aggressive K growth
+    low_liquidity = liquidity < 0.5
+
+    # 4️⃣ Criticality detection (before the final clamp, as in the scalar version)
+    critical = I > K * 2.0
+    marginal = ~critical & (I > K * 1.5)
+
+    # 5️⃣ Final absolute clamp
+    return {
+        "I": np.clip(I, 0.1, 10.0),
+        "K": np.clip(K, 0.1, 10.0),
+        "liquidity": np.clip(liquidity, 0.0, 1.0),
+        "critical_structural_warning": critical,
+        "marginal_situation": marginal,
+        "low_liquidity_penalty": low_liquidity
+    }
+
+
+def ground_portfolio(
+    units: Any,
+    volatility: str = "volatility",
+    rigidity: str = "rigidity",
+    buffer_months: str = "buffer_months",
+    K: Optional[Column] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Grounding, θ_max and hard rules for every unit, as IsoEntropyAgent does for one.
+
+    Args:
+        units: DataFrame or mapping of columns.
+        volatility, rigidity, buffer_months: Column names.
+        K (optional): Current capacity per unit, passed to the hard rules.
+
+    Returns:
+        dict of arrays: I, K0, K, stock, liquidity, capital, theta_max and
+        the flags critical_structural_warning, marginal_situation,
+        low_liquidity_penalty.
+    """
+    vol, rig, buf = units[volatility], units[rigidity], units[buffer_months]
+    params = ground_inputs_batch(vol, rig, buf)
+    params["theta_max"] = collapse_threshold_batch(params["stock"], params["capital"], params["liquidity"])
+    if K is not None:
+        params["K"] = np.asarray(K, dtype=np.float64)
+    return {**params, **apply_hard_rules_batch(volatility=vol, rigidity=rig, buffer_months=buf, params=params)}
@@ -0,0 +1,101 @@
+# retry.py
+"""
+LLM Call Retries
+================
+
+Helpers that keep the final Gemini call inside the audit deadline:
+
+- classify_llm_error : retriable (429, 5xx, timeouts, network) vs fatal
+- backoff_delay      : exponential backoff with jitter
+- call_with_timeout  : per-attempt timeout for a blocking call
+"""
+
+import random
+import re
+import threading
+from typing import Any, Callable, Optional
+
+RETRIABLE = "retriable"
+FATAL = "fatal"
+
+_RETRIABLE_CODES = {408, 429, 500, 502, 503, 504}
+# Whole gRPC status tokens, and HTTP codes only where a status is written
+# ("429 RESOURCE_EXHAUSTED ...", "HTTP 503", "status: 502"), never inside other numbers
+_RETRIABLE_STATUS = re.compile(r"\b(RESOURCE_EXHAUSTED|UNAVAILABLE|DEADLINE_EXCEEDED|INTERNAL)\b")
+_RETRIABLE_HTTP = re.compile(
+    r"(?:^\s*|\b(?:HTTP|[Ss]tatus|[Cc]ode)\W{0,3})(408|429|500|502|503|504)\b"
+)
+_QUOTA_HTTP = re.compile(r"(?:^\s*|\b(?:HTTP|[Ss]tatus|[Cc]ode)\W{0,3})429\b|\bRESOURCE_EXHAUSTED\b")
+# Network and timeout errors of HTTP clients that do not subclass the builtins
+# (httpx.TimeoutException / NetworkError, requests.Timeout / ConnectionError)
+_TRANSIENT_TYPE_NAMES = {"TimeoutException", "NetworkError", "Timeout", "ConnectionError"}
+
+
+class LLMTimeoutError(TimeoutError):
+    """An LLM attempt exceeded its time budget."""
+    pass
+
+
+def classify_llm_error(error: BaseException) -> str:
+    """RETRIABLE for transient failures (quota, overload, network, timeouts), FATAL otherwise."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return RETRIABLE
+    if any(cls.__name__ in _TRANSIENT_TYPE_NAMES for cls in type(error).__mro__):
+        return RETRIABLE
+
+    # google-genai APIError carries the HTTP status as `code`; other clients use `status_code`
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return RETRIABLE if code in _RETRIABLE_CODES else FATAL
+
+    text = str(error)
+    return RETRIABLE if _RETRIABLE_STATUS.search(text) or _RETRIABLE_HTTP.search(text) else FATAL
+
+
+def is_quota_error(error: BaseException) -> bool:
+    return getattr(error, "code", None) == 429 or bool(_QUOTA_HTTP.search(str(error)))
+
+
+def backoff_delay(
+    attempt: int,
+    base_s: float = 1.0,
+    max_s: float = 30.0,
+    floor_s: float = 0.0,
+    rng: Optional[random.Random] = None
+) -> float:
+    """
+    Delay before retry number `attempt` (1 = first retry): base·2^(attempt-1),
+    capped at max_s, with "equal jitter" (uniform in [d/2, d]) so concurrent
+    audits do not retry in lockstep. Never below floor_s (e.g. the time until
+    the rate limiter has a free slot).
+    """
+    delay = min(max_s, base_s * 2 ** (attempt - 1))
+    jittered = (rng or random).uniform(delay / 2, delay)
+    return max(jittered, floor_s)
+
+
+def call_with_timeout(func: Callable[[], Any], timeout_s: Optional[float]) -> Any:
+    """
+    Runs func() and returns its result, or raises LLMTimeoutError after timeout_s.
+    The call runs in a daemon thread: a hung request is abandoned, never joined.
+    """
+    if timeout_s is None:
+        return func()
+
+    outcome = {}
+    done = threading.Event()
+
+    def target():
+        try:
+            outcome["value"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    threading.Thread(target=target, name="llm-call", daemon=True).start()
+    if not done.wait(max(0.0, timeout_s)):
+        raise LLMTimeoutError(f"LLM call timed out after {timeout_s:.1f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
@@ -0,0 +1,248 @@
+# screening.py
+"""
+Tiered Portfolio Screening
+==========================
+
+Ranks thousands of units by collapse risk while simulating only the ones
+whose answer is in doubt. The decision is whether each unit's collapse
+probability p is above `threshold`:
+
+1. Bounds (no simulation). With A_t ≥ 0 the weekly accumulation and
+   Δ_t = A_t - α·max(0, K_t - I_t) the weekly debt change:
+   - Markov:   debt never exceeds ΣA_t, so p ≤ T·E[A] / θ_max
+   - Cantelli: debt after week T is at least ΣΔ_t, so when T·E[Δ] > θ_max,
+               p ≥ a² / (T·Var[Δ] + a²) with a = T·E[Δ] - θ_max
+   E[A], E[Δ], Var[Δ] come from Gauss–Hermite quadrature over the two
+   weekly shocks. Units with upper bound < threshold are safe, units with
+   lower bound > threshold are at risk.
+2. Small simulation (`small_runs` paths per remaining unit, all units in
+   one vectorized batch). Units whose Wilson interval excludes the
+   threshold are decided.
+3. Full precision (`full_runs` paths in total) only for units whose
+   interval still straddles the threshold.
+
+    result = screen_portfolio(units, threshold=0.05)
+    result.table()          # ranked risk table (pandas)
+    result.cost()           # paths simulated vs simulating every unit fully
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .engine import simulate_paths
+from .physics import VOLATILITY_I, VOLATILITY_K
+from .portfolio import ground_portfolio
+
+BOUND, SMALL, FULL = 1, 2, 3
+QUADRATURE_NODES = 48
+MAX_PATHS_PER_BATCH = 500_000
+
+
+# ============================================================================
+# TIER 1: BOUNDS
+# ============================================================================
+
+def step_moments(
+    I: np.ndarray,
+    K: np.ndarray,
+    alpha: float = 0.15,
+    nodes: int = QUADRATURE_NODES
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """E[A], E[Δ] and Var[Δ] of one week, per unit (same dynamics as engine.simulate_paths)."""
+    x, w = np.polynomial.hermite_e.hermegauss(nodes)   # Probabilists' Hermite: N(0, 1) weights
+    w = w / w.sum()
+    weight = np.outer(w, w)                              # (z_I, z_K) grid
+
+    I = np.asarray(I, dtype=np.float64)[:, None, None]
+    K = np.asarray(K, dtype=np.float64)[:, None, None]
+    inputs = np.maximum(0.01, I + I * VOLATILITY_I * x[:, None])
+    capacity = np.maximum(0.01, K + K * VOLATILITY_K * x[None, :])
+
+    excess = inputs - capacity
+    ratio = inputs / capacity
+    accumulation = np.where(ratio > 1.0, excess * (1 + np.sqrt(np.maximum(ratio - 1, 0.0))), 0.0)
+    delta = accumulation - alpha * np.maximum(0.0, -excess)
+
+    mean_a = (accumulation * weight).sum(axis=(1, 2))
+    mean_d = (delta * weight).sum(axis=(1, 2))
+    var_d = np.maximum(0.0, (delta ** 2 * weight).sum(axis=(1, 2)) - mean_d ** 2)
+    return mean_a, mean_d, var_d
+
+
+def collapse_bounds(
+    I: np.ndarray,
+    K: np.ndarray,
+    theta_max: np.ndarray,
+    time_steps: int = 52,
+    alpha: float = 0.15
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(lower, upper) bounds of the collapse probability per unit (Cantelli, Markov)."""
+    theta_max = np.asarray(theta_max, dtype=np.float64)
+    lower = np.zeros(len(theta_max))
+    upper = np.ones(len(theta_max))
+    for start in range(0, len(theta_max), 2048):   # Bounded quadrature memory
+        part = slice(start, start + 2048)
+        mean_a, mean_d, var_d = step_moments(I[part], K[part], alpha)
+        upper[part] = np.minimum(1.0, time_steps * mean_a / theta_max[part])
+        gap = time_steps * mean_d - theta_max[part]
+        lower[part] = np.where(gap > 0, gap ** 2 / (time_steps * var_d + gap ** 2 + 1e-300), 0.0)
+    return lower, upper
+
+
+# ============================================================================
+# TIERS 2-3: SIMULATION
+# ============================================================================
+
+def wilson_interval(collapses: np.ndarray, runs: np.ndarray, z: float = 1.96) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval per unit (array version of physics.wilson_upper_bound)."""
+    runs = np.maximum(np.asarray(runs, dtype=np.float64), 1)
+    phat = collapses / runs
+    denom = 1 + z ** 2 / runs
+    centre = phat + z ** 2 / (2 * runs)
+    adj = z * np.sqrt(phat * (1 - phat) / runs + z ** 2 / (4 * runs ** 2))
+    return np.maximum(0.0, (centre - adj) / denom), np.minimum(1.0, (centre + adj) / denom)
+
+
+def count_collapses(
+    I: np.ndarray,
+    K: np.ndarray,
+    theta_max: np.ndarray,
+    runs: int,
+    time_steps: int = 52,
+    alpha: float = 0.15,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Collapsed runs per unit, `runs` paths each, in vectorized batches."""
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = np.zeros(len(I), dtype=np.int64)
+    per_batch = max(1, MAX_PATHS_PER_BATCH // max(runs, 1))
+    for start in range(0, len(I), per_batch):
+        part = slice(start, start + per_batch)
+        units = len(I[part])
+        paths = simulate_paths(
+            np.repeat(I[part], runs), np.repeat(K[part], runs), np.repeat(theta_max[part], runs),
+            time_steps=time_steps, alpha=alpha, rng=rng
+        )
+        counts[part] = paths["collapsed"].reshape(units, runs).sum(axis=1)
+    return counts
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+@dataclass
+class ScreeningResult:
+    """Per-unit arrays, in input order."""
+    I: np.ndarray
+    K: np.ndarray
+    theta_max: np.ndarray
+    lower: np.ndarray            # Lower bound of the collapse probability (bound or Wilson)
+    upper: np.ndarray            # Upper bound
+    collapse_rate: np.ndarray    # Simulated estimate (NaN for units decided by the bounds)
+    runs: np.ndarray             # Paths simulated per unit
+    tier: np.ndarray             # 1 = bounds, 2 = small simulation, 3 = full simulation
+    at_risk: np.ndarray          # Decision: collapse probability above the threshold
+    threshold: float
+    full_runs: int
+
+    @property
+    def risk(self) -> np.ndarray:
+        """Ranking score: the simulated estimate, else the midpoint of the bounds."""
+        return np.where(np.isnan(self.collapse_rate), (self.lower + self.upper) / 2, self.collapse_rate)
+
+    def ranking(self) -> np.ndarray:
+        """Unit indices, riskiest first (ties broken by the upper bound)."""
+        return np.lexsort((-self.upper, -self.risk))
+
+    def table(self, index: Optional[Any] = None):
+        """Ranked pandas DataFrame; `index` labels the units (e.g. the input DataFrame's index)."""
+        import pandas as pd
+
+        order = self.ranking()
+        units = np.arange(len(self.I)) if index is None else np.asarray(index)
+        return pd.DataFrame({
+            "unit": units[order],
+            "risk": self.risk[order],
+            "lower": self.lower[order],
+            "upper": self.upper[order],
+            "collapse_rate": self.collapse_rate[order],
+            "at_risk": self.at_risk[order],
+            "tier": self.tier[order],
+            "runs": self.runs[order],
+            "I": self.I[order],
+            "K": self.K[order],
+            "theta_max": self.theta_max[order],
+        })
+
+    def cost(self) -> Dict[str, Any]:
+        simulated = int(self.runs.sum())
+        exhaustive = len(self.I) * self.full_runs
+        return {
+            "units": len(self.I),
+            "by_tier": {tier: int((self.tier == tier).sum()) for tier in (BOUND, SMALL, FULL)},
+            "paths_simulated": simulated,
+            "paths_exhaustive": exhaustive,
+            "fraction": simulated / exhaustive if exhaustive else 0.0,
+        }
+
+
+def screen(
+    I: np.ndarray,
+    K: np.ndarray,
+    theta_max: np.ndarray,
+    threshold: float = 0.05,
+    small_runs: int = 200,
+    full_runs: int = 5000,
+    time_steps: int = 52,
+    alpha: float = 0.15,
+    z: float = 1.96,
+    seed: Optional[int] = None
+) -> ScreeningResult:
+    """Three-tier screening of units given as arrays of I, K and θ_max."""
+    I, K, theta_max = (np.asarray(a, dtype=np.float64) for a in (I, K, theta_max))
+    rng = np.random.default_rng(seed)
+    n = len(I)
+
+    # Tier 1: bounds
+    lower, upper = collapse_bounds(I, K, theta_max, time_steps, alpha)
+    collapse_rate = np.full(n, np.nan)
+    runs = np.zeros(n, dtype=np.int64)
+    tier = np.full(n, BOUND, dtype=np.int8)
+    open_ = (lower <= threshold) & (upper >= threshold)
+
+    # Tier 2: small simulation for the units the bounds cannot decide
+    collapses = np.zeros(n, dtype=np.int64)
+    for level, budget in ((SMALL, small_runs), (FULL, full_runs - small_runs)):
+        units = np.flatnonzero(open_)
+        if len(units) == 0 or budget <= 0:
+            break
+        collapses[units] += count_collapses(I[units], K[units], theta_max[units], budget, time_steps, alpha, rng)
+        runs[units] += budget
+        tier[units] = level
+        low, high = wilson_interval(collapses[units], runs[units], z)
+        lower[units], upper[units] = low, high
+        collapse_rate[units] = collapses[units] / runs[units]
+        # Tier 3 only for intervals that still straddle the threshold
+        open_[units] = (low <= threshold) & (high >= threshold)
+
+    decided_risk = lower > threshold
+    estimate_risk = ~np.isnan(collapse_rate) & (collapse_rate > threshold)
+    return ScreeningResult(
+        I=I, K=K, theta_max=theta_max, lower=lower, upper=upper,
+        collapse_rate=collapse_rate, runs=runs, tier=tier,
+        at_risk=np.where(open_, estimate_risk, decided_risk),
+        threshold=threshold, full_runs=full_runs
+    )
+
+
+def screen_portfolio(units: Any, threshold: float = 0.05, K: Optional[Any] = None, **options: Any) -> ScreeningResult:
+    """
+    Grounds a portfolio (see portfolio.ground_portfolio) and screens it.
+    K defaults to each unit's grounded capacity K0.
+    """
+    grounded = ground_portfolio(units)
+    capacity = grounded["K0"] if K is None else np.asarray(K, dtype=np.float64)
+    return screen(grounded["I"], capacity, grounded["theta_max"], threshold=threshold, **options)
@@ -1,5 +1,10 @@
 # telemetry.py
-from typing import List, Dict, Optional
+import math
+from typing import Callable, List, Dict, Optional
+
+import numpy as np
+
+from .experiment_log import ExperimentLog
 
 
 def build_llm_signal(experiment_log: List[Dict]) -> Dict:
@@ -15,9 +20,181 @@ def build_llm_signal(experiment_log: List[Dict]) -> Dict:
             "trend": "none"
         }
 
-    # Check if compressed
-    if len(experiment_log) == 1 and experiment_log[0].get("compressed"):
-        summary = experiment_log[0]["summary"]
+    if isinstance(experiment_log, ExperimentLog):
+        if experiment_log.compressed is None:
+            return _signal_from_columns(experiment_log)
+        experiment_log = experiment_log.to_list()
+
+    aggregator = TelemetryAggregator()
+    for exp in experiment_log:
+        aggregator.ingest(exp)
+    return aggregator.signal()
+
+
+class TelemetryAggregator:
+    """
+    Incremental build_llm_signal.
+
+    The agent feeds it once per experiment (update/ingest); signal()
+    returns the same dict as build_llm_signal in constant time, from
+    running sums, extrema and prefix sums for the half-vs-half trend.
+    """
+
+    STATE_FIELDS = (
+        "count", "collapse_sum", "min_collapse", "max_collapse", "last_collapse",
+        "last_K", "k_min", "k_max", "theta_count", "theta_min", "theta_max",
+        "last_theta", "entropy_debt"
+    )
+
+    def __init__(self):
+        self.entries = 0  # Every ingested entry, valid or not
+        self.count = 0    # Valid experiments
+        self.collapse_sum = 0.0
+        self.min_collapse = math.inf
+        self.max_collapse = -math.inf
+        self.last_collapse = 0.0
+        self.last_K = 0.0
+        self.k_min = math.inf
+        self.k_max = -math.inf
+        self.theta_count = 0
+        self.theta_min = math.inf
+        self.theta_max = -math.inf
+        self.last_theta = 0.0
+        self.entropy_debt = 0.0
+        self.compressed_summary = None
+        # _prefix[n] = sum of the first n collapse rates after the folded block
+        self._prefix: List[float] = [0.0]
+        # Experiments folded into a compressed summary (only their mean is known)
+        self._folded = 0
+        self._folded_mean = 0.0
+
+    def update(self, I: float, K: float, collapse_rate: float, theta_max: Optional[float] = None):
+        """Adds one valid experiment."""
+        self.entries += 1
+        self.count += 1
+
+        self.collapse_sum += collapse_rate
+        self.min_collapse = min(self.min_collapse, collapse_rate)
+        self.max_collapse = max(self.max_collapse, collapse_rate)
+        self.last_collapse = collapse_rate
+        self._prefix.append(self._prefix[-1] + collapse_rate)
+
+        self.last_K = K
+        self.k_min = min(self.k_min, K)
+        self.k_max = max(self.k_max, K)
+
+        if theta_max is not None:
+            self.theta_count += 1
+            self.theta_min = min(self.theta_min, theta_max)
+            self.theta_max = max(self.theta_max, theta_max)
+            self.last_theta = theta_max
+
+        # Accumulated entropy debt (undissipated I - K), weighted by collapse probability
+        if I > K:
+            self.entropy_debt += (I - K) * collapse_rate
+
+    def ingest(self, exp: Dict):
+        """Adds one entry in the legacy experiment-log format (compressed entries included)."""
+        if exp.get("compressed"):
+            self.entries += 1
+            self.compressed_summary = exp.get("summary")
+            if isinstance(self.compressed_summary, dict) and self.count == 0:
+                self.load_state(self.compressed_summary.get("stats"))
+            return
+
+        # Filter invalid entries (no result or no hypothesis)
+        if not (exp.get("result") and exp.get("hypothesis")):
+            self.entries += 1
+            return
+
+        self.update(
+            I=exp.get("hypothesis", {}).get("I", 0.0),
+            K=exp.get("hypothesis", {}).get("K", 0.0),
+            collapse_rate=exp.get("result", {}).get("collapse_rate", 0.0),
+            theta_max=exp["full_parameters"].get("theta_max", 0.0) if exp.get("full_parameters") else None
+        )
+
+    def to_state(self) -> Dict[str, Optional[float]]:
+        """Numeric running statistics (no per-experiment data); unset extrema (±inf) become None."""
+        state = {name: getattr(self, name) for name in self.STATE_FIELDS}
+        return {name: value if math.isfinite(value) else None for name, value in state.items()}
+
+    def load_state(self, state: Optional[Dict[str, float]]):
+        """Seeds the aggregator with the statistics of a folded (compressed) block."""
+        if not state or not state.get("count"):
+            return
+        for name in self.STATE_FIELDS:
+            if state.get(name) is not None:
+                setattr(self, name, state[name])
+        self._folded = int(self.count)
+        self._folded_mean = self.collapse_sum / self.count
+        self._prefix = [0.0]
+
+    def trend(self) -> str:
+        if self.count < 2:
+            return "none"
+        return _trend_label(self._prefix_at, self.count)
+
+    def _prefix_at(self, n: int) -> float:
+        # Inside the folded block only the mean survives, so assume a flat profile there
+        if n <= self._folded:
+            return n * self._folded_mean
+        return self._folded * self._folded_mean + self._prefix[n - self._folded]
+
+    def signal(self) -> Dict:
+        if self.entries == 0:
+            return {
+                "experiments": 0,
+                "trend": "none"
+            }
+
+        # Check if compressed
+        if self.entries == 1 and self.compressed_summary is not None:
+            return self._compressed_signal()
+
+        if self.count == 0:
+            return {
+                "experiments": self.entries,
+                "min_collapse_rate": 0.0,
+                "max_collapse_rate": 0.0,
+                "avg_collapse_rate": 0.0,
+                "last_collapse_rate": 0.0,
+                "last_K": 0.0,
+                "k_range": "0.00 - 0.00",
+                "theta_max_range": "0.00 - 0.00",
+                "entropy_debt_accumulated": 0.0,
+                "last_theta_max": 0.0,
+                "overall_trend": "none"
+            }
+
+        theta_min = self.theta_min if self.theta_count else 0.0
+        theta_max = self.theta_max if self.theta_count else 0.0
+
+        # Summary statistics
+        signal = {
+            "experiments": self.count,
+            "min_collapse_rate": self.min_collapse,
+            "max_collapse_rate": self.max_collapse,
+            "avg_collapse_rate": self.collapse_sum / self.count,
+            "last_collapse_rate": self.last_collapse,
+            "last_K": self.last_K,
+            "k_range": f"{self.k_min:.2f} - {self.k_max:.2f}",
+            "theta_max_range": f"{theta_min:.2f} - {theta_max:.2f}",
+            "entropy_debt_accumulated": self.entropy_debt,
+            "last_theta_max": self.last_theta if self.theta_count else 0.0
+        }
+
+        if self._folded:
+            signal["compressed_experiments"] = self._folded
+
+        # Overall trend
+        if self.count >= 2:
+            signal["overall_trend"] = self.trend()
+
+        return signal
+
+    def _compressed_signal(self) -> Dict:
+        summary = self.compressed_summary
         if isinstance(summary, dict):
             return {
                 "experiments": "compressed",
@@ -28,82 +205,131 @@ def build_llm_signal(experiment_log: List[Dict]) -> Dict:
                 "trends": summary.get("trends", "N/A"),
                 "recommendations": summary.get("recommendations", "N/A")
             }
-        else:
-            return {
-                "experiments": "compressed",
-                "compressed_summary": str(summary)
-            }
-
-    # Filter invalid entries (no result or no hypothesis)
-    valid_experiments = [
-        exp for exp in experiment_log 
-        if exp.get("result") and exp.get("hypothesis")
-    ]
-    
-    if not valid_experiments:
         return {
-            "experiments": len(experiment_log),
-            "min_collapse_rate": 0.0,
-            "max_collapse_rate": 0.0,
-            "avg_collapse_rate": 0.0,
-            "last_collapse_rate": 0.0,
-            "last_K": 0.0,
-            "k_range": "0.00 - 0.00",
-            "theta_max_range": "0.00 - 0.00",
-            "entropy_debt_accumulated": 0.0,
-            "last_theta_max": 0.0,
-            "overall_trend": "none"
+            "experiments": "compressed",
+            "compressed_summary": str(summary)
         }
-    
-    # Extract collapse rates with defensive validation
-    collapse_rates = [
-        exp.get("result", {}).get("collapse_rate", 0.0) 
-        for exp in valid_experiments
-    ]
-    k_values = [
-        exp.get("hypothesis", {}).get("K", 0.0) 
-        for exp in valid_experiments
-    ]
-    theta_max_values = [
-        exp.get("full_parameters", {}).get("theta_max", 0.0) 
-        for exp in valid_experiments 
-        if exp.get("full_parameters")
-    ]
-    
-    # Calculate accumulated entropy debt (undissipated I - K)
-    entropy_debt = 0.0
-    for exp in valid_experiments:
-        I = exp.get("hypothesis", {}).get("I", 0.0)
-        K = exp.get("hypothesis", {}).get("K", 0.0)
-        collapse_rate = exp.get("result", {}).get("collapse_rate", 0.0)
-        if I > K:
-            entropy_debt += (I - K) * collapse_rate  # Weighted by collapse probability
 
-    # Summary statistics
+
+def _trend_label(prefix: Callable[[int], float], n: int) -> str:
+    """First half vs second half of the collapse rates, from prefix sums."""
+    half = n // 2
+    avg_first = prefix(half) / half
+    avg_second = (prefix(n) - prefix(half)) / (n - half)
+    delta = avg_first - avg_second
+    return (
+        "improving" if delta > 0.01
+        else "worsening" if delta < -0.01
+        else "stable"
+    )
+
+
+def _signal_from_columns(log: ExperimentLog) -> Dict:
+    """Same signal as build_llm_signal, computed on the columnar log."""
+    collapse_rates = log.column("collapse_rate")
+    k_values = log.column("K")
+    i_values = log.column("I")
+    theta_values = log.column("theta_max")
+    theta_values = theta_values[~np.isnan(theta_values)]
+
+    overloaded = i_values > k_values
+    entropy_debt = float(
+        ((i_values - k_values) * collapse_rates)[overloaded].sum()
+    )
+
     signal = {
-        "experiments": len(valid_experiments),
-        "min_collapse_rate": min(collapse_rates),
-        "max_collapse_rate": max(collapse_rates),
-        "avg_collapse_rate": sum(collapse_rates) / len(collapse_rates),
-        "last_collapse_rate": collapse_rates[-1],
-        "last_K": k_values[-1],
-        "k_range": f"{min(k_values):.2f} - {max(k_values):.2f}",
-        "theta_max_range": f"{min(theta_max_values) if theta_max_values else 0.0:.2f} - {max(theta_max_values) if theta_max_values else 0.0:.2f}",
+        "experiments": len(log),
+        "min_collapse_rate": float(collapse_rates.min()),
+        "max_collapse_rate": float(collapse_rates.max()),
+        "avg_collapse_rate": float(collapse_rates.mean()),
+        "last_collapse_rate": float(collapse_rates[-1]),
+        "last_K": float(k_values[-1]),
+        "k_range": f"{k_values.min():.2f} - {k_values.max():.2f}",
+        "theta_max_range": f"{theta_values.min() if theta_values.size else 0.0:.2f} - {theta_values.max() if theta_values.size else 0.0:.2f}",
         "entropy_debt_accumulated": entropy_debt,
-        "last_theta_max": theta_max_values[-1] if theta_max_values else 0.0
+        "last_theta_max": float(theta_values[-1]) if theta_values.size else 0.0
     }
 
-    # Overall trend
     if len(collapse_rates) >= 2:
-        first_half = collapse_rates[:len(collapse_rates)//2]
-        second_half = collapse_rates[len(collapse_rates)//2:]
-        avg_first = sum(first_half) / len(first_half)
-        avg_second = sum(second_half) / len(second_half)
-        delta = avg_first - avg_second
-        signal["overall_trend"] = (
-            "improving" if delta > 0.01
-            else "worsening" if delta < -0.01
-            else "stable"
-        )
+        prefix = np.concatenate(([0.0], np.cumsum(collapse_rates)))
+        signal["overall_trend"] = _trend_label(prefix.__getitem__, len(collapse_rates))
 
     return signal
+
+
+# ============================================================================
+# LOG COMPACTION
+# ============================================================================
+
+def compress_experiments(entries: List[Dict]) -> Dict:
+    """
+    Folds experiments (optionally starting with a previous compressed
+    entry) into the {"compressed": True, "summary": {...}} format that
+    build_llm_signal understands. The numeric running statistics travel
+    in summary["stats"] so later compactions and signals can merge them.
+    """
+    aggregator = TelemetryAggregator()
+    gaps = []
+    last = None
+    for exp in entries:
+        aggregator.ingest(exp)
+        if exp.get("result") and exp.get("hypothesis"):
+            result = exp["result"]
+            gaps.append(result.get("upper_ci95", 0.0) - result.get("collapse_rate", 0.0))
+            last = exp
+
+    previous = aggregator.compressed_summary if isinstance(aggregator.compressed_summary, dict) else {}
+    if last is None:
+        return {"compressed": True, "summary": previous or "Compressed"}
+
+    folded = aggregator.count
+    uncertainty = sum(gaps) / len(gaps)
+    if previous.get("stats", {}).get("count"):
+        previous_count = previous["stats"]["count"]
+        uncertainty = (
+            previous.get("system_uncertainty", 0.0) * previous_count + sum(gaps)
+        ) / (previous_count + len(gaps))
+
+    last_rate = last["result"].get("collapse_rate", 0.0)
+    last_K = last["hypothesis"].get("K", 0.0)
+    if last_rate < 0.05:
+        state = "ROBUST"
+        recommendation = f"Stability reached at K={last_K:.2f}; confirm before raising K further."
+    elif last_rate < 0.15:
+        state = "MARGINAL"
+        recommendation = f"Close to stability at K={last_K:.2f}; use small K increments (0.1-0.2 bits)."
+    else:
+        state = "FRAGILE"
+        recommendation = f"Still collapsing at K={last_K:.2f}; larger K increments (0.3-0.5 bits) are justified."
+
+    return {
+        "compressed": True,
+        "summary": {
+            "executive_summary": (
+                f"{folded} experiments folded (cycles up to {last.get('cycle', '?')}). "
+                f"Collapse rate ranged {aggregator.min_collapse:.1%} - {aggregator.max_collapse:.1%} "
+                f"for K in {aggregator.k_min:.2f} - {aggregator.k_max:.2f}; "
+                f"last phase {last.get('phase', 'Unknown')} with {last_rate:.1%} collapse."
+            ),
+            "accumulated_entropy_debt": aggregator.entropy_debt,
+            "system_uncertainty": uncertainty,
+            "current_state": state,
+            "trends": aggregator.trend(),
+            "recommendations": recommendation,
+            "stats": aggregator.to_state()
+        }
+    }
+
+
+def compact_log(log: ExperimentLog, keep_recent: int = 10) -> bool:
+    """
+    Folds every experiment except the last `keep_recent` into the log's
+    compressed summary. Returns True if anything was folded.
+    """
+    fold = len(log) - max(0, keep_recent)
+    if fold <= 0:
+        return False
+
+    entries = ([log.compressed] if log.compressed is not None else []) + log[:fold]
+    log.fold(fold, compress_experiments(entries))
+    return True
@@ -0,0 +1,146 @@
+import re
+
+from .agent import IsoEntropyAgent, RateLimiter
+from .cache import BoundedCache
+from .events import AuditEventType
+from .llm_backends import FakeLLMBackend, FakeLLMError
+
+AUDIT = ("Test system", "Medium (Seasonal)", "Medium (Standard)", 6)
+
+
+def _run(**options):
+    events = []
+    agent = IsoEntropyAgent(backend="fake", verbose=False, seed=3, max_iterations=30,
+                            rate_limiter=RateLimiter(max_rpm=60_000), on_event=events.append, **options)
+    agent.audit_system(*AUDIT)
+    return agent, events
+
+
+def _without_timestamp(report):
+    return re.sub(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "<time>", report)
+
+
+def _cycle_reaching(events, phase):
+    return next(e.data["cycle"] for e in events
+                if e.type == AuditEventType.FSM_TRANSITION and e.data["to_phase"] == phase)
+
+
+def test_speculative_candidates_reach_validate_in_fewer_iterations():
+    _, serial = _run()
+    agent, speculative = _run(speculative_candidates=4)
+
+    assert _cycle_reaching(speculative, "VALIDATE") < _cycle_reaching(serial, "VALIDATE")
+    batched = [e for e in speculative if e.type == AuditEventType.SIMULATION and "candidates" in e.data]
+    assert batched and all(len(e.data["candidates"]) == 4 for e in batched)
+    # The selected K is the one logged
+    assert batched[-1].data["K"] in [c["K"] for c in batched[-1].data["candidates"]]
+
+
+def test_warm_start_index_predicts_and_shortens_repeat_audits(tmp_path):
+    from .warm_start import WarmStartIndex
+
+    index = WarmStartIndex(str(tmp_path / "index.json"))
+    assert index.query(1.5, 2.0) is None
+    index.record(1.5, 2.0, K_min=2.5, upper_ci95=0.04, runs=1000)
+
+    hint = WarmStartIndex(str(tmp_path / "index.json")).query(1.6, 2.0)  # reloaded from disk
+    assert hint is not None and abs(hint.K_pred - 2.5 * 1.6 / 1.5) < 1e-9
+    assert WarmStartIndex(str(tmp_path / "index.json")).query(5.0, 2.0) is None
+
+    _, cold = _run()
+    _, warm = _run(warm_start=index)
+    simulations = lambda events: [e for e in events if e.type == AuditEventType.SIMULATION]
+    assert simulations(warm)[0].data["K"] == 2.4
+    assert len(simulations(warm)) < len(simulations(cold))
+
+    # A cold report in a shared cache is not served to a warm-started audit
+    reports = BoundedCache(max_entries=8)
+    _run(cache=reports)
+    _, warm = _run(cache=reports, warm_start=index)
+    assert simulations(warm) and reports.hits == 0
+
+
+def test_shared_simulation_cache_serves_identical_audits():
+    shared = BoundedCache(max_entries=64)
+    first, _ = _run(simulation_cache=shared)
+    second, _ = _run(simulation_cache=shared)
+
+    assert shared.hits == len(second.experiment_log) == len(first.experiment_log)
+    assert second.experiment_log.column("collapse_rate").tolist() == first.experiment_log.column("collapse_rate").tolist()
+
+
+def test_mock_report_ranks_simulated_mitigations():
+    events = []
+    agent = IsoEntropyAgent(mock_mode=True, verbose=False, seed=3, on_event=events.append, mitigation_runs=300)
+    report = agent.audit_system(*AUDIT)
+
+    evaluation = agent.mitigation_evaluation
+    assert f"### Action 1: {evaluation.options[0].name}" in report
+    assert "Emergency credit line" in report and "pp, 95% CI" in report
+    assert [e.data["runs"] for e in events if e.type == AuditEventType.MITIGATIONS] == [300]
+
+    plain = IsoEntropyAgent(mock_mode=True, verbose=False, mitigations=()).audit_system(*AUDIT)
+    assert "### Action 1: Increase Capacity (K)" in plain
+
+
+class _KindRecorder(FakeLLMBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.kinds = []
+
+    def generate(self, prompt, kind="report"):
+        self.kinds.append(kind)
+        return super().generate(prompt, kind)
+
+    def stream(self, prompt, kind="report"):
+        self.kinds.append(kind)
+        return super().stream(prompt, kind)
+
+
+def test_retries_keep_the_model_kind_after_a_429():
+    for streaming in (False, True):
+        backend = _KindRecorder(responses=[FakeLLMError(429, "RESOURCE_EXHAUSTED"), "SCRIPTED REPORT"])
+        agent = IsoEntropyAgent(backend=backend, verbose=False, seed=1, max_iterations=3,
+                                rate_limiter=RateLimiter(max_rpm=60_000), backoff_base_s=0.01)
+        run = agent.audit_system_stream if streaming else agent.audit_system
+        assert "SCRIPTED REPORT" in "".join(run(*AUDIT))
+
+        assert len(backend.kinds) == 2
+        assert len(set(backend.kinds)) == 1 and backend.kinds[0] in ("report", "phase")
+
+
+def test_streamed_report_equals_the_generated_report():
+    options = dict(verbose=False, seed=3, max_iterations=30, rate_limiter=RateLimiter(max_rpm=60_000))
+    report = IsoEntropyAgent(backend=FakeLLMBackend(chunks=5), **options).audit_system(*AUDIT)
+    chunks = list(IsoEntropyAgent(backend=FakeLLMBackend(chunks=5), **options).audit_system_stream(*AUDIT))
+
+    assert len(chunks) > 1 and all(chunks)
+    assert _without_timestamp("".join(chunks)) == _without_timestamp(report)
+
+
+def test_events_follow_the_audit_order():
+    _, events = _run()
+    types = [e.type for e in events]
+    first = types.index
+
+    assert types[0] == AuditEventType.GROUNDED
+    assert types[-1] == AuditEventType.AUDIT_COMPLETE and types.count(AuditEventType.AUDIT_COMPLETE) == 1
+    assert first(AuditEventType.GROUNDED) < first(AuditEventType.SIMULATION) < first(AuditEventType.FSM_TRANSITION)
+    assert first(AuditEventType.FSM_TRANSITION) < first(AuditEventType.LLM_START) < first(AuditEventType.LLM_FINISH)
+
+    cycles = [e.data["cycle"] for e in events if e.type == AuditEventType.SIMULATION]
+    assert cycles == sorted(cycles)
+    assert [e.timestamp for e in events] == sorted(e.timestamp for e in events)
+
+
+def test_a_reused_agent_starts_each_audit_fresh():
+    agent, _ = _run()
+    first = len(agent.experiment_log)
+    assert first and agent.fsm.phase_name() == "CONCLUDE"
+
+    events = []
+    agent.subscribe(events.append)
+    agent.audit_system("Other system", "High (Chaotic)", "High (Manual/Bureaucratic)", 3)
+    simulations = [e for e in events if e.type == AuditEventType.SIMULATION]
+    assert simulations and len(agent.experiment_log) == len(simulations)
+    assert simulations[0].data["cycle"] == 1
@@ -0,0 +1,29 @@
+import numpy as np
+
+from .agent import IsoEntropyAgent, RateLimiter
+from .calibration import calibrate, fit_series
+
+
+def _weekly(mean, volatility, weeks, seed):
+    return np.maximum(0.01, mean + mean * volatility * np.random.default_rng(seed).standard_normal(weeks))
+
+
+def test_posterior_recovers_parameters_including_floored_weeks():
+    calibration = calibrate(_weekly(1.8, 0.35, 400, 1), _weekly(2.1, 0.1, 400, 2))
+    summary = calibration.summary()
+    for name, truth in (("I", 1.8), ("volatility_i", 0.35), ("K", 2.1), ("volatility_k", 0.1)):
+        assert summary[name]["low"] - 0.02 <= truth <= summary[name]["high"] + 0.02, name
+
+    floored = fit_series(_weekly(0.3, 1.2, 2000, 3), "I")   # ~20% of weeks at the floor
+    assert abs(floored.mean - 0.3) < 0.05 and abs(floored.volatility - 1.2) < 0.15
+
+
+def test_agent_simulates_with_calibrated_parameters():
+    calibration = calibrate(_weekly(1.8, 0.35, 200, 1), _weekly(2.1, 0.1, 200, 2))
+    agent = IsoEntropyAgent(backend="fake", verbose=False, seed=3, rate_limiter=RateLimiter(max_rpm=60_000),
+                            calibration=calibration)
+    agent.audit_system("Test system", "Medium (Seasonal)", "Medium (Standard)", 6)
+
+    assert agent.experiment_log.column("I")[0] == calibration.I
+    assert agent.experiment_log.column("K")[0] == calibration.K
+    assert (agent.volatility_i, agent.volatility_k) == (calibration.volatility_i, calibration.volatility_k)
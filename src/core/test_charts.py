@@ -0,0 +1,23 @@
+import numpy as np
+
+from .charts import downsample_indices, fan_chart
+
+
+def test_fan_chart_payload_does_not_grow_with_runs():
+    small = fan_chart(1.5, 2.2, 2.0, runs=200, time_steps=520, seed=1, max_points=100)
+    large = fan_chart(1.5, 2.2, 2.0, runs=5000, time_steps=520, seed=1, max_points=100)
+
+    assert len(small["week"]) == len(large["week"]) <= 101
+    assert len(large["histogram"]["collapses"]) <= 26
+    assert large["histogram"]["collapses"].sum() + large["histogram"]["survivors"] == 5000
+    bands = large["bands"]
+    assert np.all(bands["p05"] <= bands["p50"]) and np.all(bands["p50"] <= bands["p95"])
+
+
+def test_downsampling_keeps_endpoints_and_spikes():
+    values = np.zeros(10_000)
+    values[4321] = 1.0
+    index = downsample_indices(values, max_points=50)
+
+    assert len(index) <= 50
+    assert index[0] == 0 and index[-1] == 9_999 and 4321 in index
@@ -0,0 +1,33 @@
+import random
+
+import numpy as np
+import pytest
+from .engine import get_engine, run_simulation_vectorized, simulate_paths
+from .physics import run_simulation
+
+
+def test_vectorized_matches_reference_statistics():
+    args = dict(I=1.5, K=1.7, theta_max=2.0, runs=4000)
+    reference = run_simulation(**args, rng=random.Random(0))
+    vectorized = run_simulation_vectorized(**args, seed=0)
+
+    assert set(vectorized) == set(reference)
+    assert vectorized["collapse_rate"] == pytest.approx(reference["collapse_rate"], abs=0.03)
+    assert vectorized["informational_insolvency"] == pytest.approx(reference["informational_insolvency"], rel=0.02)
+
+
+def test_seed_is_reproducible_and_engines_are_registered():
+    assert run_simulation_vectorized(1.5, 1.6, 2.0, seed=3) == run_simulation_vectorized(1.5, 1.6, 2.0, seed=3)
+    assert get_engine("python")(1.5, 1.6, 2.0, runs=50, seed=3) == get_engine("python")(1.5, 1.6, 2.0, runs=50, seed=3)
+    with pytest.raises(ValueError):
+        get_engine("fortran")
+
+
+def test_common_random_numbers_are_monotone_in_k():
+    rng = np.random.default_rng(1)
+    normals = tuple(rng.standard_normal((2, 52, 1000)))
+    rates = [
+        simulate_paths(1.5, k, 2.0, n_paths=1000, normals=normals)["collapsed"].mean()
+        for k in (1.4, 1.7, 2.0)
+    ]
+    assert rates[0] >= rates[1] >= rates[2]
@@ -0,0 +1,137 @@
+import json
+
+import numpy as np
+import pytest
+from .experiment_log import ExperimentLog
+from .telemetry import build_llm_signal, compact_log, TelemetryAggregator
+
+
+def _legacy_log():
+    rates = [0.9, 0.6, 0.3, 0.04, 0.02]
+    log = []
+    for cycle, rate in enumerate(rates, start=1):
+        log.append({
+            "cycle": cycle,
+            "phase": "ORIENT" if rate > 0.05 else "VALIDATE",
+            "hypothesis": {"I": 1.5, "K": 1.3 + 0.2 * cycle},
+            "result": {
+                "collapse_rate": rate,
+                "upper_ci95": rate + 0.02,
+                "total_collapses": int(rate * 500),
+                "runs": 500,
+                "trajectory": [0.1 * cycle, 0.2 * cycle]
+            },
+            "full_parameters": {"theta_max": 2.0}
+        })
+    return log
+
+
+def test_dict_views_round_trip():
+    legacy = _legacy_log()
+    log = ExperimentLog(capacity=2)  # forces growth
+    for exp in legacy:
+        log.append(exp)
+
+    assert len(log) == len(legacy)
+    assert log.to_list() == legacy
+    assert log[-1]["result"]["trajectory"] == legacy[-1]["result"]["trajectory"]
+    assert [exp["cycle"] for exp in log] == [1, 2, 3, 4, 5]
+
+
+def test_signal_matches_legacy_list():
+    legacy = _legacy_log()
+    log = ExperimentLog()
+    for exp in legacy:
+        log.append(exp)
+
+    expected = build_llm_signal(legacy)
+    signal = build_llm_signal(log)
+    assert signal.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert signal[key] == pytest.approx(value)
+        else:
+            assert signal[key] == value
+
+
+def test_dataframe_shares_memory():
+    log = ExperimentLog()
+    for exp in _legacy_log():
+        log.append(exp)
+
+    df = log.to_dataframe()
+    assert list(df["phase"]) == log.phase_names()
+    assert np.shares_memory(df["K"].to_numpy(), log.column("K"))
+
+
+def test_aggregator_matches_batch_signal():
+    legacy = _legacy_log()
+    aggregator = TelemetryAggregator()
+    for exp in legacy:
+        aggregator.ingest(exp)
+        log = legacy[:exp["cycle"]]
+        expected = build_llm_signal(_columnar(log))
+        signal = aggregator.signal()
+        assert signal.keys() == expected.keys()
+        for key, value in expected.items():
+            assert signal[key] == (pytest.approx(value) if isinstance(value, float) else value)
+
+
+def test_aggregator_compressed_entry():
+    compressed = [{"compressed": True, "summary": {"executive_summary": "ok", "trends": "flat"}}]
+    aggregator = TelemetryAggregator()
+    aggregator.ingest(compressed[0])
+    assert aggregator.signal() == build_llm_signal(compressed)
+    assert aggregator.signal()["compressed_summary"] == "ok"
+
+
+def _columnar(entries):
+    log = ExperimentLog()
+    for exp in entries:
+        log.append(exp)
+    return log
+
+
+def test_compaction_keeps_recent_window_and_signal_stats():
+    entries = _legacy_log() * 4
+    for cycle, exp in enumerate(entries, start=1):
+        exp = dict(exp, cycle=cycle)
+        entries[cycle - 1] = exp
+    log = _columnar(entries)
+
+    assert compact_log(log, keep_recent=5)
+    assert compact_log(log, keep_recent=3)  # second fold merges the first summary
+    assert len(log) == 3
+    assert log.folded_rows == len(entries) - 3
+    assert [exp["cycle"] for exp in log] == [18, 19, 20]
+    assert log.trajectory(0) == entries[17]["result"]["trajectory"]
+
+    head = log.to_list()[0]
+    assert head["compressed"] is True
+    assert head["summary"]["stats"]["count"] == len(entries) - 3
+
+    expected = build_llm_signal(entries)
+    signal = build_llm_signal(log)
+    assert signal["experiments"] == expected["experiments"]
+    assert signal["compressed_experiments"] == len(entries) - 3
+    for key in ("min_collapse_rate", "max_collapse_rate", "avg_collapse_rate",
+                "entropy_debt_accumulated", "last_K"):
+        assert signal[key] == pytest.approx(expected[key])
+    assert signal["k_range"] == expected["k_range"]
+
+
+def test_compacted_summary_is_strict_json():
+    entries = _legacy_log() * 3
+    for exp in entries:
+        exp.pop("full_parameters", None)  # No θ_max: its extrema stay unset
+    log = _columnar(entries)
+    assert compact_log(log, keep_recent=2)
+
+    head = log.to_list()[0]
+    stats = head["summary"]["stats"]
+    assert stats["theta_min"] is None and stats["theta_max"] is None
+    restored = json.loads(json.dumps(head, allow_nan=False))
+
+    signal = build_llm_signal([restored] + log.to_list()[1:])
+    assert signal["theta_max_range"] == build_llm_signal(entries)["theta_max_range"]
+    assert signal["min_collapse_rate"] == pytest.approx(build_llm_signal(entries)["min_collapse_rate"])
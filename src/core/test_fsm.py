@@ -0,0 +1,48 @@
+import pytest
+from .fsm import AgentPhase, IsoEntropyFSM
+
+
+def _feed(fsm, batches, K=2.0):
+    for collapses, runs in batches:
+        fsm.update(collapses / runs, None, collapses=collapses, runs=runs, K=K)
+
+
+def test_pooled_validation_accepts_clean_evidence_with_fewer_runs():
+    fsm = IsoEntropyFSM(validation_mode="pooled")
+    _feed(fsm, [(10, 500), (4, 250)])
+    assert fsm.phase == AgentPhase.STRESS
+    assert fsm.pool_runs == 250 and fsm.sprt_decision == "stable"
+
+
+def test_selecting_batch_is_not_pooled():
+    fsm = IsoEntropyFSM(validation_mode="pooled")
+    _feed(fsm, [(0, 500)])  # Looks perfect, but only selected K
+    assert fsm.phase == AgentPhase.VALIDATE
+    assert fsm.pool_K == 2.0 and fsm.pool_runs == 0 and fsm.sprt() == "continue"
+
+    _feed(fsm, [(13, 250)])  # 5.2% on fresh runs
+    assert fsm.phase == AgentPhase.ORIENT and fsm.sprt_decision == "unstable"
+
+
+def test_pooled_validation_rejects_and_resets():
+    fsm = IsoEntropyFSM(validation_mode="pooled")
+    _feed(fsm, [(24, 500), (25, 250)])
+    assert fsm.phase == AgentPhase.ORIENT
+    assert fsm.sprt_decision == "unstable"
+
+
+def test_pooled_validation_is_truncated_and_journaled():
+    fsm = IsoEntropyFSM(validation_mode="pooled", max_pooled_runs=1000)
+    _feed(fsm, [(17, 500)])  # 3.4%: SPRT undecided
+    _feed(fsm, [(8, 250)])
+    assert fsm.phase == AgentPhase.VALIDATE and fsm.sprt() == "continue"
+
+    restored = IsoEntropyFSM(validation_mode="pooled", max_pooled_runs=1000)
+    restored.load_state(fsm.to_state())
+    _feed(restored, [(9, 250)] * 3)  # reaches the cap: pooled Wilson UB decides
+    assert restored.pool_runs == 1000 and restored.sprt_decision in ("stable", "unstable")
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        IsoEntropyFSM(validation_mode="bayesian")
@@ -0,0 +1,43 @@
+import threading
+
+import pytest
+
+from .jobs import DONE, FAILED, JobRunner, QueueFullError
+
+
+def _blocked_runner(max_queued: int = 16):
+    """Single worker held busy by a first job until the returned event is set."""
+    runner = JobRunner(workers=1, max_queued=max_queued)
+    release, started = threading.Event(), threading.Event()
+    blocker = runner.submit("blocker", lambda job: (started.set(), release.wait()))
+    started.wait(timeout=5)
+    return runner, release, blocker
+
+
+def test_sessions_are_served_round_robin():
+    runner, release, _ = _blocked_runner()
+    order = []
+    jobs = [runner.submit("a", lambda job, n=n: order.append(f"a{n}")) for n in range(3)]
+    jobs.append(runner.submit("b", lambda job: order.append("b0")))
+
+    assert runner.position(jobs[-1].id) == 1  # b does not wait behind all of a's jobs
+    release.set()
+    for job in jobs:
+        while not job.done:
+            threading.Event().wait(0.01)
+    runner.shutdown()
+    assert order == ["a0", "b0", "a1", "a2"]
+
+
+def test_queue_is_bounded_and_failures_are_reported():
+    runner, release, blocker = _blocked_runner(max_queued=1)
+    failing = runner.submit("a", lambda job: 1 / 0)
+    with pytest.raises(QueueFullError):
+        runner.submit("b", lambda job: None)
+
+    release.set()
+    while not failing.done:
+        threading.Event().wait(0.01)
+    runner.shutdown()
+    assert blocker.status == DONE
+    assert failing.status == FAILED and "ZeroDivisionError" in failing.error
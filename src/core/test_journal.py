@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+from .agent import IsoEntropyAgent, RateLimiter
+from .events import AuditEventType
+from .journal import AuditJournal
+
+AUDIT = ("Test system", "Medium (Seasonal)", "Medium (Standard)", 6)
+
+
+class _Killed(Exception):
+    pass
+
+
+def _agent(tmp_path, events=None):
+    return IsoEntropyAgent(backend="fake", verbose=False, seed=5, max_iterations=30,
+                           rate_limiter=RateLimiter(max_rpm=60_000), journal_dir=str(tmp_path),
+                           on_event=events.append if events is not None else None)
+
+
+def _without_timestamp(report):
+    return re.sub(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "<time>", report)
+
+
+def test_killed_audit_resumes_to_the_uninterrupted_result(tmp_path):
+    reference = _agent(tmp_path / "reference")
+    expected = reference.audit_system(*AUDIT)
+
+    # Kill the audit during its fourth simulation
+    killed = _agent(tmp_path)
+    simulate, calls = killed._simulate, []
+
+    def dying(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 4:
+            raise _Killed()
+        return simulate(*args, **kwargs)
+
+    killed._simulate = dying
+    with pytest.raises(_Killed):
+        killed.audit_system(*AUDIT, audit_id="crash")
+    checkpoint = AuditJournal.for_audit("crash", str(tmp_path)).checkpoint()
+    assert len(checkpoint["experiments"]) == 3 and checkpoint["report"] is None
+
+    # A fresh process resumes from the journal (RNG state included)
+    events = []
+    resumed = _agent(tmp_path, events)
+    report = resumed.audit_system(*AUDIT, audit_id="crash")
+
+    assert _without_timestamp(report) == _without_timestamp(expected)
+    assert resumed.experiment_log.column("K").tolist() == reference.experiment_log.column("K").tolist()
+    assert (resumed.experiment_log.column("collapse_rate").tolist()
+            == reference.experiment_log.column("collapse_rate").tolist())
+    assert resumed.rng.getstate() == reference.rng.getstate()
+    simulations = [e for e in events if e.type == AuditEventType.SIMULATION]
+    assert len(simulations) == len(reference.experiment_log) - 3
+
+    # A finished journal replays its stored report without simulating
+    events = []
+    assert _agent(tmp_path, events).audit_system(*AUDIT, audit_id="crash") == report
+    assert not [e for e in events if e.type == AuditEventType.SIMULATION]
+    assert events[-1].data["cached"] is True
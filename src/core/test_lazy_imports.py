@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY = ("google.genai", "pandas")
+
+
+def _loaded_after(statement):
+    # A fresh interpreter: this test process has already imported everything
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {HEAVY!r} + ('src.core.agent',) if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_core_package_import_is_light():
+    assert _loaded_after("import src.core") == []
+    assert _loaded_after("from src.core import run_simulation") == []
+
+
+def test_agent_defers_the_gemini_sdk():
+    assert _loaded_after("import src.core.agent") == ["src.core.agent"]
+    assert "src.core.agent" in _loaded_after("import src.core; src.core.IsoEntropyAgent")
@@ -0,0 +1,55 @@
+import pytest
+
+from .agent import IsoEntropyAgent, RateLimiter
+from .events import AuditEventType
+from .llm_backends import FakeLLMBackend, FakeLLMError, LLMBackend, get_backend
+
+AUDIT = ("Test system", "Medium (Seasonal)", "Medium (Standard)", 6)
+
+
+def _agent(backend, **options):
+    events = []
+    agent = IsoEntropyAgent(
+        backend=backend, verbose=False, seed=1, max_iterations=3,
+        rate_limiter=RateLimiter(max_rpm=60_000), backoff_base_s=0.01, min_attempt_s=0.05,
+        on_event=events.append, **options
+    )
+    return agent, events
+
+
+def test_fake_backend_drives_retries_through_the_agent():
+    backend = FakeLLMBackend(responses=[FakeLLMError(429, "RESOURCE_EXHAUSTED"), "SCRIPTED REPORT"])
+    agent, events = _agent(backend)
+
+    report = agent.audit_system(*AUDIT)
+
+    assert "SCRIPTED REPORT" in report
+    assert backend.calls == 2
+    assert [e.type for e in events].count(AuditEventType.LLM_RETRY) == 1
+
+
+def test_injected_timeouts_fall_back_to_local_report_on_time():
+    backend = FakeLLMBackend(rate_timeout=1.0, hang_s=5.0, seed=0)
+    agent, events = _agent(backend, deadline_s=1.0, llm_timeout_s=0.3)
+
+    report = "".join(agent.audit_system_stream(*AUDIT))
+
+    assert "local statistical report" in report
+    assert events[-1].data["fallback"] in ("deadline", "retries_exhausted")
+    assert backend.injected_timeouts >= 1
+
+
+def test_backend_registry():
+    assert isinstance(get_backend("fake", seed=1), FakeLLMBackend)
+    assert get_backend("fake").model_for("phase") == "fake-phase"
+
+
+def test_a_backend_without_generate_fails_at_construction():
+    class Incomplete(LLMBackend):
+        name = "incomplete"
+
+        def stream(self, prompt, kind="report"):
+            yield "chunk"
+
+    with pytest.raises(TypeError, match="generate"):
+        Incomplete()
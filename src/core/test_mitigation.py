@@ -0,0 +1,41 @@
+from .grounding import ground_inputs
+from .mitigation import Intervention, evaluate_mitigations
+from .physics import calculate_collapse_threshold
+
+PARAMS = ground_inputs("Medium (Seasonal)", "Medium (Standard)", 6)
+
+
+def test_paired_deltas_are_exact_for_no_op_and_ranked():
+    noop = Intervention("No-op", "Nothing changes", scale={"K": 1.0})
+    evaluation = evaluate_mitigations(PARAMS, K=1.9, interventions=(
+        noop,
+        Intervention("More capacity", "K +25%", scale={"K": 1.25}),
+        Intervention("More stock", "Stock +0.25", shift={"stock": 0.25}),
+    ), runs=400, seed=1)
+
+    by_name = {option.name: option for option in evaluation.options}
+    assert by_name["No-op"].delta_collapse == 0.0
+    assert by_name["No-op"].delta_collapse_ci == (0.0, 0.0)
+    assert [option.name for option in evaluation.options][0] == "More capacity"
+    assert by_name["More stock"].params["theta_max"] > evaluation.baseline["theta_max"]
+    deltas = [option.delta_collapse for option in evaluation.options]
+    assert deltas == sorted(deltas)
+
+
+def test_stock_stays_within_the_grounding_range():
+    full = dict(PARAMS, theta_max=2.0, stock=0.9)
+    changed = Intervention("More stock", "Stock +0.25", shift={"stock": 0.25}).apply(full)
+    assert changed["stock"] == 1.0
+    gain = (calculate_collapse_threshold(1.0, full["capital"], full["liquidity"])
+            - calculate_collapse_threshold(0.9, full["capital"], full["liquidity"]))
+    assert abs(changed["theta_max"] - (full["theta_max"] + gain)) < 1e-12
+
+
+def test_pairing_beats_independent_estimates():
+    evaluation = evaluate_mitigations(PARAMS, K=1.9, runs=1000, seed=2)
+    for option in evaluation.options:
+        low, high = option.delta_collapse_ci
+        assert low <= option.delta_collapse <= high
+        assert (high - low) / 2 <= 1.96 * option.independent_se + 1e-12
+    assert evaluation.options[0].significant
+    assert "| 1 |" in evaluation.to_markdown()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from .engine import simulate_paths
+from .monitor import COLLAPSED, CRITICAL, EntropyMonitor, collapse_table
+
+
+def test_table_matches_monte_carlo_from_zero_debt():
+    for horizon in (13, 52):
+        table = collapse_table(1.5, 2.0, 2.0, horizon)
+        paths = simulate_paths(1.5, 2.0, 2.0, n_paths=20000, time_steps=horizon, rng=np.random.default_rng(0))
+        assert abs(table[horizon, 0] - paths["collapsed"].mean()) < 0.015
+        assert np.all(np.diff(table[horizon]) >= -1e-12)   # More debt, more risk
+
+
+def test_single_and_vectorized_updates_agree_and_alert():
+    rng = np.random.default_rng(3)
+    I_obs, K_obs = rng.normal(2.1, 0.3, (30, 4)), rng.normal(2.0, 0.2, (30, 4))
+    alerts = []
+    single = EntropyMonitor(horizon=8, on_alert=alerts.append)
+    batch = EntropyMonitor(horizon=8)
+    for monitor in (single, batch):
+        monitor.add_units(["a", "b", "c", "d"], I=1.5, K=2.0, theta_max=[1.0, 2.0, 3.0, 4.0])
+
+    for week in range(30):
+        for i, unit in enumerate(single.ids):
+            single.observe(unit, I_obs[week, i], K_obs[week, i])
+        batch.observe_all(I_obs[week], K_obs[week])
+
+    np.testing.assert_allclose(single.debt, batch.debt)
+    np.testing.assert_allclose(single.probability, batch.probability)
+    assert single.at_level(COLLAPSED) == batch.at_level(COLLAPSED)
+    assert "a" in single.at_level(COLLAPSED)
+    assert any(alert.unit == "a" and alert.level == COLLAPSED for alert in alerts)
+    assert all(alert.level != alert.previous for alert in alerts)
+    assert single.status("a")["level"] in (COLLAPSED, CRITICAL)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from .engine import run_simulation_vectorized
+from .network import Network, simulate_network
+
+NO_EDGES = (np.array([], dtype=int), np.array([], dtype=int), np.array([]))
+
+
+def test_uncoupled_nodes_match_the_single_node_engine():
+    I, K, theta_max = [1.5, 1.5], [2.2, 2.0], [2.0, 2.0]
+    result = simulate_network(Network.from_coupling(I, K, theta_max, NO_EDGES), runs=3000, seed=1)
+
+    for node in range(2):
+        single = run_simulation_vectorized(I[node], K[node], theta_max[node], runs=3000, seed=2)
+        assert abs(result["node_collapse"][node] - single["collapse_rate"]) < 0.05
+    assert result["node_induced"].sum() == 0
+
+
+def test_overflow_cascades_down_a_chain():
+    coupling = np.zeros((3, 3))
+    coupling[0, 1] = coupling[1, 2] = 0.5
+    I, K, theta_max = [5.0, 1.0, 1.0], [1.0, 2.0, 2.0], [2.0, 2.0, 2.0]
+
+    alone = simulate_network(Network.from_coupling(I, K, theta_max, np.zeros((3, 3))), runs=500, seed=1)
+    chained = simulate_network(Network.from_coupling(I, K, theta_max, coupling), runs=500, seed=1)
+
+    assert alone["node_collapse"].tolist() == [1.0, 0.0, 0.0]
+    assert chained["node_collapse"].tolist() == [1.0, 1.0, 1.0]
+    assert chained["cascade_size"] == 3.0
+    assert np.all(np.diff(chained["mean_collapse_week"]) > 0)   # Upstream first
+
+
+def test_coupling_cannot_create_entropy():
+    with pytest.raises(ValueError):
+        Network.from_coupling([1, 1], [1, 1], [2, 2], np.array([[0, 1.5], [0, 0]]))
@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+
+from .constraints import apply_hard_rules
+from .grounding import ground_inputs
+from .physics import calculate_collapse_threshold
+from .portfolio import ground_portfolio
+
+VOLATILITIES = ["Low (Stable)", "Medium (Seasonal)", "High (Chaotic)", "Unknown"]
+RIGIDITIES = ["Low (Automated)", "Medium (Standard)", "High (Manual/Bureaucratic)", "Other"]
+BUFFERS = [0, 1, 2.5, 6, 13, 24, 36]
+FLAGS = ("critical_structural_warning", "marginal_situation", "low_liquidity_penalty")
+
+
+def _scalar(volatility, rigidity, buffer_months, K=None):
+    params = ground_inputs(volatility, rigidity, buffer_months)
+    params["theta_max"] = calculate_collapse_threshold(params["stock"], params["capital"], params["liquidity"])
+    if K is not None:
+        params["K"] = K
+    return apply_hard_rules(volatility=volatility, rigidity=rigidity, buffer_months=buffer_months, params=params)
+
+
+def test_portfolio_matches_scalar_grounding_exactly():
+    units = list(itertools.product(VOLATILITIES, RIGIDITIES, BUFFERS))
+    K = np.linspace(0.0, 12.0, len(units))
+    columns = {name: [unit[i] for unit in units] for i, name in enumerate(("volatility", "rigidity", "buffer_months"))}
+
+    for capacities in (None, K):
+        grounded = ground_portfolio(columns, K=capacities)
+        for row, unit in enumerate(units):
+            expected = _scalar(*unit, K=None if capacities is None else float(K[row]))
+            for name in ("I", "K0", "K", "stock", "liquidity", "capital", "theta_max"):
+                assert grounded[name][row] == expected[name], (unit, name)
+            for flag in FLAGS:
+                assert bool(grounded[flag][row]) == expected.get(flag, False), (unit, flag)
+
+
+def test_portfolio_grounding_does_not_modify_inputs():
+    columns = {"volatility": ["High (Chaotic)"], "rigidity": ["Low (Automated)"], "buffer_months": [6]}
+    K = np.array([20.0])
+    ground_portfolio(columns, K=K)
+    assert K[0] == 20.0 and columns["buffer_months"] == [6]
@@ -0,0 +1,62 @@
+import random
+import time
+
+import pytest
+from .retry import (FATAL, RETRIABLE, LLMTimeoutError, backoff_delay, call_with_timeout,
+                    classify_llm_error, is_quota_error)
+
+
+class _APIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def test_classification():
+    assert classify_llm_error(Exception("429 RESOURCE_EXHAUSTED")) == RETRIABLE
+    assert classify_llm_error(TimeoutError()) == RETRIABLE
+    assert classify_llm_error(_APIError(503)) == RETRIABLE
+    assert classify_llm_error(_APIError(400)) == FATAL
+    assert classify_llm_error(ValueError("bad prompt")) == FATAL
+    assert classify_llm_error(Exception("503 UNAVAILABLE. The model is overloaded")) == RETRIABLE
+    assert classify_llm_error(RuntimeError("HTTP 502 Bad Gateway")) == RETRIABLE
+
+
+class TimeoutException(Exception):  # Named like httpx's, which does not subclass TimeoutError
+    pass
+
+
+class _ClientReadTimeout(TimeoutException):
+    pass
+
+
+def test_only_whole_status_tokens_and_transient_types_retry():
+    assert classify_llm_error(_ClientReadTimeout("read")) == RETRIABLE
+    assert classify_llm_error(ConnectionResetError()) == RETRIABLE
+
+    for fatal in (ValueError("max tokens 5000 exceeded"),
+                  ValueError("invalid 'timeout' field in generation config"),
+                  KeyError("connection_id"),
+                  RuntimeError("INTERNAL_ID missing"),
+                  ValueError("prompt of 4290 tokens rejected"),
+                  ValueError("request body of 504 KB is too large")):
+        assert classify_llm_error(fatal) == FATAL, fatal
+
+    assert is_quota_error(Exception("429 RESOURCE_EXHAUSTED"))
+    assert not is_quota_error(ValueError("max tokens 14290 exceeded"))
+
+
+def test_backoff_is_jittered_capped_and_floored():
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, base_s=1.0, max_s=8.0, rng=rng) for attempt in range(1, 7)]
+    assert all(0.5 <= d <= 8.0 for d in delays)
+    assert delays[-1] >= 4.0  # capped at 8, jitter keeps at least half
+    assert backoff_delay(1, base_s=1.0, floor_s=12.0) == 12.0
+
+
+def test_call_with_timeout():
+    assert call_with_timeout(lambda: 42, 1.0) == 42
+    started = time.monotonic()
+    with pytest.raises(LLMTimeoutError):
+        call_with_timeout(lambda: time.sleep(2), 0.1)
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,44 @@
+import numpy as np
+
+from .screening import BOUND, FULL, SMALL, collapse_bounds, count_collapses, screen, screen_portfolio
+
+
+def test_bounds_contain_simulated_collapse_rates():
+    rng = np.random.default_rng(1)
+    I = rng.uniform(0.5, 6, 60)
+    K = I * rng.uniform(0.4, 3.0, 60)
+    theta_max = rng.uniform(1.5, 3.2, 60)
+
+    lower, upper = collapse_bounds(I, K, theta_max)
+    rate = count_collapses(I, K, theta_max, 2000, rng=np.random.default_rng(2)) / 2000
+    slack = 4 * np.sqrt(rate * (1 - rate) / 2000) + 1e-3
+    assert np.all(rate <= upper + slack) and np.all(rate >= lower - slack)
+
+
+def test_only_undecided_units_escalate():
+    K = np.linspace(1.0, 3.0, 21)  # Capacity sweep across the threshold at I = 1.5
+    result = screen(np.full(21, 1.5), K, np.full(21, 2.0), small_runs=200, full_runs=5000, seed=4)
+
+    assert set(result.tier) == {BOUND, SMALL, FULL}
+    assert np.all(result.runs[result.tier == BOUND] == 0) and np.isnan(result.collapse_rate[result.tier == BOUND]).all()
+    assert np.all(result.runs[result.tier == SMALL] == 200) and np.all(result.runs[result.tier == FULL] == 5000)
+    assert np.all(result.lower <= result.upper)
+    assert np.all(result.at_risk[:-1] >= result.at_risk[1:])  # More capacity never adds risk
+
+    again = screen(np.full(21, 1.5), K, np.full(21, 2.0), small_runs=200, full_runs=5000, seed=4)
+    assert np.array_equal(again.collapse_rate, result.collapse_rate, equal_nan=True)
+
+
+def test_screening_simulates_a_fraction_of_the_portfolio():
+    units = {
+        "volatility": ["Low (Stable)", "High (Chaotic)", "Medium (Seasonal)"] * 50,
+        "rigidity": ["Low (Automated)", "High (Manual/Bureaucratic)", "Medium (Standard)"] * 50,
+        "buffer_months": [12, 3, 6] * 50,
+    }
+    result = screen_portfolio(units, seed=0)
+    table = result.table()
+
+    assert result.cost()["fraction"] < 0.1
+    assert np.all(result.tier[0::3] == BOUND) and not result.at_risk[0::3].any()   # K ≫ I
+    assert np.all(result.tier[1::3] == BOUND) and result.at_risk[1::3].all()       # I ≫ 2K
+    assert list(table["risk"]) == sorted(table["risk"], reverse=True)
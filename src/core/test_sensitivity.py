@@ -0,0 +1,29 @@
+import numpy as np
+
+from .sensitivity import PARAMETERS, default_bounds, sensitivity_for, sobol_indices
+
+
+def test_single_varying_parameter_explains_everything():
+    bounds = {name: (value, value) for name, (value, _) in default_bounds(
+        {"I": 1.5, "K0": 1.8, "stock": 0.25, "capital": 1.0, "liquidity": 0.6}, spread=0.0).items()}
+    bounds["K"] = (1.4, 2.4)
+    result = sobol_indices(bounds, n=256, paths=32, seed=1)
+
+    k = PARAMETERS.index("K")
+    for output in ("collapse_rate", "collapse_week"):
+        assert abs(result.first[output][k] - 1.0) < 0.1
+        assert abs(result.total[output][k] - 1.0) < 0.1
+        assert np.all(result.total[output][np.arange(len(PARAMETERS)) != k] == 0)
+        assert result.ranking(output)[0] == "K"
+
+
+def test_workers_reproduce_serial_result_and_report_convergence():
+    options = dict(n=64, paths=16, bootstrap=50, checkpoints=3, seed=4)
+    serial = sensitivity_for("Medium (Seasonal)", "Medium (Standard)", 6, **options)
+    parallel = sensitivity_for("Medium (Seasonal)", "Medium (Standard)", 6, workers=2, **options)
+
+    np.testing.assert_array_equal(serial.total["collapse_rate"], parallel.total["collapse_rate"])
+    assert [point["n"] for point in serial.convergence["collapse_rate"]] == [16, 32, 64]
+    low, high = serial.total_ci["collapse_week"].T
+    assert np.all(low <= high)
+    assert serial.evaluations == 64 * (len(PARAMETERS) + 2) * 16
@@ -0,0 +1,15 @@
+from .what_if import explore
+
+
+def test_survival_curve_matches_collapse_rate():
+    estimate = explore("Medium (Seasonal)", "Medium (Standard)", 6, K=2.2)
+
+    assert 0 < estimate.collapse_rate < 1
+    assert all(a >= b for a, b in zip(estimate.survival, estimate.survival[1:]))
+    assert abs(estimate.survival[-1] - (1 - estimate.collapse_rate)) < 1e-12
+    assert estimate.elapsed_ms < 100
+
+
+def test_more_capacity_never_increases_risk_with_common_shocks():
+    rates = [explore("Medium (Seasonal)", "Medium (Standard)", 6, K=K).collapse_rate for K in (1.8, 2.0, 2.2, 2.5)]
+    assert rates == sorted(rates, reverse=True) and rates[0] > rates[-1]
@@ -0,0 +1,149 @@
+# warm_start.py
+"""
+Warm-Start Index
+================
+
+Persistent map of solved audits: (I, θ_max, alpha) → minimal stable K
+found (the K validated when the audit reached STRESS) and its evidence.
+
+A new audit asks for the nearest solved configurations and starts its
+K search just below the predicted answer instead of climbing from the
+grounded K0:
+
+    index = WarmStartIndex(".iso_warm_start.json")
+    hint = index.query(I=1.5, theta_max=2.0)
+    if hint:
+        K_start = max(K0, hint.K_low - 0.1)
+
+Distances are relative per dimension, so 5.0 vs 5.1 bits counts the
+same as 0.5 vs 0.51. Neighbour answers are rescaled by I/I' (K_min
+grows roughly linearly with I at fixed θ_max).
+"""
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+DEFAULT_INDEX_PATH = ".iso_warm_start.json"
+
+
+@dataclass
+class WarmStart:
+    """Query answer: predicted minimal stable K and its bracket."""
+    K_pred: float
+    K_low: float
+    K_high: float
+    confidence: float          # 0..1: closeness and amount of evidence
+    neighbours: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class WarmStartIndex:
+    """JSON-backed nearest-neighbour index of solved (I, θ_max, alpha) → K_min."""
+
+    VERSION = 1
+    MAX_SAMPLES = 20  # K_min observations kept per configuration
+
+    def __init__(self, path: Optional[str] = None, max_distance: float = 0.15):
+        self.path = path or os.getenv("ISO_WARM_START_PATH", DEFAULT_INDEX_PATH)
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []  # A corrupt index only costs the warm start
+        return data.get("entries", []) if data.get("version") == self.VERSION else []
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f)
+        os.replace(tmp, self.path)  # Atomic: readers never see a half-written index
+
+    # ------------------------------------------------------------------
+    # Update / query
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _distance(entry: Dict[str, Any], I: float, theta_max: float, alpha: float) -> float:
+        def rel(a: float, b: float) -> float:
+            return abs(a - b) / max(abs(a), abs(b), 1e-9)
+        return math.sqrt(rel(entry["I"], I) ** 2 + rel(entry["theta_max"], theta_max) ** 2
+                         + rel(entry["alpha"], alpha) ** 2)
+
+    def record(
+        self,
+        I: float,
+        theta_max: float,
+        K_min: float,
+        upper_ci95: float,
+        runs: int,
+        alpha: float = 0.15
+    ):
+        """Adds a solved audit (merged with an identical configuration if present)."""
+        with self._lock:
+            self.entries = self._load() or self.entries  # Pick up other processes' writes
+            for entry in self.entries:
+                if self._distance(entry, I, theta_max, alpha) < 1e-6:
+                    break
+            else:
+                entry = {"I": I, "theta_max": theta_max, "alpha": alpha, "samples": []}
+                self.entries.append(entry)
+
+            entry["samples"] = (entry["samples"] + [
+                {"K_min": round(K_min, 6), "upper_ci95": upper_ci95, "runs": runs}
+            ])[-self.MAX_SAMPLES:]
+            self._save()
+
+    def query(self, I: float, theta_max: float, alpha: float = 0.15, k: int = 3) -> Optional[WarmStart]:
+        """Prediction from the k nearest solved configurations, or None if none is close enough."""
+        with self._lock:
+            scored = sorted(
+                ((self._distance(entry, I, theta_max, alpha), entry)
+                 for entry in self.entries if entry["samples"]),
+                key=lambda pair: pair[0]
+            )
+        neighbours = [(d, e) for d, e in scored[:k] if d <= self.max_distance]
+        if not neighbours:
+            return None
+
+        weights, estimates, spans = [], [], []
+        for distance, entry in neighbours:
+            scale = I / entry["I"] if entry["I"] > 0 else 1.0
+            ks = sorted(sample["K_min"] * scale for sample in entry["samples"])
+            weights.append(len(ks) / (distance + 0.01))
+            estimates.append(ks[len(ks) // 2])
+            spans.append((ks[0], ks[-1]))
+
+        total = sum(weights)
+        K_pred = sum(w * est for w, est in zip(weights, estimates)) / total
+        samples = sum(len(e["samples"]) for _, e in neighbours)
+        confidence = (1 - neighbours[0][0] / self.max_distance) * min(1.0, samples / 3)
+
+        return WarmStart(
+            K_pred=K_pred,
+            K_low=min(low for low, _ in spans),
+            K_high=max(high for _, high in spans),
+            confidence=max(0.0, confidence),
+            neighbours=[
+                {"I": e["I"], "theta_max": e["theta_max"], "alpha": e["alpha"],
+                 "distance": d, "samples": len(e["samples"])}
+                for d, e in neighbours
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,401 @@
+# src/server.py - Local HTTP audit service
+"""
+Small local HTTP service for other internal tools (stdlib only).
+
+    python -m src serve --port 8765 --workers 4 --llm fake
+
+Endpoints (JSON in, JSON out; same fields as the CLI batch specs):
+
+    GET  /health
+    GET  /stats                 counters (computations, coalesced requests, LLM queue)
+    POST /simulate              {"I", "K", "theta_max" | "volatility", "rigidity", "buffer", "runs", "seed", ...}
+    POST /sweep                 simulate fields + "k_values" | "k_min", "k_max", "k_step"
+    POST /audit                 {"description", "volatility", "rigidity", "buffer", "mock", "seed", ...}
+
+- Simulations run on a process pool (CPU-bound, no GIL contention).
+- Audits run on a thread pool. Their LLM calls go through one shared
+  RateLimiter and one asyncio queue with bounded concurrency.
+- Identical in-flight requests are coalesced (single-flight): a burst of
+  the same query runs once and every caller gets that result.
+- `--llm fake` swaps Gemini for FakeLLMBackend (configurable latency and
+  injected 429s/timeouts), so the service can be load-tested offline.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.cli import (RIGIDITY_CHOICES, VOLATILITY_CHOICES, _jsonable, audit_task, resolve_parameters,
+                     simulate_task, sweep_specs)
+from src.core.llm_backends import REPORT, LLMBackend, get_backend
+
+
+# ============================================================================
+# SINGLE-FLIGHT (request coalescing)
+# ============================================================================
+
+class SingleFlight:
+    """Concurrent calls with the same key share one computation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def run(self, key: str, start: Callable[[], Future]) -> Future:
+        """Future for `key`: the in-flight one if any, else a new one from start()."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = start()
+            self._inflight[key] = future
+            self.started += 1
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
+def request_key(kind: str, spec: Dict[str, Any]) -> str:
+    return kind + ":" + json.dumps(spec, sort_keys=True, default=str)
+
+
+# ============================================================================
+# REQUEST VALIDATION (client errors are caught here, before any work is queued)
+# ============================================================================
+
+_INT_FIELDS = ("runs", "time_steps", "buffer", "seed", "max_iterations", "speculative_candidates")
+_NUMBER_FIELDS = ("I", "K", "theta_max", "alpha", "deadline_s")
+
+
+def validate_spec(kind: str, spec: Dict[str, Any]):
+    """Raises ValueError for a simulate/audit spec the service cannot run (HTTP 400)."""
+    for name in _INT_FIELDS:
+        value = spec.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValueError(f"'{name}' must be an integer")
+    for name in _NUMBER_FIELDS:
+        value = spec.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"'{name}' must be a number")
+    for name, choices in (("volatility", VOLATILITY_CHOICES), ("rigidity", RIGIDITY_CHOICES)):
+        if spec.get(name) is not None and spec[name] not in choices:
+            raise ValueError(f"'{name}' must be one of: {', '.join(choices)}")
+
+    if kind == "simulate":
+        from src.core.engine import get_engine
+
+        resolve_parameters(spec)
+        get_engine(spec.get("engine", "numpy"))
+        if spec.get("runs") is not None and spec["runs"] < 1:
+            raise ValueError("'runs' must be positive")
+    elif kind == "audit":
+        if not isinstance(spec.get("description", ""), str):
+            raise ValueError("'description' must be a string")
+        if spec.get("validation_mode", "independent") not in ("independent", "pooled"):
+            raise ValueError("'validation_mode' must be 'independent' or 'pooled'")
+
+
+# ============================================================================
+# LLM QUEUE (asyncio loop in a background thread)
+# ============================================================================
+
+class LLMQueue:
+    """
+    Every LLM call of every audit goes through this queue.
+    At most `concurrency` calls are in flight; the rest wait in FIFO order.
+    """
+
+    def __init__(self, concurrency: int = 2):
+        self.concurrency = concurrency
+        self.pending = 0
+        self.completed = 0
+        self._counter_lock = threading.Lock()
+        self._calls = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm")
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="llm-queue", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue: "asyncio.Queue[Tuple[Callable[[], Any], Future]]" = asyncio.Queue()
+        self._workers = [self._loop.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _worker(self):
+        while True:
+            call, future = await self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = await self._loop.run_in_executor(self._calls, call)
+                        future.set_result(result)
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                with self._counter_lock:
+                    self.pending -= 1
+                    self.completed += 1
+                self._queue.task_done()
+
+    def submit(self, call: Callable[[], Any]) -> Future:
+        """Enqueues a blocking call. Thread-safe; returns a concurrent Future."""
+        future: Future = Future()
+        with self._counter_lock:
+            self.pending += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (call, future))
+        return future
+
+    async def _stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._loop.stop()
+
+    def shutdown(self):
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._calls.shutdown(wait=False, cancel_futures=True)
+
+
+class QueuedBackend(LLMBackend):
+    """Runs every call of another LLMBackend through an LLMQueue."""
+
+    def __init__(self, backend: LLMBackend, queue: LLMQueue):
+        self.inner = backend
+        self.name = backend.name
+        self.models = backend.models
+        self._queue = queue
+
+    def generate(self, prompt: str, kind: str = REPORT) -> str:
+        return self._queue.submit(lambda: self.inner.generate(prompt, kind)).result()
+
+    STREAM_BUFFER = 64   # Chunks the producer may run ahead of the caller
+    _END = object()
+
+    def stream(self, prompt: str, kind: str = REPORT):
+        # The queue slot is held for the whole stream, but each chunk reaches the
+        # caller as soon as the model produces it (bounded hand-off queue)
+        chunks: "Queue[Tuple[Any, Optional[BaseException]]]" = Queue(maxsize=self.STREAM_BUFFER)
+        abandoned = threading.Event()
+
+        def offer(item):
+            while not abandoned.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False  # The caller stopped reading: release the slot
+
+        def pump():
+            try:
+                for chunk in self.inner.stream(prompt, kind):
+                    if not offer((chunk, None)):
+                        return
+            except Exception as e:
+                offer((None, e))
+            else:
+                offer((self._END, None))
+
+        call = self._queue.submit(pump)
+        try:
+            while True:
+                try:
+                    chunk, error = chunks.get(timeout=0.1)
+                except Empty:
+                    if call.done() and chunks.empty():
+                        call.result()  # Cancelled or failed before producing anything
+                        raise RuntimeError("LLM stream ended without a result")
+                    continue
+                if error is not None:
+                    raise error
+                if chunk is self._END:
+                    return
+                yield chunk
+        finally:
+            abandoned.set()
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class AuditService:
+    """Pools, coalescing and the shared LLM path, independent of HTTP."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        audit_workers: int = 4,
+        llm: str = "gemini",
+        llm_concurrency: int = 2,
+        llm_latency_s: float = 0.5,
+        llm_options: Optional[Dict[str, Any]] = None,
+        max_rpm: int = 5,
+        max_sweep_points: int = 500
+    ):
+        from src.core.agent import RateLimiter
+
+        self.workers = workers
+        self.simulations = ProcessPoolExecutor(max_workers=workers)
+        self.audits = ThreadPoolExecutor(max_workers=audit_workers, thread_name_prefix="audit")
+        self.flights = SingleFlight()
+        self.max_sweep_points = max_sweep_points
+
+        self.llm = llm
+        self.rate_limiter = RateLimiter(max_rpm=max_rpm)
+        self.llm_queue = LLMQueue(concurrency=llm_concurrency)
+        backend_options = dict(llm_options or {})
+        if llm == "fake":
+            backend_options.setdefault("latency", llm_latency_s)
+        self._backend_options = backend_options
+        self._backend: Optional[LLMBackend] = None
+        self._backend_lock = threading.Lock()
+
+    def backend(self) -> LLMBackend:
+        """One shared backend (built on first audit), wrapped by the LLM queue."""
+        with self._backend_lock:
+            if self._backend is None:
+                self._backend = QueuedBackend(get_backend(self.llm, **self._backend_options), self.llm_queue)
+        return self._backend
+
+    # ------------------------------------------------------------------
+    # Operations
+    # ------------------------------------------------------------------
+
+    # Each operation validates its spec first (ValueError = client error);
+    # failures of the queued work surface from the returned futures
+
+    def simulate(self, spec: Dict[str, Any]) -> Future:
+        validate_spec("simulate", spec)
+        spec = dict(spec, trajectory=bool(spec.get("trajectory")))
+        return self.flights.run(
+            request_key("simulate", spec),
+            lambda: self.simulations.submit(simulate_task, spec)
+        )
+
+    def sweep(self, spec: Dict[str, Any]) -> List[Future]:
+        specs = sweep_specs(spec)
+        if len(specs) > self.max_sweep_points:
+            raise ValueError(f"sweep too large ({len(specs)} > {self.max_sweep_points} points)")
+        # Each K is its own flight, so overlapping sweeps share points
+        return [self.simulate(point) for point in specs]
+
+    def audit(self, spec: Dict[str, Any]) -> Future:
+        validate_spec("audit", spec)
+        spec = {key: value for key, value in spec.items() if key not in ("api_key", "journal_dir", "verbose")}
+        return self.flights.run(request_key("audit", spec), lambda: self.audits.submit(self._audit, spec))
+
+    def _audit(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"rate_limiter": self.rate_limiter}
+        if not spec.get("mock"):
+            options["backend"] = self.backend()
+        return audit_task(spec, **options)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "computations": self.flights.started,
+            "coalesced": self.flights.coalesced,
+            "llm": {
+                "backend": self.llm,
+                **(self._backend.inner.stats() if self._backend and hasattr(self._backend.inner, "stats") else {}),
+                "queue_pending": self.llm_queue.pending,
+                "calls_completed": self.llm_queue.completed,
+                "rate_limited_requests": self.rate_limiter.total_requests,
+            },
+        }
+
+    def shutdown(self):
+        self.audits.shutdown(wait=False, cancel_futures=True)
+        self.simulations.shutdown(wait=False, cancel_futures=True)
+        self.llm_queue.shutdown()
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+def make_handler(service: AuditService, timeout_s: float = 600.0):
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "IsoEntropy/2.3"
+
+        def log_message(self, format: str, *args: Any):
+            pass  # Quiet by default; the CLI prints the listening address
+
+        def _send(self, status: int, body: Any):
+            payload = json.dumps(_jsonable(body)).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send(200, service.stats())
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            operations = {"/simulate": service.simulate, "/sweep": service.sweep, "/audit": service.audit}
+            if self.path not in operations:
+                self._send(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+
+            # 400 only for the request itself (body, fields, sweep range) ...
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                spec = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(spec, dict):
+                    raise ValueError("request body must be a JSON object")
+                submitted = operations[self.path](spec)
+            except (ValueError, TypeError) as e:
+                self._send(400, {"error": f"{type(e).__name__}: {e}"})
+                return
+
+            # ... anything raised by the work itself is a server error
+            try:
+                if isinstance(submitted, list):
+                    result = [future.result(timeout=timeout_s) for future in submitted]
+                else:
+                    result = submitted.result(timeout=timeout_s)
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            else:
+                self._send(200, result)
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, **service_options: Any):
+    service = AuditService(**service_options)
+    httpd = ThreadingHTTPServer((host, port), make_handler(service))
+    httpd.daemon_threads = True
+    print(f"ISO-ENTROPY service on http://{host}:{httpd.server_address[1]} "
+          f"(llm={service.llm}, workers={service.workers})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.shutdown()
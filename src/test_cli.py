@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from .cli import main, resolve_parameters, sweep_specs
+
+SYSTEM = ["--volatility", "Medium (Seasonal)", "--rigidity", "Medium (Standard)", "--buffer", "6"]
+
+
+def _jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_resolve_parameters_grounds_and_lets_explicit_values_win():
+    grounded = resolve_parameters({"volatility": "High (Chaotic)", "rigidity": "Low (Automated)", "buffer": 6})
+    assert set(grounded) == {"I", "K", "theta_max"}
+    assert resolve_parameters({"volatility": "High (Chaotic)", "K": 9.0})["K"] == 9.0
+    assert resolve_parameters({"I": 1.5, "K": 2, "theta_max": 2.0}) == {"I": 1.5, "K": 2.0, "theta_max": 2.0}
+    with pytest.raises(ValueError, match="theta_max"):
+        resolve_parameters({"I": 1.5, "K": 2.0})
+
+
+def test_sweep_specs():
+    listed = sweep_specs({"I": 1.5, "theta_max": 2.0, "k_values": [2.0, 2.5], "k_min": 0.0, "seed": 7})
+    assert [(spec["K"], spec["seed"]) for spec in listed] == [(2.0, 7), (2.5, 8)]
+    assert "k_values" not in listed[0] and "k_min" not in listed[0]
+
+    ranged = sweep_specs({"I": 1.5, "k_min": 1.5, "k_max": 2.0, "k_step": 0.1})
+    assert [spec["K"] for spec in ranged] == [1.5, 1.6, 1.7, 1.8, 1.9, 2.0]
+    assert all(spec["seed"] is None for spec in ranged)
+
+    for bad in ({"k_min": 1.0, "k_max": 2.0, "k_step": 0}, {"k_min": 1.0, "k_max": 2.0, "k_step": -0.1},
+                {"k_min": 1.0}):
+        with pytest.raises(ValueError):
+            sweep_specs(bad)
+
+
+def test_simulate_is_reproducible(tmp_path):
+    paths = [tmp_path / "first.json", tmp_path / "second.json"]
+    for path in paths:
+        assert main(["simulate", *SYSTEM, "--runs", "300", "--seed", "4", "-o", str(path)]) == 0
+    first, second = (json.loads(path.read_text()) for path in paths)
+
+    assert first == second
+    assert first["runs"] == 300 and 0 <= first["collapse_rate"] <= 1 and 0 < first["upper_ci95"] <= 1
+    assert "trajectory" not in first
+
+
+def test_sweep_command_and_its_errors(tmp_path, capsys):
+    output = tmp_path / "sweep.jsonl"
+    assert main(["sweep", "--I", "1.5", "--theta-max", "2.0", "--k-values", "1.5,2.5",
+                 "--runs", "200", "--seed", "1", "-o", str(output)]) == 0
+    rows = _jsonl(output)
+    assert [row["K"] for row in rows] == [1.5, 2.5]
+    assert rows[0]["collapse_rate"] >= rows[1]["collapse_rate"]
+
+    with pytest.raises(SystemExit, match="sweep: k_step must be positive"):
+        main(["sweep", *SYSTEM, "--k-min", "1", "--k-max", "2", "--k-step", "0"])
+    with pytest.raises(SystemExit, match="sweep: give k_values"):
+        main(["sweep", *SYSTEM])
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["simulate", "--volatility", "Extreme"])  # Not one of the choices
+    assert exit_info.value.code == 2
+    assert "invalid choice" in capsys.readouterr().err
+
+
+def test_batch_reports_failures_per_job_and_in_the_exit_code(tmp_path, capsys):
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("\n".join(json.dumps(job) for job in (
+        {"command": "simulate", "I": 1.5, "K": 2.0, "theta_max": 2.0},
+        {"command": "simulate", "I": 1.5},
+        {"command": "forecast"},
+        {"command": "audit", "description": "Test system", "mock": True},
+    )) + "\n\n")
+    output = tmp_path / "results.jsonl"
+    assert main(["batch", str(jobs), "--runs", "200", "--seed", "3", "-o", str(output)]) == 1
+
+    rows = _jsonl(output)
+    assert [row["ok"] for row in rows] == [True, False, False, True]
+    assert rows[0]["input"]["seed"] == 3 and rows[0]["result"]["runs"] == 200
+    assert "Missing parameters" in rows[1]["error"]
+    assert rows[2]["error"] == "ValueError: Unknown command 'forecast'"
+    assert rows[3]["result"]["report"].strip() and rows[3]["result"]["events"][-1]["type"] == "AUDIT_COMPLETE"
+
+    array = tmp_path / "jobs.json"
+    array.write_text(json.dumps([{"I": 1.5, "K": 2.0, "theta_max": 2.0, "runs": 100}]))
+    assert main(["batch", str(array)]) == 0
+    printed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(printed) == 1 and printed[0]["ok"] and printed[0]["result"]["runs"] == 100
+
+
+def test_mock_audit_writes_report_and_json(tmp_path):
+    report, details = tmp_path / "report.md", tmp_path / "audit.json"
+    assert main(["audit", *SYSTEM, "--description", "Test system", "--mock", "--seed", "1",
+                 "-o", str(report), "--json", str(details)]) == 0
+
+    assert report.read_text().strip()
+    data = json.loads(details.read_text())
+    assert "report" not in data and data["final_phase"]
+    assert [event["type"] for event in data["events"]][-1] == "AUDIT_COMPLETE"
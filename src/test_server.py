@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from .core.llm_backends import FakeLLMBackend
+from .server import AuditService, LLMQueue, QueuedBackend, make_handler
+
+
+class _Tracker:
+    """Blocking call that records how many copies run at the same time."""
+
+    def __init__(self, duration_s=0.05):
+        self.duration_s = duration_s
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value=None):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.duration_s)
+        with self._lock:
+            self.running -= 1
+        return value
+
+
+@pytest.fixture
+def service():
+    service = AuditService(workers=1, audit_workers=8, llm="fake", llm_concurrency=2, llm_latency_s=0.0)
+    yield service
+    service.shutdown()
+
+
+def test_identical_concurrent_requests_run_once_and_share_errors(service):
+    gate = threading.Event()
+    outcome = {"result": {"report": "done"}}
+
+    def audit(spec):
+        gate.wait(5)
+        if isinstance(outcome["result"], Exception):
+            raise outcome["result"]
+        return outcome["result"]
+
+    service._audit = audit
+    spec = {"description": "x", "volatility": "Low (Stable)", "rigidity": "Low (Automated)", "buffer": 6, "mock": True}
+    for expected in ({"report": "done"}, RuntimeError("backend down")):
+        outcome["result"] = expected
+        gate.clear()
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            futures = list(callers.map(lambda _: service.audit(spec), range(8)))
+        gate.set()
+
+        assert len({id(future) for future in futures}) == 1
+        for future in futures:
+            if isinstance(expected, Exception):
+                with pytest.raises(RuntimeError, match="backend down"):
+                    future.result(timeout=5)
+            else:
+                assert future.result(timeout=5) == expected
+    assert service.flights.started == 2
+    assert service.flights.coalesced == 14
+
+
+def test_llm_queue_never_exceeds_its_concurrency():
+    queue = LLMQueue(concurrency=2)
+    try:
+        tracker = _Tracker()
+        futures = [queue.submit(lambda i=i: tracker(i)) for i in range(10)]
+        assert [future.result(timeout=5) for future in futures] == list(range(10))
+        assert tracker.peak == 2 and tracker.calls == 10
+
+        def fail():
+            raise ValueError("bad prompt")
+
+        with pytest.raises(ValueError, match="bad prompt"):
+            queue.submit(fail).result(timeout=5)
+        assert queue.pending == 0 and queue.completed == 11
+    finally:
+        queue.shutdown()
+
+
+def test_queued_backend_limits_concurrent_llm_calls(service):
+    tracker = _Tracker()
+
+    class TrackedFake(FakeLLMBackend):
+        def generate(self, prompt, kind="report"):
+            tracker()
+            return super().generate(prompt, kind)
+
+    backend = QueuedBackend(TrackedFake(), service.llm_queue)
+    with ThreadPoolExecutor(max_workers=6) as callers:
+        answers = list(callers.map(lambda i: backend.generate(f"prompt {i}"), range(6)))
+
+    assert all("fake backend" in answer for answer in answers)
+    assert tracker.peak == 2
+    assert "".join(backend.stream("prompt")) == backend.generate("prompt")
+
+
+def test_queued_stream_yields_chunks_as_they_arrive(service):
+    release = threading.Event()
+
+    class SlowStream(FakeLLMBackend):
+        def stream(self, prompt, kind="report"):
+            yield "first "
+            if not release.wait(5):
+                raise TimeoutError("never released")
+            yield "second"
+            raise RuntimeError("connection dropped")
+
+    chunks = QueuedBackend(SlowStream(), service.llm_queue).stream("prompt")
+    assert next(chunks) == "first "   # Before the backend has finished
+    release.set()
+    assert next(chunks) == "second"
+    with pytest.raises(RuntimeError, match="connection dropped"):
+        next(chunks)
+    assert service.llm_queue.completed >= 1
+
+
+def test_http_endpoints(service):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service, timeout_s=30))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    def post(path, body):
+        request = urllib.request.Request(url + path, data=json.dumps(body).encode(), method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        with urllib.request.urlopen(url + "/health", timeout=5) as response:
+            assert json.loads(response.read()) == {"status": "ok"}
+
+        status, result = post("/simulate", {"I": 1.5, "K": 2.0, "theta_max": 2.0, "runs": 200, "seed": 1})
+        assert status == 200 and result["runs"] == 200 and 0 <= result["collapse_rate"] <= 1
+
+        assert post("/simulate", [1, 2])[0] == 400
+        assert post("/unknown", {})[0] == 404
+        for path, bad in (("/simulate", {"I": 1.5, "K": 2.0}),                       # theta_max missing
+                          ("/simulate", {"I": 1.5, "K": 2.0, "theta_max": 2.0, "runs": "many"}),
+                          ("/sweep", {"I": 1.5, "theta_max": 2.0, "k_min": 1, "k_max": 2, "k_step": 0}),
+                          ("/audit", {"description": "x", "volatility": "Extreme"})):
+            status, body = post(path, bad)
+            assert status == 400, (path, bad, body)
+
+        # A ValueError raised by the work itself is a server error, not a client error
+        for error in (RuntimeError("audit crashed"), ValueError("internal bug")):
+            service._audit = lambda spec, error=error: (_ for _ in ()).throw(error)
+            status, body = post("/audit", {"description": str(error), "mock": True})
+            assert status == 500 and str(error) in body["error"]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -3,9 +3,10 @@
 import streamlit as st
 import os
 import sys
+import hashlib
+import uuid
 from pathlib import Path
 from dotenv import load_dotenv
-import pandas as pd                 
 from datetime import datetime       
 
 # ============================================================================
@@ -93,11 +94,59 @@ try:
     if str(root_dir) not in sys.path:
         sys.path.insert(0, str(root_dir))
     
-    from src.core.agent import IsoEntropyAgent
+    from src.core.agent import IsoEntropyAgent, RateLimiter
+    from src.core.cache import BoundedCache
+    from src.core.events import AuditEventType
+    from src.core.jobs import JobRunner, QueueFullError, audit_job
+    from src.core.journal import AuditJournal
+    from src.core.llm_backends import GeminiBackend
+    from src.core.what_if import explore
+    from src.core.charts import downsample_indices, downsample_log, fan_chart
 except ImportError as e:
     st.error(f"❌ Import error: {e}")
     st.stop()
 
+# ============================================================================
+# SHARED RESOURCES (one per server process, shared by every session)
+# ============================================================================
+
+@st.cache_resource(max_entries=8)
+def get_gemini_backend(api_key: str) -> GeminiBackend:
+    """One Gemini client per API key instead of one per button press."""
+    return GeminiBackend(api_key=api_key)
+
+
+@st.cache_resource
+def get_rate_limiter() -> RateLimiter:
+    """Gemini quota is per process, so every session shares one limiter."""
+    return RateLimiter()
+
+
+@st.cache_resource
+def get_report_cache() -> BoundedCache:
+    """Final reports keyed by audit inputs and agent configuration."""
+    return BoundedCache(max_entries=64, max_bytes=8_000_000)
+
+
+@st.cache_resource
+def get_simulation_cache() -> BoundedCache:
+    """Monte Carlo batches keyed by (I, K, θ_max, runs, repeat)."""
+    # Size ≈ fixed overhead + the stored trajectory (8 bytes per step)
+    return BoundedCache(
+        max_entries=4096,
+        max_bytes=64_000_000,
+        sizeof=lambda result: 2_000 + 8 * len(result.get("trajectory") or ())
+    )
+
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """Fixed worker pool for audits; jobs survive reruns of the page."""
+    return JobRunner(
+        workers=int(os.getenv("ISO_UI_WORKERS", "2")),
+        max_queued=int(os.getenv("ISO_UI_MAX_QUEUED", "16"))
+    )
+
 # ============================================================================
 # SIDEBAR - CONFIGURATION
 # ============================================================================
@@ -126,6 +175,11 @@ with st.sidebar:
     # SYSTEM PARAMETERS
     st.subheader("⚙️ System Parameters")
     
+    # Keyed so the what-if panel can hand a scenario over to the audit
+    st.session_state.setdefault("volatility", "Medium (Seasonal)")
+    st.session_state.setdefault("rigidity", "Medium (Standard)")
+    st.session_state.setdefault("buffer", 6)
+    
     volatility = st.selectbox(
         "🌪️ Volatility (External Entropy I)",
         options=[
@@ -133,7 +187,7 @@ with st.sidebar:
             "Medium (Seasonal)",
             "High (Chaotic)"
         ],
-        index=1,
+        key="volatility",
         help="Level of chaos and uncertainty in the system's environment. Directly affects I (External Entropy)."
     )
     
@@ -144,7 +198,7 @@ with st.sidebar:
             "Medium (Standard)",
             "High (Manual/Bureaucratic)"
         ],
-        index=1,
+        key="rigidity",
         help="System's ability to adapt and process information. Directly affects K (Response Capacity)."
     )
     
@@ -152,8 +206,8 @@ with st.sidebar:
         "💰 Financial Buffer (Months)",
         min_value=1,
         max_value=24,
-        value=6,
         step=1,
+        key="buffer",
         help="Time buffer before collapse. Defines the Collapse Threshold (θ_max)."
     )
     
@@ -171,12 +225,6 @@ with st.sidebar:
             help="Activates simulation mode without consuming API quota. Useful for testing and development."
         )
         
-        verbose = st.checkbox(
-            "📝 Verbose Mode",
-            value=True,
-            help="Displays detailed logs for each agent iteration."
-        )
-        
         max_iterations = st.slider(
             "🔄 Maximum Iterations",
             min_value=1,
@@ -247,6 +295,66 @@ user_input = st.text_area(
 
 st.write("")  # Spacer
 
+# ============================================================================
+# WHAT-IF EXPLORER (instant estimates, no LLM)
+# ============================================================================
+
+VOLATILITY_OPTIONS = ["Low (Stable)", "Medium (Seasonal)", "High (Chaotic)"]
+RIGIDITY_OPTIONS = ["Low (Automated)", "Medium (Standard)", "High (Manual/Bureaucratic)"]
+
+
+def use_what_if_scenario():
+    """Copies the explored scenario into the audit parameters (runs before the rerun)."""
+    st.session_state["volatility"] = st.session_state["wi_volatility"]
+    st.session_state["rigidity"] = st.session_state["wi_rigidity"]
+    st.session_state["buffer"] = st.session_state["wi_buffer"]
+
+
+@st.fragment
+def what_if_panel():
+    """Only this fragment reruns while the controls move; each update costs a few ms."""
+    import pandas as pd
+    
+    for key, source in (("wi_volatility", "volatility"), ("wi_rigidity", "rigidity"), ("wi_buffer", "buffer")):
+        st.session_state.setdefault(key, st.session_state[source])
+    
+    col_a, col_b, col_c, col_d = st.columns(4)
+    with col_a:
+        wi_volatility = st.select_slider("🌪️ Volatility", VOLATILITY_OPTIONS, key="wi_volatility")
+    with col_b:
+        wi_rigidity = st.select_slider("🧱 Rigidity", RIGIDITY_OPTIONS, key="wi_rigidity")
+    with col_c:
+        wi_buffer = st.slider("💰 Buffer (months)", 1, 24, key="wi_buffer")
+    with col_d:
+        boost = st.slider("📈 Extra capacity", 0, 300, 0, step=10, format="+%d%%",
+                          help="Raises K above the grounded capacity K0.")
+    
+    base = explore(wi_volatility, wi_rigidity, wi_buffer)
+    estimate = explore(wi_volatility, wi_rigidity, wi_buffer, K=round(base.K * (1 + boost / 100), 6))
+    
+    col_1, col_2, col_3, col_4 = st.columns(4)
+    col_1.metric("θ_max", f"{estimate.theta_max:.2f}")
+    col_2.metric("K / I", f"{estimate.K:.2f} / {estimate.I:.2f}")
+    col_3.metric("Collapse Rate", f"{estimate.collapse_rate:.1%}",
+                 delta=f"{estimate.collapse_rate - base.collapse_rate:+.1%}" if boost else None,
+                 delta_color="inverse")
+    col_4.metric("UB95", f"{estimate.upper_ci95:.1%}")
+    
+    st.line_chart(
+        pd.DataFrame({"Week": range(1, len(estimate.survival) + 1), "Survival": estimate.survival}).set_index("Week"),
+        height=200
+    )
+    st.caption(f"{estimate.runs} seeded runs · {estimate.elapsed_ms:.1f} ms")
+    if st.button("➡️ Use this scenario for the audit", on_click=use_what_if_scenario):
+        st.rerun()  # Full rerun so the sidebar shows the new parameters
+
+
+st.subheader("🧪 What-If Explorer")
+st.caption("Move the controls to see the collapse risk instantly. Run the full audit once you settle on a scenario.")
+what_if_panel()
+
+st.write("")  # Spacer
+
 # ============================================================================
 # SECTION 2: CONTROL BUTTONS
 # ============================================================================
@@ -267,19 +375,45 @@ with col_btn2:
     clear_btn = st.button(
         "🗑️ Clear",
         use_container_width=True,
-        help="Clears the cache history."
+        help="Clears the cache history and the saved checkpoint of this audit."
     )
 
+# Audit ID = this session + every setting that changes the result: a failed
+# or interrupted audit resumes from its journal when the session reruns it,
+# while other sessions never share the file. At most one job per audit ID
+# runs (see SUBMIT AUDIT); the journal is discarded once it finishes.
+runner = get_job_runner()
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+audit_id = hashlib.md5(
+    f"{session_id}|{user_input}|{volatility}|{rigidity}|{buffer}|{mock_mode}|{max_iterations}".encode()
+).hexdigest()[:16]
+audit_jobs = st.session_state.setdefault("audit_jobs", {})  # audit ID → job ID
+
 if clear_btn:
+    running = runner.get(audit_jobs.get(audit_id, ""))
+    if running is None or running.done:
+        AuditJournal.for_audit(audit_id).discard()  # A running job discards its own journal
     st.session_state.clear()
     st.rerun()
 
 st.write("")  # Spacer
 
 # ============================================================================
-# AUDIT EXECUTION
+# AUDIT EXECUTION (background jobs, shared by every session)
 # ============================================================================
 
+def finished_audit_job(agent, inputs):
+    """audit_job that drops the journal once the report is complete: only unfinished audits resume."""
+    work = audit_job(agent, inputs)
+    
+    def run(job):
+        result = work(job)
+        AuditJournal.for_audit(inputs["audit_id"]).discard()
+        return result
+    
+    return run
+
+
 if start_btn:
     # KEY VALIDATIONS AND PRIORITY LOGIC
     env_key = os.getenv("GEMINI_API_KEY")
@@ -299,62 +433,94 @@ if start_btn:
     # INITIALIZE AGENT
     try:
         agent = IsoEntropyAgent(
-            api_key=final_api_key if not mock_mode else None,
             mock_mode=mock_mode,
-            verbose=verbose,
-            max_iterations=max_iterations
+            verbose=False,  # Logs reach the page through audit events; stdout is the server's
+            max_iterations=max_iterations,
+            backend=None if mock_mode else get_gemini_backend(final_api_key),
+            rate_limiter=get_rate_limiter(),
+            cache=get_report_cache(),
+            simulation_cache=get_simulation_cache()
         )
     except Exception as e:
         st.error(f"❌ Error initializing agent: {e}")
         st.stop()
     
-    # RUN AUDIT
-    status_placeholder = st.status(
-        "🔄 Starting autonomous audit...",
-        expanded=True
-    )
-    
-    with status_placeholder:
+    # SUBMIT AUDIT (the same audit still queued or running is followed, not started twice)
+    inputs = {"user_input": user_input, "volatility": volatility, "rigidity": rigidity,
+              "buffer": buffer, "audit_id": audit_id}
+    job = runner.get(audit_jobs.get(audit_id, ""))
+    if job is None or job.done:
         try:
-            # Create container for logs
-            logs_container = st.empty()
-            
-            # Capture output
-            import io
-            from contextlib import redirect_stdout
-            
-            log_capture = io.StringIO()
-            
-            with redirect_stdout(log_capture):
-                result = agent.audit_system(
-                    user_input=user_input,
-                    volatility=volatility,
-                    rigidity=rigidity,
-                    buffer=buffer
-                )
-            
-            # Show logs
-            logs = log_capture.getvalue()
-            if logs:
-                with st.expander("📋 Execution Logs"):
-                    st.code(logs, language="text")
-            
-            status_placeholder.update(
-                label="✅ Audit completed",
-                state="complete"
-            )
-        
-        except Exception as e:
-            status_placeholder.update(
-                label=f"❌ Error during audit",
-                state="error"
-            )
-            st.error(f"Error: {str(e)}")
+            job = runner.submit(session_id, finished_audit_job(agent, inputs), label=f"{volatility} / {rigidity}")
+        except QueueFullError:
+            st.warning("⏳ The audit queue is full. Please try again in a moment.")
             st.stop()
+        audit_jobs[audit_id] = job.id
+    
+    st.session_state["job_id"] = job.id
+    st.session_state["job_inputs"] = {"volatility": volatility, "rigidity": rigidity,
+                                      "buffer_months": buffer, "mock_mode": mock_mode}
+
+
+def simulation_rows(events) -> list:
+    return [
+        {
+            "Cycle": event.data["cycle"],
+            "Phase": event.data["phase"],
+            "K (Capacity)": event.data["K"],
+            "Collapse Rate": event.data["collapse_rate"],
+            "UB95": event.data["upper_ci95"]
+        }
+        for event in list(events) if event.type == AuditEventType.SIMULATION
+    ]
+
+
+def render_progress(job):
+    """Live view of a queued or running audit: status, experiments and the report so far."""
+    import pandas as pd
+    
+    if job.status == "queued":
+        st.info(f"⏳ Audit queued (position {(runner.position(job.id) or 0) + 1}).")
+        return
+    
+    events = list(job.events)
+    phase = next(
+        (f"🔄 Phase {e.data['from_phase']} → {e.data['to_phase']}"
+         for e in reversed(events) if e.type == AuditEventType.FSM_TRANSITION),
+        "🔄 Starting autonomous audit..."
+    )
+    if any(e.type == AuditEventType.LLM_START for e in events):
+        phase = "📝 Generating final report..."
+    st.info(f"{phase} ({job.elapsed():.0f}s)")
+    
+    rows = simulation_rows(events)
+    if rows:
+        df_live = pd.DataFrame(rows)
+        chart_rows = downsample_indices(df_live["Collapse Rate"].to_numpy())
+        st.line_chart(df_live.iloc[chart_rows].set_index("Cycle")[["K (Capacity)", "Collapse Rate"]])
+        st.dataframe(df_live.tail(50), use_container_width=True)
+    if job.partial:
+        st.markdown(job.partial)
+
+
+@st.cache_data(max_entries=64)
+def get_fan_chart(I: float, K: float, theta_max: float) -> dict:
+    """Fan chart of the final configuration, computed once per (I, K, θ_max)."""
+    return fan_chart(I, K, theta_max, runs=2000, seed=0)
+
+
+def render_results(job, job_inputs):
+    """Results of a finished audit."""
+    import pandas as pd
+    
+    agent = job.result["agent"]
+    result = job.result["report"]
+    mock_mode = job_inputs["mock_mode"]
     
-    # ========================================================================
-    # SHOW RESULTS
-    # ========================================================================
+    # Execution log from the audit events
+    if job.events:
+        with st.expander("📋 Execution Logs"):
+            st.code("\n".join(f"{event.type.name}: {event.data}" for event in job.events), language="text")
     
     st.divider()
     st.subheader("3️⃣ Analysis Results")
@@ -399,35 +565,34 @@ if start_btn:
     st.subheader("📄 Complete Executive Report")
     st.markdown(result)
 
-    # VISUALIZATION
+    # VISUALIZATION (pre-aggregated: payload size does not depend on the runs)
     if agent.experiment_log:
-        last_result = agent.experiment_log[-1]['result']
-        trajectory = last_result.get('trajectory', [])
-        if trajectory:
-            # Calculate theta_max
-            from src.core.grounding import ground_inputs
-            from src.core.physics import calculate_collapse_threshold
-            params = ground_inputs(volatility, rigidity, buffer)
-            theta_max = calculate_collapse_threshold(params['stock'], params['capital'], params['liquidity'])
-
-            st.subheader("📈 Entropy Debt Trajectory")
-            df = pd.DataFrame({
-                'Time Step': range(1, len(trajectory) + 1),
-                'Entropy Debt': trajectory,
-                'Collapse Threshold': [theta_max] * len(trajectory)
-            })
-            st.line_chart(df.set_index('Time Step')[['Entropy Debt', 'Collapse Threshold']])
+        # Final configuration of the audit (already grounded by the agent)
+        log = agent.experiment_log
+        fan = get_fan_chart(float(log.column('I')[-1]), float(log.column('K')[-1]), float(log.column('theta_max')[-1]))
+
+        st.subheader("📈 Entropy Debt Distribution")
+        df_fan = pd.DataFrame({'Week': fan['week'], **fan['bands'], 'Collapse Threshold': fan['theta_max']})
+        st.line_chart(df_fan.set_index('Week'))
+        st.caption(f"Weekly debt quantiles over {fan['runs']:,} runs at the final K (collapsed runs keep their debt at collapse).")
+
+        col_hist, col_surv = st.columns(2)
+        with col_hist:
+            st.write("**Collapses per week**")
+            histogram = fan['histogram']
+            st.bar_chart(pd.DataFrame({'Week': histogram['week_end'], 'Collapses': histogram['collapses']}).set_index('Week'))
+        with col_surv:
+            st.write("**Survival**")
+            st.line_chart(pd.DataFrame({'Week': fan['week'], 'Survival': fan['survival']}).set_index('Week'))
 
     # AUDIT EVOLUTION TIME SERIES
     if len(agent.experiment_log) > 1:
         st.subheader("📊 Evolución del Audit")
-        cycles = [exp['cycle'] for exp in agent.experiment_log]
-        k_values = [exp['hypothesis']['K'] for exp in agent.experiment_log]
-        collapse_rates = [exp['result']['collapse_rate'] for exp in agent.experiment_log]
+        evolution = downsample_log(agent.experiment_log)
         df_evolution = pd.DataFrame({
-            'Cycle': cycles,
-            'K (Capacity)': k_values,
-            'Collapse Rate': collapse_rates
+            'Cycle': evolution['cycle'],
+            'K (Capacity)': evolution['K'],
+            'Collapse Rate': evolution['collapse_rate']
         })
         st.line_chart(df_evolution.set_index('Cycle'))
 
@@ -445,29 +610,41 @@ if start_btn:
         
         with col_tech1:
             st.write("**Physical Parameters:**")
-            st.json({
-                "volatility": volatility,
-                "rigidity": rigidity,
-                "buffer_months": buffer,
-                "mock_mode": mock_mode
-            })
+            st.json(job_inputs)
         
         with col_tech2:
             st.write("**FSM History:**")
             if agent.experiment_log:
-                hist_data = []
-                for exp in agent.experiment_log:
-                    hist_data.append({
-                        "Cycle": exp['cycle'],
-                        "Phase": exp['phase'],
-                        "K": f"{exp['hypothesis']['K']:.2f}",
-                        "Collapse": f"{exp['result']['collapse_rate']:.1%}"
-                    })
-                
-                df = pd.DataFrame(hist_data)
+                df = agent.experiment_log.to_dataframe()
+                df = pd.DataFrame({
+                    "Cycle": df['cycle'],
+                    "Phase": df['phase'],
+                    "K": df['K'].map("{:.2f}".format),
+                    "Collapse": df['collapse_rate'].map("{:.1%}".format)
+                })
                 # Use use_container_width to make it look good
                 st.dataframe(df, use_container_width=True)
 
+
+job_id = st.session_state.get("job_id")
+job = runner.get(job_id) if job_id else None
+
+if job is not None and job.done:
+    if job.status == "done":
+        st.success(f"✅ Audit completed in {job.elapsed():.1f}s")
+        render_results(job, st.session_state["job_inputs"])
+    else:
+        st.error(f"❌ Error during audit: {job.error or job.status}")
+elif job is not None:
+    @st.fragment(run_every=1.0)
+    def audit_progress():
+        # Only this fragment reruns while polling; the full page reruns once the job is done
+        if runner.get(job_id).done:
+            st.rerun()
+        render_progress(job)
+    
+    audit_progress()
+
 # ============================================================================
 # FOOTER
 # ============================================================================